@@ -17,6 +17,10 @@ Fix #7: Precomputed log(A) and A*log(A) at init (saves 32μs/cycle)
 Full cognitive cycle: 52μs (EFE) + 80μs (belief) + 1μs (IO) = ~133μs
                       HEADROOM: 367μs for future complexity
 
+BatchedActiveInference: the same cycle for all agents at once — models and
+beliefs stacked, EFE for agents × actions in two batched matmuls.
+32 agents: ~0.7ms vs ~5ms for the per-agent loop
+
 ═══════════════════════════════════════════════════════════════════════════════
 """
 
@@ -267,6 +271,140 @@ class ActiveInferenceAgent:
         }
 
 
+class BatchedActiveInference:
+    """
+    ═══════════════════════════════════════════════════════════════════════════
+    All agents as one tensor computation
+    ═══════════════════════════════════════════════════════════════════════════
+
+    Same maths as ActiveInferenceAgent (single-step policies, softmax action
+    selection), but A, B, C, log-likelihood entropies and beliefs for K
+    agents are stacked, so one cycle for every agent × every action is a
+    handful of batched matmuls instead of K × num_actions small mat-vecs:
+
+      A:  [K × obs × states]       B: [K × actions·states × states]
+      C:  [K × obs]                q_s: [K × states]
+
+      q(s')  = B @ q(s)            [K × actions × states]   1 matmul
+      q(o)   = q(s') @ Aᵀ          [K × actions × obs]      1 matmul
+      H[q(o)], E[H[P(o|s)]], q(o)·C                          3 reductions
+
+    Actions are drawn from the global NumPy RNG with one uniform per agent,
+    in agent order — the same draws np.random.choice makes in the per-agent
+    loop, so a seeded run picks the same actions.
+
+    Target: 32 agents in well under the ~5ms of the per-agent loop
+    ═══════════════════════════════════════════════════════════════════════════
+    """
+
+    def __init__(self, models: List[GenerativeModel]):
+        assert models, "need at least one model"
+        for model in models:
+            model.validate()
+        shapes = {(m.A.shape, m.B.shape) for m in models}
+        assert len(shapes) == 1, f"all models must share one shape, got {shapes}"
+
+        self.num_agents = len(models)
+        self.num_obs, self.num_states = models[0].A.shape
+        self.num_actions = models[0].B.shape[2]
+        self._epsilon = 1e-16
+
+        self.A = np.stack([m.A for m in models])
+        # B[:, :, a] stacked row-wise per agent: [K × (actions·states) × states]
+        self.B = np.stack([m.B.transpose(2, 0, 1).reshape(-1, self.num_states)
+                           for m in models])
+        self.C = np.stack([m.C for m in models])
+        self.q_s = np.stack([m.D for m in models]).astype(np.float64)
+        self._precompute()
+
+        # Last cycle's results and timing
+        self.last_actions = np.zeros(self.num_agents, dtype=np.int64)
+        self.last_free_energy = np.zeros(self.num_agents)
+        self.cycle_count = 0
+        self.total_inference_ns = 0
+
+    @classmethod
+    def from_agents(cls, agents: List[ActiveInferenceAgent]) -> "BatchedActiveInference":
+        """Stack existing agents' models and current beliefs"""
+        engine = cls([agent.model for agent in agents])
+        engine.q_s[:] = [agent.state.q_s for agent in agents]
+        return engine
+
+    def _precompute(self):
+        """FIX #7 for the stack: A·log(A) → H[P(o|s)] per agent and state"""
+        self._AT = self.A.transpose(0, 2, 1)
+        self._H_per_state = -np.sum(self.A * np.log(self.A + self._epsilon), axis=1)
+
+    def belief_update(self, observations: np.ndarray) -> np.ndarray:
+        """q(s) ∝ P(o|s) · q(s) for every agent; observations: [K × obs]"""
+        likelihood = self.A[np.arange(self.num_agents), observations.argmax(axis=1)]
+        posterior = likelihood * self.q_s
+        posterior /= posterior.sum(axis=1, keepdims=True) + self._epsilon
+        self.q_s = posterior
+        return posterior
+
+    def expected_free_energy(self) -> np.ndarray:
+        """G for every agent × single-step policy [a]: [K × actions]"""
+        K, S, eps = self.num_agents, self.num_states, self._epsilon
+
+        q_s_next = (self.B @ self.q_s[:, :, None]).reshape(K, self.num_actions, S)
+        q_s_next /= q_s_next.sum(axis=2, keepdims=True) + eps
+
+        q_o = q_s_next @ self._AT                                   # [K × actions × obs]
+        q_o /= q_o.sum(axis=2, keepdims=True) + eps
+
+        H_qo = -np.sum(q_o * np.log(q_o + eps), axis=2)
+        H_qo_given_s = (q_s_next @ self._H_per_state[:, :, None])[:, :, 0]
+        pragmatic = (q_o @ self.C[:, :, None])[:, :, 0]
+
+        return -(H_qo - H_qo_given_s) - pragmatic
+
+    def select_actions(self, temperature: float = 1.0) -> Tuple[np.ndarray, np.ndarray]:
+        """Softmax over -G per agent and sample; returns (actions, G of the chosen)"""
+        G = self.expected_free_energy()
+        neg_G = -G / temperature
+        neg_G -= neg_G.max(axis=1, keepdims=True)
+        exp_G = np.exp(neg_G)
+        cdf = np.cumsum(exp_G / exp_G.sum(axis=1, keepdims=True), axis=1)
+        cdf /= cdf[:, -1:]
+
+        # Inverse-CDF sampling, as np.random.choice does it
+        u = np.random.random_sample(self.num_agents)
+        actions = np.minimum((cdf <= u[:, None]).sum(axis=1), self.num_actions - 1)
+
+        self.last_actions = actions
+        self.last_free_energy = G[np.arange(self.num_agents), actions]
+        return actions, self.last_free_energy
+
+    def cognitive_cycle(self, observations: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Belief update + action selection for all agents: (actions [K], G [K])"""
+        start = time.perf_counter_ns()
+        self.belief_update(observations)
+        actions, free_energy = self.select_actions()
+        self.cycle_count += 1
+        self.total_inference_ns += time.perf_counter_ns() - start
+        return actions, free_energy
+
+    def avg_cycle_us(self) -> float:
+        """Average all-agent cycle time in microseconds"""
+        if self.cycle_count == 0:
+            return 0.0
+        return self.total_inference_ns / self.cycle_count / 1000.0
+
+    def update_model(self, agent: int,
+                     new_A: Optional[np.ndarray] = None,
+                     new_B: Optional[np.ndarray] = None,
+                     new_C: Optional[np.ndarray] = None):
+        """Replace one agent's model matrices (consolidation) and re-precompute"""
+        if new_A is not None:
+            self.A[agent] = new_A
+        if new_B is not None:
+            self.B[agent] = new_B.transpose(2, 0, 1).reshape(-1, self.num_states)
+        if new_C is not None:
+            self.C[agent] = new_C
+        self._precompute()
+
+
 def create_default_model(
     num_states: int = 64,
     num_obs: int = 32,
@@ -350,6 +488,34 @@ def benchmark():
     else:
         print(f"\n  ❌ OVER BUDGET — {timings_us.mean():.1f}μs > 500μs target")
 
+    # All 32 agents: per-agent loop vs one batched engine
+    print(f"\n  ═══ 32 agents: per-agent loop vs BatchedActiveInference ═══")
+    models = []
+    for i in range(32):
+        m = create_default_model(num_states=64, num_obs=32, num_actions=8)
+        m.C = np.random.default_rng(i * 1000 + 42).standard_normal(32) * 0.5
+        models.append(m)
+    agents = [ActiveInferenceAgent(m, agent_id=i) for i, m in enumerate(models)]
+    engine = BatchedActiveInference(models)
+    eye = np.eye(32)
+
+    loop_us, batched_us = [], []
+    for c in range(500):
+        obs = eye[(c + np.arange(32)) % 32]
+        start = time.perf_counter_ns()
+        for i, a in enumerate(agents):
+            a.cognitive_cycle(obs[i])
+        loop_us.append((time.perf_counter_ns() - start) / 1000)
+        start = time.perf_counter_ns()
+        engine.cognitive_cycle(obs)
+        batched_us.append((time.perf_counter_ns() - start) / 1000)
+    loop_us, batched_us = np.array(loop_us), np.array(batched_us)
+    diff = np.abs(engine.q_s - np.array([a.state.q_s for a in agents])).max()
+    print(f"  Per-agent loop: {np.median(loop_us):.0f} μs median | P99 {np.percentile(loop_us, 99):.0f} μs")
+    print(f"  Batched:        {np.median(batched_us):.0f} μs median | P99 {np.percentile(batched_us, 99):.0f} μs "
+          f"({np.median(loop_us) / np.median(batched_us):.1f}× faster)")
+    print(f"  Max |Δ| q(s):   {diff:.2e}")
+
     return agent.get_stats()
 
 
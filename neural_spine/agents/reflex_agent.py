@@ -14,10 +14,15 @@ Runs N Active Inference agents, each connected to the Rust spine via FFI
 
 ARCHITECTURE:
   - Single Python process, asyncio event loop
-  - Each agent is an async coroutine (not a process)
+  - All agents run as one BatchedActiveInference engine: beliefs and models
+    stacked, one belief update + EFE over agents × actions per cycle
   - FFI calls are fast (~1μs each), so no thread pool needed
-  - Cognitive cycle is CPU-bound (~160μs), runs synchronously per agent
-  - All 32 agents complete a full cycle in ~5.1ms
+  - Cognitive cycle is CPU-bound, runs synchronously in the loop
+  - All 32 agents complete a full cycle in well under 1ms (the per-agent
+    loop it replaced: ~5.1ms)
+  - Phi* (~15ms) is evaluated off-loop by PhiWorker in a child process that
+    reads the window from shared memory; the loop only hands it a wake-up
+    every 100 cycles and picks the result up when it is ready
 
 CPU PINNING:
   Designed to run on cores 4-11 (cpuset in Docker)
@@ -33,6 +38,7 @@ import os
 import signal
 import sys
 import time
+from collections import deque
 from pathlib import Path
 from typing import Optional
 
@@ -40,8 +46,9 @@ import numpy as np
 
 # Import our modules
 sys.path.insert(0, str(Path(__file__).parent.parent))
-from agents.active_inference import ActiveInferenceAgent, create_default_model
-from monitoring.phi_monitor import PhiStarMonitor
+from agents.active_inference import BatchedActiveInference, create_default_model
+from monitoring.phi_monitor import PhiResult, PhiStarMonitor
+from monitoring.phi_worker import PhiWorker
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # FFI Bindings to libspine_core.so
@@ -207,7 +214,11 @@ class ReflexAgentRunner:
     and connecting them to the spine shared memory and Redis.
     """
 
-    def __init__(self, num_agents: int = 32, cycle_hz: float = 20.0):
+    # Cycle timing kept for the jitter metrics (~1 minute at 20 Hz)
+    TIMING_WINDOW = 1200
+
+    def __init__(self, num_agents: int = 32, cycle_hz: float = 20.0,
+                 phi_offload: bool = True):
         self.num_agents = num_agents
         self.cycle_period = 1.0 / cycle_hz
         self.running = False
@@ -215,16 +226,23 @@ class ReflexAgentRunner:
         # FFI connection to spine
         self.spine = SpineFFI()
 
-        # Active Inference agents
-        self.agents: list[ActiveInferenceAgent] = []
+        # Active Inference agents — all of them, as one stacked engine
+        self.engine: Optional[BatchedActiveInference] = None
 
-        # Phi* monitor
-        self.phi_monitor = PhiStarMonitor(num_agents=num_agents)
+        # Phi* monitor — its window lives in the worker's shared memory when
+        # offloaded; phi_offload=False evaluates inline (the old behaviour)
+        self.phi_worker = PhiWorker(num_agents=num_agents) if phi_offload else None
+        self.phi_monitor = (self.phi_worker.monitor if self.phi_worker
+                            else PhiStarMonitor(num_agents=num_agents))
+        self.latest_phi: Optional[PhiResult] = None
 
         # Metrics
         self.total_cycles = 0
         self.total_cycle_ns = 0
         self.phi_eval_count = 0
+        self._cycle_us: deque = deque(maxlen=self.TIMING_WINDOW)    # whole cycle, Phi* included
+        self._jitter_us: deque = deque(maxlen=self.TIMING_WINDOW)   # |start-to-start − period|
+        self._tasks: set = set()
 
         # Redis (optional)
         self._redis = None
@@ -247,6 +265,7 @@ class ReflexAgentRunner:
     def _init_agents(self):
         """Initialize all Active Inference agents"""
         print(f"\n  Initializing {self.num_agents} agents...")
+        models = []
         for i in range(self.num_agents):
             # Each agent gets a unique model seeded by its ID
             # In production, models would be loaded from HR Registry
@@ -259,28 +278,29 @@ class ReflexAgentRunner:
             rng = np.random.default_rng(i * 1000 + 42)
             model.C = rng.standard_normal(32) * 0.5  # Different preferences
 
-            agent = ActiveInferenceAgent(model, agent_id=i)
-            self.agents.append(agent)
+            models.append(model)
 
             # Activate in spine
             self.spine.activate_agent(i)
 
+        self.engine = BatchedActiveInference(models)
         print(f"  ✅ {self.num_agents} agents initialized")
 
-    def _percept_to_observation(self, percept_data: bytes, num_obs: int) -> np.ndarray:
+    def _percepts_to_observations(self, percepts: list, num_obs: int) -> np.ndarray:
         """
-        Convert raw percept bytes from spine buffer to observation vector.
-        Uses first `num_obs` bytes as softmax input.
+        Convert raw percept bytes from the spine buffers to observation
+        vectors [num_agents × num_obs]. Uses the first `num_obs` bytes of
+        each buffer as softmax input.
         """
-        obs = np.zeros(num_obs)
-        n = min(len(percept_data), num_obs)
-        for i in range(n):
-            obs[i] = percept_data[i] / 255.0
+        obs = np.zeros((len(percepts), num_obs))
+        for i, percept_data in enumerate(percepts):
+            n = min(len(percept_data), num_obs)
+            obs[i, :n] = np.frombuffer(percept_data, dtype=np.uint8, count=n)
+        obs /= 255.0
 
         # Softmax normalization
-        obs_exp = np.exp(obs - obs.max())
-        obs = obs_exp / obs_exp.sum()
-        return obs
+        obs_exp = np.exp(obs - obs.max(axis=1, keepdims=True))
+        return obs_exp / obs_exp.sum(axis=1, keepdims=True)
 
     def _action_to_bytes(self, action: int, free_energy: float) -> bytes:
         """Encode action and free energy into bytes for ACTION buffer"""
@@ -294,50 +314,45 @@ class ReflexAgentRunner:
         This is the hot loop — performance critical.
         """
         start_ns = time.perf_counter_ns()
-        workspace_values = np.zeros(self.num_agents)
+        engine = self.engine
 
-        for i, agent in enumerate(self.agents):
-            # 1. Read percept from spine
-            percept = self.spine.read_buffer(i, SpineFFI.BUF_PERCEPT)
-            observation = self._percept_to_observation(percept, agent.num_obs)
+        # 1. Read percepts from spine
+        percepts = [self.spine.read_buffer(i, SpineFFI.BUF_PERCEPT)
+                    for i in range(self.num_agents)]
+        observations = self._percepts_to_observations(percepts, engine.num_obs)
 
-            # 2. Cognitive cycle (belief update + action selection)
-            action, free_energy = agent.cognitive_cycle(observation)
+        # 2. Cognitive cycle for all agents (belief update + action selection)
+        actions, free_energy = engine.cognitive_cycle(observations)
 
-            # 3. Write action back to spine
-            action_bytes = self._action_to_bytes(action, free_energy)
+        # 3. Write actions back to spine
+        for i in range(self.num_agents):
+            action_bytes = self._action_to_bytes(int(actions[i]), float(free_energy[i]))
             self.spine.write_buffer(i, SpineFFI.BUF_ACTION, action_bytes)
 
-            # 4. Write workspace signature for Phi* monitor
-            workspace_values[i] = float(agent.state.q_s[:8].sum())
+        # 4. Workspace signature for Phi* monitor
+        workspace_values = engine.q_s[:, :8].sum(axis=1)
 
         # Feed Phi* monitor
-        self.phi_monitor.add_snapshot(workspace_values)
+        if self.phi_worker:
+            self.phi_worker.add_snapshot(workspace_values)
+        else:
+            self.phi_monitor.add_snapshot(workspace_values)
 
         elapsed_ns = time.perf_counter_ns() - start_ns
         self.total_cycles += 1
         self.total_cycle_ns += elapsed_ns
 
-        # Phi* evaluation every 100 cycles
+        # Phi* evaluation every 100 cycles — off-loop: request now, pick the
+        # result up on whichever later cycle finds it ready
         if self.total_cycles % 100 == 0:
-            phi_result = self.phi_monitor.compute_phi_star()
-            self.phi_eval_count += 1
-
-            if self._redis:
-                try:
-                    await self._redis.publish(
-                        'nexus:spine:phi',
-                        phi_result.to_json()
-                    )
-                except Exception:
-                    pass
-
-            if self.total_cycles % 500 == 0:
-                avg_us = self.total_cycle_ns / self.total_cycles / 1000
-                print(f"  [Cycle {self.total_cycles}] "
-                      f"Avg: {avg_us:.0f}μs/cycle "
-                      f"Φ*: {phi_result.phi_star:.3f} ({phi_result.status}) "
-                      f"Active: {phi_result.active_agents}")
+            if self.phi_worker:
+                self.phi_worker.request()
+            else:
+                self._on_phi_result(self.phi_monitor.compute_phi_star())
+        if self.phi_worker:
+            phi_result = self.phi_worker.poll()
+            if phi_result is not None:
+                self._on_phi_result(phi_result)
 
         # Publish metrics to Redis (every 50 cycles)
         if self._redis and self.total_cycles % 50 == 0:
@@ -348,8 +363,12 @@ class ReflexAgentRunner:
                     "avg_cycle_us": round(avg_us, 1),
                     "num_agents": self.num_agents,
                     "phi_evals": self.phi_eval_count,
+                    "phi_offload": self.phi_worker is not None,
+                    **self.cycle_stats(),
                     "timestamp": int(time.time()),
                 }
+                if self.phi_worker:
+                    metrics["phi_worker"] = self.phi_worker.stats()
                 await self._redis.set(
                     'nexus:spine:agents:metrics',
                     json.dumps(metrics)
@@ -357,6 +376,51 @@ class ReflexAgentRunner:
             except Exception:
                 pass
 
+        self._cycle_us.append((time.perf_counter_ns() - start_ns) / 1000)
+
+    def _on_phi_result(self, phi_result: PhiResult):
+        """Record a finished Phi* evaluation and publish it in the background"""
+        self.latest_phi = phi_result
+        self.phi_eval_count += 1
+
+        if self._redis:
+            task = asyncio.get_running_loop().create_task(self._publish_phi(phi_result))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+        if self.phi_eval_count % 5 == 0:
+            avg_us = self.total_cycle_ns / self.total_cycles / 1000
+            stats = self.cycle_stats()
+            print(f"  [Cycle {self.total_cycles}] "
+                  f"Avg: {avg_us:.0f}μs/cycle "
+                  f"P99: {stats['cycle_p99_us']:.0f}μs "
+                  f"Jitter P99: {stats['jitter_p99_us']:.0f}μs "
+                  f"Φ*: {phi_result.phi_star:.3f} ({phi_result.status}) "
+                  f"Active: {phi_result.active_agents}")
+
+    async def _publish_phi(self, phi_result: PhiResult):
+        payload = phi_result.to_json()
+        try:
+            pipe = self._redis.pipeline(transaction=False)
+            pipe.publish('nexus:spine:phi', payload)
+            pipe.set('nexus:spine:phi:latest', payload)
+            await pipe.execute()
+        except Exception:
+            pass
+
+    def cycle_stats(self) -> dict:
+        """
+        Cycle time (whole _run_cycle, Phi* included) and start-to-start
+        jitter (|interval − cycle period|) over the last TIMING_WINDOW cycles, μs
+        """
+        stats = {}
+        for name, values in (("cycle", self._cycle_us), ("jitter", self._jitter_us)):
+            v = np.fromiter(values, dtype=np.float64) if values else np.zeros(1)
+            stats[f"{name}_p50_us"] = round(float(np.median(v)), 1)
+            stats[f"{name}_p99_us"] = round(float(np.percentile(v, 99)), 1)
+            stats[f"{name}_max_us"] = round(float(v.max()), 1)
+        return stats
+
     async def run(self):
         """Main event loop"""
         print("═" * 60)
@@ -368,18 +432,26 @@ class ReflexAgentRunner:
         self.spine.attach()
         self._init_agents()
 
-        self.running = True
-        print(f"\n  Starting cognitive loop at {1/self.cycle_period:.0f} Hz...")
-        print(f"  Press Ctrl+C to stop\n")
+        last_start = None
+        try:
+            if self.phi_worker:
+                self.phi_worker.start()
 
-        # Signal handlers
-        loop = asyncio.get_event_loop()
-        for sig in (signal.SIGINT, signal.SIGTERM):
-            loop.add_signal_handler(sig, self._shutdown)
+            self.running = True
+            print(f"\n  Starting cognitive loop at {1/self.cycle_period:.0f} Hz...")
+            print(f"  Press Ctrl+C to stop\n")
+
+            # Signal handlers
+            loop = asyncio.get_event_loop()
+            for sig in (signal.SIGINT, signal.SIGTERM):
+                loop.add_signal_handler(sig, self._shutdown)
 
-        try:
             while self.running:
                 cycle_start = time.perf_counter()
+                if last_start is not None:
+                    self._jitter_us.append(
+                        abs(cycle_start - last_start - self.cycle_period) * 1e6)
+                last_start = cycle_start
 
                 await self._run_cycle()
 
@@ -390,14 +462,21 @@ class ReflexAgentRunner:
                     await asyncio.sleep(sleep_time)
         except asyncio.CancelledError:
             pass
+        finally:
+            # Also on errors: the worker process and its shared-memory
+            # block must not outlive the runner
+            print(f"\n  Shutting down. Total cycles: {self.total_cycles}")
+            if self.total_cycles > 0:
+                avg_us = self.total_cycle_ns / self.total_cycles / 1000
+                print(f"  Average cycle time: {avg_us:.0f}μs")
+                print(f"  Cycle/jitter: {self.cycle_stats()}")
 
-        print(f"\n  Shutting down. Total cycles: {self.total_cycles}")
-        if self.total_cycles > 0:
-            avg_us = self.total_cycle_ns / self.total_cycles / 1000
-            print(f"  Average cycle time: {avg_us:.0f}μs")
-
-        if self._redis:
-            await self._redis.aclose()
+            if self.phi_worker:
+                self.phi_worker.close()
+            if self._tasks:
+                await asyncio.gather(*self._tasks, return_exceptions=True)
+            if self._redis:
+                await self._redis.aclose()
 
     def _shutdown(self):
         self.running = False
@@ -413,7 +492,7 @@ def benchmark():
     print("  ⚡ Reflex Agent Runner — Standalone Benchmark")
     print("═" * 60)
 
-    runner = ReflexAgentRunner(num_agents=32, cycle_hz=20.0)
+    runner = ReflexAgentRunner(num_agents=32, cycle_hz=20.0, phi_offload=False)
     runner._init_agents()
 
     # Run 1000 cycles
@@ -421,17 +500,15 @@ def benchmark():
     workspace_all = []
     timings = []
 
+    eye = np.eye(32)
     for c in range(N):
         start = time.perf_counter_ns()
-        workspace_values = np.zeros(32)
 
-        for i, agent in enumerate(runner.agents):
-            # Simulated percept
-            obs = np.zeros(32)
-            obs[(c + i) % 32] = 1.0
+        # Simulated percepts
+        obs = eye[(c + np.arange(32)) % 32]
 
-            action, fe = agent.cognitive_cycle(obs)
-            workspace_values[i] = float(agent.state.q_s[:8].sum())
+        actions, fe = runner.engine.cognitive_cycle(obs)
+        workspace_values = runner.engine.q_s[:, :8].sum(axis=1)
 
         runner.phi_monitor.add_snapshot(workspace_values)
         elapsed = (time.perf_counter_ns() - start) / 1000  # μs
@@ -457,6 +534,40 @@ def benchmark():
     else:
         print(f"\n  ❌ OVER BUDGET — {timings.mean()/1000:.1f}ms > 50ms target")
 
+    # Phi* inline (every 100th cycle pays for it) vs handed to PhiWorker
+    print(f"\n  ═══ Φ* inline vs off-loop (600 cycles, Φ* every 100) ═══")
+    for offload in (False, True):
+        r = ReflexAgentRunner(num_agents=32, cycle_hz=20.0, phi_offload=offload)
+        r._init_agents()
+        if r.phi_worker:
+            r.phi_worker.start()
+        asyncio.run(_drive_cycles(r, 600))
+        if r.phi_worker:
+            deadline = time.perf_counter() + 5.0
+            while r.latest_phi is None and time.perf_counter() < deadline:
+                phi = r.phi_worker.poll()
+                if phi is not None:
+                    r.latest_phi = phi
+                time.sleep(0.01)
+            r.phi_worker.close()
+        cycle_us = np.array(r._cycle_us)
+        phi_cycles = cycle_us[99::100]
+        label = "off-loop" if offload else "inline  "
+        phi = r.latest_phi
+        print(f"  {label}  median {np.median(cycle_us):.0f} μs | P99 {np.percentile(cycle_us, 99):.0f} μs | "
+              f"max {cycle_us.max():.0f} μs | Φ* cycles mean {phi_cycles.mean():.0f} μs | "
+              f"Φ* {phi.phi_star if phi else float('nan'):.3f}")
+
+
+async def _drive_cycles(runner: "ReflexAgentRunner", n: int):
+    """Back-to-back cycles on simulated percepts (no sleep, no Redis)"""
+    rng = np.random.default_rng(0)
+    for c in range(n):
+        for i in range(runner.num_agents):
+            runner.spine.write_buffer(i, SpineFFI.BUF_PERCEPT,
+                                      rng.integers(0, 256, 32, dtype=np.uint8).tobytes())
+        await runner._run_cycle()
+
 
 if __name__ == "__main__":
     if "--serve" in sys.argv:
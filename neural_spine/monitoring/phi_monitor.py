@@ -5,7 +5,8 @@ FIX #8: Phi* (Integrated Information Theory) Consciousness Monitor
 ═══════════════════════════════════════════════════════════════════════════════
 
 Approximates Phi* — a proxy for integrated information across the 32-agent
-collective. Uses pairwise mutual information and random bipartitions.
+collective. Uses pairwise mutual information and a minimum-information
+bipartition search over the MI matrix.
 
 WHAT IT MEASURES:
   Phi* ≈ the degree to which the whole system generates more information
@@ -14,13 +15,21 @@ WHAT IT MEASURES:
 OPTIMIZATION:
   Full IIT computation is O(2^N) — impossible for N=32.
   We approximate via:
-    1. Pairwise MI matrix (empirical, sliding window)
-    2. Random bipartitions (50 samples) with geometric mean normalization
-    3. Minimum Information Bipartition (MIB) approximation
+    1. Pairwise MI matrix (empirical, sliding window) — all N(N-1)/2 joint
+       histograms built in one np.bincount over pair-offset bin codes.
+       The window is a preallocated ring with running sums and
+       cross-products, so the correlation matrix (Gaussian estimator) is
+       O(N²) at any time instead of O(T·N²) per evaluation
+    2. Bipartition cut = cross-partition MI with geometric mean normalization
+    3. Minimum Information Bipartition (MIB) search: exhaustive for N ≤ 16
+       (every cut scored in one mask-matrix product), spectral (Fiedler
+       sweep) + Kernighan–Lin refinement above that
 
 PERFORMANCE:
   Target: ≤50ms per evaluation (runs every 100 spine cycles)
-  With 32 agents, 50 bipartitions: ~20ms
+  With 32 agents: ~15ms, about 12 of it the spectral + KL MIB search
+  Exact histogram MI, 32 agents × 256 snapshots: a few ms batched
+  (the per-pair Python loop it replaced: ~160 ms)
 
 THRESHOLDS:
   GREEN:  Φ* > 1.0 — High integration (collective cognition)
@@ -64,6 +73,137 @@ class PhiResult:
         return json.dumps(self.to_dict())
 
 
+# ═══════════════════════════════════════════════════════════════════════════════
+# MINIMUM INFORMATION BIPARTITION SEARCH
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class MIBSearch:
+    """
+    Finds the bipartition (A, B) of an [N × N] MI matrix W minimising
+
+        cut(A, B) = Σ_{i∈A, j∈B} W_ij / sqrt(|A|·|B|)
+
+    N ≤ EXHAUSTIVE_MAX_N: all 2^(N-1) - 1 bipartitions, scored as one batch
+    of mask-matrix products — exact.
+    Larger N: order agents by the Fiedler vector of the normalized Laplacian,
+    score every prefix cut of that order, then refine the best prefix (and
+    KL_RESTARTS random masks) with Kernighan–Lin passes: each pass moves
+    every agent once, best move first, and keeps the best prefix of moves.
+    Move gains come from per-agent MI into A and B, updated in O(N) per move.
+    """
+
+    EXHAUSTIVE_MAX_N = 16
+    KL_RESTARTS = 4
+    EPSILON = 1e-12
+
+    def __init__(self, seed: int = 42):
+        self.seed = seed
+        self._exhaustive_masks: dict = {}      # N → [2^(N-1)-1 × N] float masks
+
+    def search(self, mi: np.ndarray) -> Tuple[float, Optional[np.ndarray]]:
+        """(normalized cut, boolean mask of side A); (inf, None) for N < 2"""
+        N = mi.shape[0]
+        if N < 2:
+            return float('inf'), None
+        if N <= self.EXHAUSTIVE_MAX_N:
+            return self._exhaustive(mi)
+        return self._spectral_kl(mi)
+
+    def cut_values(self, mi: np.ndarray, masks: np.ndarray) -> np.ndarray:
+        """Normalized cut of each row of masks [K × N] (1 = side A)"""
+        M = masks.astype(np.float64, copy=False)
+        cut = np.einsum('kn,kn->k', M @ mi, 1.0 - M)
+        size_a = M.sum(axis=1)
+        return cut / (np.sqrt(size_a * (mi.shape[0] - size_a)) + self.EPSILON)
+
+    # ── Exact ────────────────────────────────────────────────────────
+
+    def _masks(self, N: int) -> np.ndarray:
+        masks = self._exhaustive_masks.get(N)
+        if masks is None:
+            # Agent N-1 always on side B: each bipartition appears once
+            codes = np.arange(1, 2 ** (N - 1), dtype=np.int64)
+            masks = ((codes[:, None] >> np.arange(N)) & 1).astype(np.float64)
+            self._exhaustive_masks[N] = masks
+        return masks
+
+    def _exhaustive(self, mi: np.ndarray) -> Tuple[float, np.ndarray]:
+        masks = self._masks(mi.shape[0])
+        cuts = self.cut_values(mi, masks)
+        best = int(np.argmin(cuts))
+        return float(cuts[best]), masks[best] > 0
+
+    # ── Spectral + Kernighan–Lin ─────────────────────────────────────
+
+    def _spectral_kl(self, mi: np.ndarray) -> Tuple[float, np.ndarray]:
+        N = mi.shape[0]
+        degree = mi.sum(axis=1) + self.EPSILON
+        inv_sqrt = 1.0 / np.sqrt(degree)
+        laplacian = np.eye(N) - inv_sqrt[:, None] * mi * inv_sqrt[None, :]
+        _, vectors = np.linalg.eigh(laplacian)
+        order = np.argsort(vectors[:, 1] * inv_sqrt)
+
+        # Every prefix of the Fiedler order as side A
+        prefixes = np.zeros((N - 1, N))
+        prefixes[:, order] = np.tri(N - 1, N)
+        sweep = self.cut_values(mi, prefixes)
+
+        rng = np.random.default_rng(self.seed)
+        starts = [prefixes[int(np.argmin(sweep))] > 0]
+        for _ in range(self.KL_RESTARTS):
+            while True:
+                mask = rng.integers(0, 2, size=N).astype(bool)
+                if mask.any() and not mask.all():
+                    break
+            starts.append(mask)
+
+        best_cut, best_mask = float('inf'), None
+        for mask in starts:
+            cut, mask = self._kernighan_lin(mi, mask)
+            if cut < best_cut:
+                best_cut, best_mask = cut, mask
+        return best_cut, best_mask
+
+    def _kernighan_lin(self, mi: np.ndarray, mask: np.ndarray) -> Tuple[float, np.ndarray]:
+        N = mi.shape[0]
+        mask = mask.copy()
+        best = float(self.cut_values(mi, mask[None, :])[0])
+        while True:
+            in_a = mask.astype(np.float64)
+            to_a = mi @ in_a                            # MI from each agent into A
+            to_b = mi.sum(axis=1) - to_a
+            cut = float(in_a @ to_b)
+            n_a = float(in_a.sum())
+            locked = np.zeros(N, dtype=bool)
+            side = mask.copy()
+            moves, pass_best, pass_len = [], best, 0
+
+            for _ in range(N):
+                # Moving k across changes the cut by (MI to own side) - (MI to other side)
+                delta = np.where(side, to_a - to_b, to_b - to_a)
+                new_n_a = n_a + np.where(side, -1.0, 1.0)
+                score = (cut + delta) / (np.sqrt(new_n_a * (N - new_n_a)) + self.EPSILON)
+                score[locked | (new_n_a < 1) | (new_n_a > N - 1)] = np.inf
+                k = int(np.argmin(score))
+                if not np.isfinite(score[k]):
+                    break
+                sign = -1.0 if side[k] else 1.0         # A → B removes k from A
+                to_a += sign * mi[:, k]
+                to_b -= sign * mi[:, k]
+                cut += delta[k]
+                n_a += sign
+                side[k] = not side[k]
+                locked[k] = True
+                moves.append(k)
+                if score[k] < pass_best - self.EPSILON:
+                    pass_best, pass_len = float(score[k]), len(moves)
+
+            if pass_len == 0:
+                return best, mask
+            mask[moves[:pass_len]] = ~mask[moves[:pass_len]]
+            best = pass_best
+
+
 class PhiStarMonitor:
     """
     ═══════════════════════════════════════════════════════════════════════════
@@ -73,7 +213,7 @@ class PhiStarMonitor:
     Monitors the integrated information of the 32-agent collective by:
       1. Collecting workspace buffer snapshots from each agent
       2. Building a pairwise Mutual Information matrix
-      3. Evaluating random bipartitions to find the MIB
+      3. Searching for the MIB (MIBSearch)
       4. Computing Phi* = whole_system_info - MIB_cut_info
 
     Runs every 100 spine cycles (~5 seconds at 20 Hz cognitive loop).
@@ -81,44 +221,50 @@ class PhiStarMonitor:
 
     NUM_AGENTS = 32
     WINDOW_SIZE = 256         # Sliding window for MI estimation
-    NUM_BIPARTITIONS = 50     # Random bipartitions to sample
     EPSILON = 1e-12
 
     # Thresholds
     PHI_GREEN = 1.0
     PHI_YELLOW = 0.0
 
-    def __init__(self, num_agents: int = 32, seed: int = 42):
+    def __init__(self, num_agents: int = 32, seed: int = 42,
+                 mi_estimator: str = "histogram",
+                 ring: Optional[np.ndarray] = None):
         self.num_agents = num_agents
-        self.rng = np.random.default_rng(seed)
 
-        # Sliding window of agent workspace snapshots
-        # Each snapshot: [num_agents] vector of workspace "activity" values
-        self._window: List[np.ndarray] = []
+        # "histogram" — exact binned MI (batched, any N)
+        # "gaussian"  — -0.5·log(1-ρ²) correlation proxy
+        assert mi_estimator in ("histogram", "gaussian"), mi_estimator
+        self.mi_estimator = mi_estimator
+
+        # Sliding window of agent workspace snapshots: a preallocated ring
+        # [WINDOW_SIZE × num_agents]; row _head is the next one overwritten.
+        # Each snapshot: [num_agents] vector of workspace "activity" values.
+        # `ring` lets the caller supply the storage (e.g. a shared-memory
+        # block another process reads — see PhiWorker)
+        if ring is None:
+            ring = np.zeros((self.WINDOW_SIZE, num_agents))
+        assert ring.shape == (self.WINDOW_SIZE, num_agents), ring.shape
+        self._ring = ring
+        self._head = 0
+        self._count = 0
+
+        # Running Σ(x-s) and Σ(x-s)(x-s)ᵀ over the window. The shift s (first
+        # snapshot, then the window mean at each resync) keeps the covariance
+        # free of cancellation; a full recompute every WINDOW_SIZE snapshots
+        # bounds floating-point drift at amortized O(N²)
+        self._shift = np.zeros(num_agents)
+        self._sum = np.zeros(num_agents)
+        self._cross = np.zeros((num_agents, num_agents))
+        self._outer = np.empty((num_agents, num_agents))
+        self._since_resync = 0
 
         # History of Phi* values
         self.phi_history: List[float] = []
         self.compute_times: List[float] = []
 
-        # Pre-generate bipartitions for reproducibility
-        self._bipartitions = self._generate_bipartitions()
-
-    def _generate_bipartitions(self) -> List[Tuple[np.ndarray, np.ndarray]]:
-        """
-        Pre-generate random bipartitions of the agent set.
-        Each bipartition splits agents into two non-empty groups.
-        """
-        bipartitions = []
-        for _ in range(self.NUM_BIPARTITIONS):
-            # Random binary mask (ensure both sides non-empty)
-            while True:
-                mask = self.rng.integers(0, 2, size=self.num_agents).astype(bool)
-                if mask.any() and (~mask).any():
-                    break
-            side_a = np.where(mask)[0]
-            side_b = np.where(~mask)[0]
-            bipartitions.append((side_a, side_b))
-        return bipartitions
+        # Deterministic per seed: the same MI matrix always gives the same MIB
+        self.mib_search = MIBSearch(seed=seed)
 
     def add_snapshot(self, workspace_values: np.ndarray):
         """
@@ -131,19 +277,153 @@ class PhiStarMonitor:
         """
         assert workspace_values.shape == (self.num_agents,), (
             f"Expected ({self.num_agents},), got {workspace_values.shape}")
-        self._window.append(workspace_values.copy())
-        if len(self._window) > self.WINDOW_SIZE:
-            self._window.pop(0)
+        if self._count == 0:
+            self._shift[:] = workspace_values
+        if self._count == self.WINDOW_SIZE:
+            # Evict the oldest row from the running sums — O(N²)
+            old = self._ring[self._head] - self._shift
+            self._sum -= old
+            self._cross -= np.outer(old, old, out=self._outer)
+        else:
+            self._count += 1
+        self._ring[self._head] = workspace_values
+        self._head = (self._head + 1) % self.WINDOW_SIZE
+
+        x = workspace_values - self._shift
+        self._sum += x
+        self._cross += np.outer(x, x, out=self._outer)
+
+        self._since_resync += 1
+        if self._since_resync >= self.WINDOW_SIZE:
+            self._resync()
+
+    def _resync(self):
+        """Recompute the running sums exactly from the ring (re-centred)"""
+        data = self._ring[:self._count]
+        self._shift = data.mean(axis=0)
+        centred = data - self._shift
+        self._sum = centred.sum(axis=0)
+        self._cross = centred.T @ centred
+        self._since_resync = 0
+
+    def load_window(self, ring: np.ndarray, count: int, head: int):
+        """
+        Replace the window with a copy of another monitor's ring (storage
+        order, `count` rows filled, `head` next to overwrite) and rebuild
+        the running sums from it
+        """
+        self._ring[:] = ring
+        self._count = int(count)
+        self._head = int(head)
+        if self._count:
+            self._resync()
+        else:
+            self._sum[:] = 0.0
+            self._cross[:] = 0.0
+
+    @property
+    def window_len(self) -> int:
+        return self._count
+
+    @property
+    def window_head(self) -> int:
+        """Ring row the next snapshot overwrites"""
+        return self._head
+
+    def rebind_ring(self, ring: Optional[np.ndarray] = None):
+        """
+        Move the window into `ring` (a private copy if None), keeping its
+        rows, head and running sums — e.g. to detach from a shared-memory
+        block before it is closed
+        """
+        if ring is None:
+            ring = np.empty_like(self._ring)
+        assert ring.shape == self._ring.shape, ring.shape
+        ring[:] = self._ring
+        self._ring = ring
+
+    def window_data(self, ordered: bool = True) -> np.ndarray:
+        """
+        Window as [T × N]. ordered=True: oldest first (a copy once the ring
+        has wrapped). ordered=False: ring storage order, a view without
+        copying — for order-independent statistics; don't mutate it.
+        """
+        if not ordered or self._count < self.WINDOW_SIZE or self._head == 0:
+            return self._ring[:self._count]
+        return np.concatenate((self._ring[self._head:], self._ring[:self._head]))
+
+    def window_moments(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Mean [N] and covariance [N × N] of the window, from running sums — O(N²)"""
+        if self._count == 0:
+            return np.zeros(self.num_agents), np.zeros((self.num_agents, self.num_agents))
+        m = self._sum / self._count
+        cov = self._cross / self._count - np.outer(m, m)
+        return m + self._shift, cov
+
+    def correlation_matrix(self) -> np.ndarray:
+        """Pearson correlation [N × N] of the window, from running sums — O(N²)"""
+        _, cov = self.window_moments()
+        std = np.sqrt(np.clip(np.diag(cov), 0.0, None)) + self.EPSILON
+        return cov / np.outer(std, std)
+
+    def _num_bins(self, T: int) -> int:
+        return max(4, min(16, int(np.sqrt(T))))
+
+    def _discretize(self, data: np.ndarray, num_bins: int) -> np.ndarray:
+        """[T × N] values → [T × N] bin indices in [0, num_bins), per column"""
+        col_min = data.min(axis=0)
+        span = data.max(axis=0) - col_min
+        normalized = (data - col_min) / (span + self.EPSILON)
+        bins = np.clip((normalized * num_bins).astype(np.int32), 0, num_bins - 1)
+        bins[:, span < self.EPSILON] = 0
+        return bins
 
     def _compute_mi_matrix(self, data: np.ndarray) -> np.ndarray:
         """
         Compute pairwise Mutual Information matrix.
 
-        Uses discretized histogram-based MI estimation.
+        Uses discretized histogram-based MI estimation, batched over all pairs:
+        pair p = (i, j) at time t gets the code p·B² + bin_i·B + bin_j, so a
+        single np.bincount yields every [B × B] joint histogram at once.
         data: [T × N] matrix (T time steps, N agents)
 
         Returns: [N × N] MI matrix
         """
+        T, N = data.shape
+        mi = np.zeros((N, N))
+        if N < 2:
+            return mi
+
+        num_bins = self._num_bins(T)
+        bins = self._discretize(data, num_bins)
+
+        iu, ju = np.triu_indices(N, k=1)
+        P = len(iu)
+        cell = num_bins * num_bins
+        codes = bins[:, iu] * num_bins + bins[:, ju]              # [T × P]
+        codes += np.arange(P, dtype=np.int32) * cell
+        joint = np.bincount(codes.ravel(), minlength=P * cell)
+        joint = joint.reshape(P, num_bins, num_bins) / T          # [P × B × B]
+
+        p_i = joint.sum(axis=2, keepdims=True)                    # [P × B × 1]
+        p_j = joint.sum(axis=1, keepdims=True)                    # [P × 1 × B]
+
+        # MI = Σ p(x,y) * log(p(x,y) / (p(x)*p(y))) over occupied cells
+        # (an occupied cell implies both marginals are non-zero)
+        occupied = joint > self.EPSILON
+        ratio = np.divide(joint, p_i * p_j, out=np.ones_like(joint), where=occupied)
+        mi_pairs = (joint * np.log(ratio)).sum(axis=(1, 2))
+
+        mi[iu, ju] = mi_pairs
+        mi[ju, iu] = mi_pairs
+        return mi
+
+    def _compute_mi_matrix_loop(self, data: np.ndarray) -> np.ndarray:
+        """
+        Reference implementation of _compute_mi_matrix: one pair, one time
+        step and one histogram cell at a time. Kept for accuracy tests and
+        the benchmark.
+        """
         N = data.shape[1]
         mi = np.zeros((N, N))
 
@@ -202,8 +482,6 @@ class PhiStarMonitor:
 
         Much faster than histogram-based: O(N²·T) instead of O(N²·T·B²)
         """
-        N = data.shape[1]
-
         # Standardize
         data_std = data - data.mean(axis=0, keepdims=True)
         stds = data_std.std(axis=0, keepdims=True) + self.EPSILON
@@ -211,7 +489,10 @@ class PhiStarMonitor:
 
         # Correlation matrix (fully vectorized)
         corr = (data_std.T @ data_std) / data.shape[0]
+        return self._gaussian_mi(corr)
 
+    def _gaussian_mi(self, corr: np.ndarray) -> np.ndarray:
+        """MI proxy matrix from a correlation matrix"""
         # Clip to avoid log(0) or log(negative)
         corr = np.clip(corr, -0.9999, 0.9999)
 
@@ -221,25 +502,6 @@ class PhiStarMonitor:
 
         return mi
 
-    def _evaluate_bipartition(self, mi: np.ndarray,
-                               side_a: np.ndarray,
-                               side_b: np.ndarray) -> float:
-        """
-        Compute the information lost when cutting the system at this bipartition.
-
-        cut_info = Σ MI(i, j) for all i in side_a, j in side_b
-        = the total mutual information across the cut
-
-        Lower cut_info = closer to Minimum Information Bipartition (MIB)
-        """
-        # Extract cross-partition MI values (vectorized slicing)
-        cross_mi = mi[np.ix_(side_a, side_b)]
-        cut_info = cross_mi.sum()
-
-        # Normalize by partition sizes (geometric mean normalization)
-        norm = np.sqrt(len(side_a) * len(side_b))
-        return cut_info / (norm + self.EPSILON)
-
     def compute_phi_star(self, active_mask: Optional[np.ndarray] = None) -> PhiResult:
         """
         ═══════════════════════════════════════════════════════════════════════
@@ -255,7 +517,7 @@ class PhiStarMonitor:
         """
         start = time.perf_counter()
 
-        if len(self._window) < 16:
+        if self._count < 16:
             return PhiResult(
                 phi_star=0.0, phi_normalized=0.0,
                 mi_matrix=np.zeros((self.num_agents, self.num_agents)),
@@ -266,12 +528,9 @@ class PhiStarMonitor:
                 status="RED"
             )
 
-        # Build data matrix [T × N]
-        data = np.array(self._window)  # [T × num_agents]
-
         # Determine active agents
         if active_mask is None:
-            variances = data.var(axis=0)
+            variances = np.diag(self.window_moments()[1])
             active_mask = variances > self.EPSILON
 
         active_indices = np.where(active_mask)[0]
@@ -288,41 +547,25 @@ class PhiStarMonitor:
                 status="RED"
             )
 
-        # Extract active agent data only
-        active_data = data[:, active_indices]  # [T × num_active]
-
         # ── Compute pairwise MI matrix ────────────────────────────────────
-        # Use fast (correlation-based) for ≥16 agents, histogram for <16
-        if num_active >= 16:
-            mi_active = self._compute_mi_matrix_fast(active_data)
+        if self.mi_estimator == "gaussian":
+            # O(N²) from the running sums — no pass over the window
+            corr = self.correlation_matrix()[np.ix_(active_indices, active_indices)]
+            mi_active = self._gaussian_mi(corr)
         else:
+            # Histograms don't depend on row order: use the ring in place
+            active_data = self.window_data(ordered=False)[:, active_indices]  # [T × num_active]
             mi_active = self._compute_mi_matrix(active_data)
 
         # ── Total system information ──────────────────────────────────────
         total_mi = mi_active.sum() / 2  # Upper triangle sum
 
         # ── Find Minimum Information Bipartition ──────────────────────────
-        min_cut = float('inf')
-        best_partition = ([], [])
-
-        for side_a_full, side_b_full in self._bipartitions:
-            # Map to active agent indices
-            side_a = np.array([i for i in range(num_active)
-                              if active_indices[i] in side_a_full])
-            side_b = np.array([i for i in range(num_active)
-                              if active_indices[i] in side_b_full])
-
-            if len(side_a) == 0 or len(side_b) == 0:
-                continue
-
-            cut_info = self._evaluate_bipartition(mi_active, side_a, side_b)
-
-            if cut_info < min_cut:
-                min_cut = cut_info
-                best_partition = (
-                    active_indices[side_a].tolist(),
-                    active_indices[side_b].tolist()
-                )
+        min_cut, mib_mask = self.mib_search.search(mi_active)
+        best_partition = (
+            active_indices[mib_mask].tolist(),
+            active_indices[~mib_mask].tolist()
+        )
 
         # ── Phi* = total_info - min_cut ───────────────────────────────────
         # High Phi* means even the weakest cut still has significant info flow
@@ -439,6 +682,77 @@ def benchmark():
     trend = monitor.get_trend()
     print(f"\n  Trend: {trend}")
 
+    # Histogram MI engine: per-pair loop vs batched bincount
+    data = monitor.window_data()
+    print(f"\n  ═══ Histogram MI matrix ({data.shape[1]} agents × {data.shape[0]} snapshots) ═══")
+    start = time.perf_counter()
+    mi_loop = monitor._compute_mi_matrix_loop(data)
+    loop_ms = (time.perf_counter() - start) * 1000
+    batched = []
+    for _ in range(20):
+        start = time.perf_counter()
+        mi_batched = monitor._compute_mi_matrix(data)
+        batched.append((time.perf_counter() - start) * 1000)
+    batched_ms = float(np.median(batched))
+    print(f"  Loop:     {loop_ms:.2f} ms")
+    print(f"  Batched:  {batched_ms:.2f} ms  ({loop_ms / batched_ms:.0f}× faster)")
+    print(f"  Max |Δ|:  {np.abs(mi_loop - mi_batched).max():.2e}")
+    for n in (64, 128):
+        wide = np.tile(data, (1, n // data.shape[1])) + rng.standard_normal((data.shape[0], n)) * 0.05
+        start = time.perf_counter()
+        monitor._compute_mi_matrix(wide)
+        print(f"  Batched, {n} agents: {(time.perf_counter() - start) * 1000:.2f} ms")
+
+    # Sliding window: list + rebuild vs ring buffer + running sums
+    print(f"\n  ═══ Sliding window (32 agents, window {PhiStarMonitor.WINDOW_SIZE}) ═══")
+    snapshots = rng.standard_normal((2000, 32))
+    window: List[np.ndarray] = []
+    start = time.perf_counter()
+    for x in snapshots:
+        window.append(x.copy())
+        if len(window) > PhiStarMonitor.WINDOW_SIZE:
+            window.pop(0)
+    list_add_us = (time.perf_counter() - start) / len(snapshots) * 1e6
+    ring = PhiStarMonitor(num_agents=32, mi_estimator="gaussian")
+    start = time.perf_counter()
+    for x in snapshots:
+        ring.add_snapshot(x)
+    ring_add_us = (time.perf_counter() - start) / len(snapshots) * 1e6
+
+    rebuild, running = [], []
+    for _ in range(50):
+        start = time.perf_counter()
+        ring._compute_mi_matrix_fast(np.array(window))
+        rebuild.append((time.perf_counter() - start) * 1e6)
+        start = time.perf_counter()
+        ring._gaussian_mi(ring.correlation_matrix())
+        running.append((time.perf_counter() - start) * 1e6)
+    diff = np.abs(ring._compute_mi_matrix_fast(np.array(window))
+                  - ring._gaussian_mi(ring.correlation_matrix())).max()
+    print(f"  Per snapshot:   list {list_add_us:.1f} µs | ring + running sums {ring_add_us:.1f} µs")
+    print(f"  Per evaluation: rebuild {np.median(rebuild):.0f} µs | running sums {np.median(running):.0f} µs")
+    print(f"  Max |Δ| MI:     {diff:.2e}")
+
+    # MIB search: 50 random masks (previous behaviour) vs exhaustive / spectral + KL
+    print(f"\n  ═══ MIB search (histogram MI of clustered agents) ═══")
+    search = MIBSearch(seed=0)
+    for n in (16, 32, 64):
+        t = np.arange(256)[:, None]
+        cluster = np.arange(n)[None, :] // 4
+        mi = ring._compute_mi_matrix(np.sin(t * 0.05 * (cluster + 1))
+                                     + rng.standard_normal((256, n)) * 0.4)
+        masks = rng.integers(0, 2, size=(50, n))
+        masks = masks[(masks.sum(axis=1) > 0) & (masks.sum(axis=1) < n)]
+        start = time.perf_counter()
+        random_cut = search.cut_values(mi, masks).min()
+        random_ms = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        cut, _ = search.search(mi)
+        search_ms = (time.perf_counter() - start) * 1000
+        method = "exhaustive" if n <= MIBSearch.EXHAUSTIVE_MAX_N else "spectral+KL"
+        print(f"  {n:3d} agents: random-50 cut {random_cut:.4f} ({random_ms:.2f} ms) | "
+              f"{method} cut {cut:.4f} ({search_ms:.2f} ms)")
+
 
 if __name__ == "__main__":
     benchmark()
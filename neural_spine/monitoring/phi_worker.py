@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+═══════════════════════════════════════════════════════════════════════════════
+Phi* Worker — off-loop Phi* evaluation for the cognitive loop
+═══════════════════════════════════════════════════════════════════════════════
+
+compute_phi_star takes ~15 ms for 32 agents (histogram MI + MIB search). Run
+inline, that lands in one 50 ms cycle of the 20 Hz loop every 100 cycles and
+delays every agent's action in it. PhiWorker moves it to a child process:
+
+  1. The loop's PhiStarMonitor keeps its window ring in a shared-memory
+     block, so add_snapshot writes each row exactly once — nothing is copied
+     or pickled when an evaluation is requested
+  2. request() sends the worker a wake-up (one small pipe message) and
+     returns at once; at most one evaluation is outstanding, extra requests
+     are counted as skipped
+  3. The worker copies the ring under a seqlock (retrying if a snapshot was
+     written mid-copy), rebuilds its own monitor from it and computes Phi*
+  4. poll() is a non-blocking check for the result, called once per cycle
+
+If the worker dies (or its pipe breaks) it is respawned in the background,
+up to PHI_WORKER_RESTARTS times; after that, request() evaluates inline on
+the loop monitor so Phi* keeps being reported, just on the loop again. An
+exception inside the worker's compute_phi_star comes back as an error
+reply: counted, logged, and the worker stays up.
+
+A separate process (not a thread) because MI binning and the KL passes hold
+the GIL — a thread would still stall the loop for most of those 15 ms.
+
+The worker runs at nice +PHI_WORKER_NICE (default 10) so that on a
+saturated cpuset Phi* is what waits, not the agents.
+
+Header layout (int64): [seq, head, count]. seq is odd while a row is being
+written; count/head mirror the loop monitor's ring state.
+
+═══════════════════════════════════════════════════════════════════════════════
+"""
+
+import multiprocessing
+import os
+import traceback
+import sys
+import time
+from multiprocessing import shared_memory
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from monitoring.phi_monitor import PhiResult, PhiStarMonitor
+
+HEADER_LEN = 3
+SEQ, HEAD, COUNT = range(HEADER_LEN)
+
+WORKER_NICE = int(os.environ.get("PHI_WORKER_NICE", 10))
+MAX_RESTARTS = int(os.environ.get("PHI_WORKER_RESTARTS", 3))
+
+
+def _views(shm: shared_memory.SharedMemory, num_agents: int):
+    header = np.ndarray((HEADER_LEN,), dtype=np.int64, buffer=shm.buf)
+    ring = np.ndarray((PhiStarMonitor.WINDOW_SIZE, num_agents), dtype=np.float64,
+                      buffer=shm.buf, offset=header.nbytes)
+    return header, ring
+
+
+def _worker_main(shm_name: str, num_agents: int, mi_estimator: str, seed: int, conn):
+    # Background priority: where the worker has no core of its own it
+    # yields to the cognitive loop instead of splitting the CPU evenly
+    os.nice(WORKER_NICE)
+    # Attaching registers the block with the resource tracker the spawn
+    # child shares with its parent, which unlinks it in close()
+    shm = shared_memory.SharedMemory(name=shm_name)
+    header, ring = _views(shm, num_agents)
+    monitor = PhiStarMonitor(num_agents=num_agents, seed=seed, mi_estimator=mi_estimator)
+    conn.send("ready")
+    try:
+        while True:
+            if conn.recv() is None:
+                break
+            seq, torn = 0, 0
+            try:
+                while True:
+                    seq = int(header[SEQ])
+                    if seq & 1:
+                        time.sleep(0.0001)
+                        continue
+                    monitor.load_window(ring, header[COUNT], header[HEAD])
+                    if int(header[SEQ]) == seq:
+                        break
+                    torn += 1
+                conn.send((seq // 2, torn, monitor.compute_phi_star(), None))
+            except Exception:
+                # Reply anyway, or the loop would wait on this request forever
+                conn.send((seq // 2, torn, None, traceback.format_exc(limit=3)))
+    except (EOFError, KeyboardInterrupt):
+        pass
+    finally:
+        del header, ring
+        shm.close()
+
+
+class PhiWorker:
+    """
+    Owns the shared window, the loop-side PhiStarMonitor writing into it and
+    the child process evaluating Phi* from it.
+    """
+
+    def __init__(self, num_agents: int = 32, mi_estimator: str = "histogram", seed: int = 42):
+        self.num_agents = num_agents
+        self.mi_estimator = mi_estimator
+        self.seed = seed
+
+        size = 8 * (HEADER_LEN + PhiStarMonitor.WINDOW_SIZE * num_agents)
+        self._shm = shared_memory.SharedMemory(create=True, size=size)
+        self._header, ring = _views(self._shm, num_agents)
+        self._header[:] = 0
+        self.monitor = PhiStarMonitor(num_agents=num_agents, seed=seed,
+                                      mi_estimator=mi_estimator, ring=ring)
+
+        self._proc: Optional[multiprocessing.Process] = None
+        self._conn = None
+        self._ready = False
+        self._pending = False
+        self._inline = False                        # worker given up on
+        self._inline_result: Optional[PhiResult] = None
+
+        # Metrics
+        self.requests = 0
+        self.results = 0
+        self.skipped = 0
+        self.torn_reads = 0
+        self.errors = 0             # evaluations that raised in the worker
+        self.restarts = 0
+        self.last_lag = 0           # snapshots added between request and read
+
+    def start(self, timeout: float = 30.0):
+        """Spawn the worker process and wait until it is ready for requests"""
+        self._spawn()
+        if not self._conn.poll(timeout) or self._conn.recv() != "ready":
+            raise RuntimeError(f"phi_worker did not start within {timeout}s")
+        self._ready = True
+
+    def _spawn(self):
+        ctx = multiprocessing.get_context("spawn")
+        self._conn, child = ctx.Pipe()
+        self._proc = ctx.Process(
+            target=_worker_main, name="phi_worker", daemon=True,
+            args=(self._shm.name, self.num_agents, self.mi_estimator, self.seed, child))
+        self._proc.start()
+        child.close()
+        self._ready = False
+
+    def _reap(self):
+        """Drop the current worker process and its pipe"""
+        if self._proc is not None:
+            if self._proc.is_alive():
+                self._proc.kill()
+            self._proc.join()
+            self._conn.close()
+        self._proc, self._conn = None, None
+        self._ready = self._pending = False
+
+    def _worker_lost(self, reason: str):
+        """Respawn without blocking the loop, or fall back to inline evaluation"""
+        self._reap()
+        if self.restarts < MAX_RESTARTS:
+            self.restarts += 1
+            print(f"  ⚠ phi_worker lost ({reason}) — restarting "
+                  f"({self.restarts}/{MAX_RESTARTS})")
+            self._spawn()
+        else:
+            print(f"  ⚠ phi_worker lost ({reason}) — evaluating Phi* inline from now on")
+            self._inline = True
+
+    def add_snapshot(self, workspace_values: np.ndarray):
+        """Write one snapshot into the shared window (seqlock-guarded)"""
+        header = self._header
+        header[SEQ] += 1
+        self.monitor.add_snapshot(workspace_values)
+        header[HEAD] = self.monitor.window_head
+        header[COUNT] = self.monitor.window_len
+        header[SEQ] += 1
+
+    def request(self) -> bool:
+        """Ask for an evaluation of the current window; never blocks unless inline"""
+        if not self._inline and self._proc is not None and not self._proc.is_alive():
+            self._worker_lost(f"exit code {self._proc.exitcode}")
+        if self._inline:
+            self._inline_result = self.monitor.compute_phi_star()
+            self.requests += 1
+            return True
+        if self._proc is None or not self._ready or self._pending:
+            # Not started, still (re)starting, or one already outstanding
+            self.skipped += 1
+            return False
+        try:
+            self._conn.send(1)
+        except (BrokenPipeError, OSError) as e:
+            self.skipped += 1
+            self._worker_lost(type(e).__name__)
+            return False
+        self._pending = True
+        self.requests += 1
+        return True
+
+    def poll(self) -> Optional[PhiResult]:
+        """The finished evaluation, if one arrived since the last call"""
+        if self._inline_result is not None:
+            result, self._inline_result = self._inline_result, None
+            self.results += 1
+            return result
+        if self._conn is None or not (self._pending or not self._ready):
+            return None
+        try:
+            if not self._conn.poll():
+                return None
+            reply = self._conn.recv()
+        except (EOFError, OSError) as e:
+            self._worker_lost(type(e).__name__)
+            return None
+        if reply == "ready":
+            self._ready = True
+            return None
+        seq, torn, result, error = reply
+        self._pending = False
+        self.torn_reads += torn
+        if error is not None:
+            self.errors += 1
+            print(f"  ⚠ phi_worker evaluation failed:\n{error}")
+            return None
+        self.results += 1
+        self.last_lag = int(self._header[SEQ]) // 2 - seq
+        return result
+
+    def stats(self) -> dict:
+        return {
+            "alive": self._proc is not None and self._proc.is_alive(),
+            "inline": self._inline,
+            "requests": self.requests,
+            "results": self.results,
+            "skipped": self.skipped,
+            "errors": self.errors,
+            "restarts": self.restarts,
+            "torn_reads": self.torn_reads,
+            "last_lag_snapshots": self.last_lag,
+        }
+
+    def close(self, timeout: float = 2.0):
+        if self._shm is None:
+            return
+        if self._proc is not None:
+            try:
+                self._conn.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+            self._proc.join(timeout)
+            self._reap()
+        # Views into the block must go before it can be closed; the loop
+        # monitor keeps its window in a private copy
+        self.monitor.rebind_ring()
+        self._header = None
+        self._shm.close()
+        self._shm.unlink()
+        self._shm = None
@@ -0,0 +1,13 @@
+"""
+Synthetic agent workspace data shared by the Phi* tests.
+"""
+
+import numpy as np
+
+
+def clustered(T: int, N: int, seed: int = 0) -> np.ndarray:
+    """[T × N] workspace values: agents in blocks of 4 share a sine, plus noise"""
+    rng = np.random.default_rng(seed)
+    t = np.arange(T)[:, None]
+    cluster = np.arange(N)[None, :] // 4
+    return np.sin(t * 0.05 * (cluster + 1)) + rng.standard_normal((T, N)) * 0.4
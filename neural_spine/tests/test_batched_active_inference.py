@@ -0,0 +1,91 @@
+"""
+═══════════════════════════════════════════════════════════════════════════════
+Batched Active Inference — parity with the per-agent engine
+═══════════════════════════════════════════════════════════════════════════════
+BatchedActiveInference over K agents must reproduce K ActiveInferenceAgent
+objects fed the same observations: beliefs and EFE to floating-point
+rounding, and — with the global RNG seeded identically — the same actions.
+
+Usage:
+    python -m pytest neural_spine/tests/test_batched_active_inference.py -q
+═══════════════════════════════════════════════════════════════════════════════
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from agents.active_inference import (
+    ActiveInferenceAgent, BatchedActiveInference, GenerativeModel, create_default_model,
+)
+
+
+def _models(K: int, num_states: int = 64, num_obs: int = 32, num_actions: int = 8):
+    """Distinct A, B, C per agent (create_default_model alone only varies C)"""
+    models = []
+    for k in range(K):
+        rng = np.random.default_rng(k)
+        B = rng.dirichlet(np.ones(num_states), size=(num_actions, num_states)).transpose(2, 1, 0)
+        models.append(GenerativeModel(
+            A=rng.dirichlet(np.ones(num_obs), size=num_states).T,
+            B=np.ascontiguousarray(B),
+            C=rng.standard_normal(num_obs) * 0.5,
+            D=rng.dirichlet(np.ones(num_states)),
+        ))
+    return models
+
+
+def _observations(T: int, K: int, num_obs: int, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    return rng.dirichlet(np.ones(num_obs), size=(T, K))
+
+
+def test_expected_free_energy_matches_per_agent():
+    models = _models(6, num_states=16, num_obs=8, num_actions=5)
+    agents = [ActiveInferenceAgent(m, agent_id=k) for k, m in enumerate(models)]
+    engine = BatchedActiveInference.from_agents(agents)
+    for obs in _observations(3, 6, 8):
+        engine.belief_update(obs)
+        for k, agent in enumerate(agents):
+            agent.belief_update(obs[k])
+        expected = [[a.compute_expected_free_energy([u]) for u in range(5)] for a in agents]
+        np.testing.assert_allclose(engine.expected_free_energy(), expected, rtol=0, atol=1e-12)
+        np.testing.assert_allclose(engine.q_s, [a.state.q_s for a in agents], rtol=0, atol=1e-15)
+
+
+@pytest.mark.parametrize("K", [1, 32])
+def test_cognitive_cycle_parity(K):
+    models = _models(K)
+    agents = [ActiveInferenceAgent(m, agent_id=k) for k, m in enumerate(models)]
+    engine = BatchedActiveInference(models)
+    observations = _observations(50, K, 32, seed=K)
+
+    np.random.seed(7)
+    per_agent = [[a.cognitive_cycle(obs[k]) for k, a in enumerate(agents)] for obs in observations]
+    np.random.seed(7)
+    batched = [tuple(map(np.copy, engine.cognitive_cycle(obs))) for obs in observations]
+
+    for step, (expected, (actions, free_energy)) in enumerate(zip(per_agent, batched)):
+        np.testing.assert_array_equal(actions, [a for a, _ in expected], err_msg=f"step {step}")
+        np.testing.assert_allclose(free_energy, [g for _, g in expected], rtol=0, atol=1e-12)
+    np.testing.assert_allclose(engine.q_s, [a.state.q_s for a in agents], rtol=0, atol=1e-15)
+    assert engine.cycle_count == 50
+
+
+def test_update_model_matches_agent():
+    models = _models(4, num_states=16, num_obs=8, num_actions=3)
+    agents = [ActiveInferenceAgent(m, agent_id=k) for k, m in enumerate(models)]
+    engine = BatchedActiveInference.from_agents(agents)
+    new = _models(1, num_states=16, num_obs=8, num_actions=3)[0]
+    agents[2].update_model(new_A=new.A, new_B=new.B, new_C=new.C)
+    engine.update_model(2, new_A=new.A, new_B=new.B, new_C=new.C)
+    expected = [[a.compute_expected_free_energy([u]) for u in range(3)] for a in agents]
+    np.testing.assert_allclose(engine.expected_free_energy(), expected, rtol=0, atol=1e-12)
+
+
+def test_rejects_mixed_shapes():
+    with pytest.raises(AssertionError):
+        BatchedActiveInference([create_default_model(64, 32, 8), create_default_model(32, 32, 8)])
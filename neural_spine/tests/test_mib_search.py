@@ -0,0 +1,115 @@
+"""
+═══════════════════════════════════════════════════════════════════════════════
+Phi* Monitor — Minimum Information Bipartition search tests
+═══════════════════════════════════════════════════════════════════════════════
+Synthetic block-structured MI matrices (strong MI inside blocks, weak across):
+  1. Exhaustive search equals brute force over every bipartition
+  2. Spectral + Kernighan–Lin finds the exact optimum where brute force is
+     still feasible, and recovers a planted two-block split at N=64
+  3. For the time the engine takes, random bipartition sampling (what
+     compute_phi_star used before) never finds a lower cut
+  4. compute_phi_star reports the partition the search found, and its cut is
+     no worse than the planted split or the old 50 random masks
+
+Usage:
+    python -m pytest neural_spine/tests/test_mib_search.py -q
+═══════════════════════════════════════════════════════════════════════════════
+"""
+
+import itertools
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from monitoring.phi_monitor import MIBSearch, PhiStarMonitor
+
+
+def _block_mi(N: int, blocks: int, seed: int, inside: float = 1.0,
+              across: float = 0.1, noise: float = 0.05):
+    rng = np.random.default_rng(seed)
+    labels = rng.permutation(np.arange(N) % blocks)
+    mi = np.where(labels[:, None] == labels[None, :], inside, across)
+    mi = mi + rng.random((N, N)) * noise
+    mi = (mi + mi.T) / 2
+    np.fill_diagonal(mi, 0.0)
+    return mi, labels
+
+
+def _brute_force(mi: np.ndarray) -> float:
+    # Σ MI across the cut / sqrt(|A|·|B|), one index set at a time
+    N, best = mi.shape[0], float('inf')
+    for size in range(1, N):
+        for side_a in itertools.combinations(range(N), size):
+            side_b = np.setdiff1d(np.arange(N), side_a)
+            cut = mi[np.ix_(side_a, side_b)].sum() / (np.sqrt(size * len(side_b)) + MIBSearch.EPSILON)
+            best = min(best, cut)
+    return best
+
+
+@pytest.mark.parametrize("N,blocks,seed", [(2, 1, 0), (5, 2, 1), (9, 3, 2), (12, 4, 3)])
+def test_exhaustive_matches_brute_force(N, blocks, seed):
+    mi, _ = _block_mi(N, blocks, seed)
+    cut, mask = MIBSearch().search(mi)
+    assert cut == pytest.approx(_brute_force(mi), abs=1e-12)
+    assert mask.any() and not mask.all()
+    assert MIBSearch().cut_values(mi, mask[None, :])[0] == pytest.approx(cut, abs=1e-12)
+
+
+@pytest.mark.parametrize("N,blocks,seed", [(17, 2, 4), (18, 3, 5), (20, 4, 6)])
+def test_spectral_kl_reaches_exact_optimum(N, blocks, seed):
+    search = MIBSearch()
+    mi, _ = _block_mi(N, blocks, seed, noise=0.3)
+    exact, _ = search._exhaustive(mi)
+    cut, _ = search.search(mi)                     # N > EXHAUSTIVE_MAX_N → spectral + KL
+    assert cut == pytest.approx(exact, abs=1e-9)
+
+
+def test_recovers_planted_two_block_split():
+    mi, labels = _block_mi(64, 2, seed=7, across=0.0, noise=0.02)
+    _, mask = MIBSearch().search(mi)
+    assert np.array_equal(mask, labels == labels[mask][0])
+
+
+@pytest.mark.parametrize("N,blocks", [(24, 3), (32, 4), (64, 4), (128, 8)])
+def test_beats_random_sampling_at_equal_budget(N, blocks):
+    search = MIBSearch()
+    rng = np.random.default_rng(N)
+    for seed in range(3):
+        mi, _ = _block_mi(N, blocks, seed, noise=0.3)
+        start = time.perf_counter()
+        cut, _ = search.search(mi)
+        budget = time.perf_counter() - start
+
+        best_random = float('inf')
+        start = time.perf_counter()
+        while time.perf_counter() - start < budget:
+            masks = rng.integers(0, 2, size=(64, N))
+            masks = masks[(masks.sum(axis=1) > 0) & (masks.sum(axis=1) < N)]
+            best_random = min(best_random, search.cut_values(mi, masks).min())
+        assert cut <= best_random
+
+
+def test_phi_star_reports_search_partition():
+    _, labels = _block_mi(32, 2, seed=9)
+    monitor = PhiStarMonitor(num_agents=32)
+    rng = np.random.default_rng(0)
+    # Two independent groups of agents, each sharing its own signal
+    signals = rng.standard_normal((256, 2))
+    for t in range(256):
+        monitor.add_snapshot(signals[t, labels] + rng.standard_normal(32) * 0.2)
+    result = monitor.compute_phi_star()
+
+    side_a, side_b = result.mib_partition
+    assert sorted(side_a + side_b) == list(range(32)) and side_a and side_b
+    mask = np.isin(np.arange(32), side_a)
+    search = monitor.mib_search
+    assert search.cut_values(result.mi_matrix, mask[None, :])[0] == pytest.approx(result.mib_cut_info)
+    # No worse than the planted split or the 50 fixed random masks used before
+    assert result.mib_cut_info <= search.cut_values(result.mi_matrix, (labels == 0)[None, :])[0]
+    masks = np.random.default_rng(42).integers(0, 2, size=(50, 32))
+    masks = masks[(masks.sum(axis=1) > 0) & (masks.sum(axis=1) < 32)]
+    assert result.mib_cut_info <= search.cut_values(result.mi_matrix, masks).min()
@@ -0,0 +1,94 @@
+"""
+═══════════════════════════════════════════════════════════════════════════════
+Phi* Monitor — MI engine and sliding-window accuracy tests
+═══════════════════════════════════════════════════════════════════════════════
+The batched histogram MI matrix must match the per-pair loop reference
+(_compute_mi_matrix_loop) to floating-point rounding, including constant
+agents, tiny windows and the bin-count limits. The ring-buffer window's
+running moments must match a from-scratch computation over the same rows.
+
+Usage:
+    python -m pytest neural_spine/tests/test_phi_monitor.py -q
+═══════════════════════════════════════════════════════════════════════════════
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from monitoring.phi_monitor import PhiStarMonitor
+from tests.synthetic import clustered
+
+
+def test_batched_mi_matches_loop():
+    monitor = PhiStarMonitor(num_agents=32)
+    # T covers the 4-bin floor, intermediate bin counts and the 16-bin cap
+    for T, N in [(16, 2), (25, 5), (64, 12), (100, 16), (256, 32), (300, 7)]:
+        data = clustered(T, N, seed=T + N)
+        expected = monitor._compute_mi_matrix_loop(data)
+        actual = monitor._compute_mi_matrix(data)
+        np.testing.assert_allclose(actual, expected, rtol=0, atol=1e-12,
+                                   err_msg=f"T={T} N={N}")
+
+
+def test_constant_and_discrete_agents():
+    monitor = PhiStarMonitor(num_agents=6)
+    rng = np.random.default_rng(7)
+    data = clustered(128, 6)
+    data[:, 1] = 3.0                                   # flat — single bin
+    data[:, 4] = rng.integers(0, 3, 128)               # few distinct values
+    data[:, 5] = data[:, 0]                            # duplicate agent
+    expected = monitor._compute_mi_matrix_loop(data)
+    actual = monitor._compute_mi_matrix(data)
+    np.testing.assert_allclose(actual, expected, rtol=0, atol=1e-12)
+    assert np.all(actual[1] == 0) and np.all(actual[:, 1] == 0)
+    assert actual[0, 5] > actual[0, 2]
+
+
+def test_mi_matrix_shape_properties():
+    monitor = PhiStarMonitor(num_agents=24)
+    mi = monitor._compute_mi_matrix(clustered(200, 24))
+    assert mi.shape == (24, 24)
+    np.testing.assert_array_equal(mi, mi.T)
+    assert np.all(np.diag(mi) == 0)
+    assert np.all(mi >= -1e-12)
+    # MI is bounded by the entropy of the binning: log(num_bins)
+    assert mi.max() <= np.log(monitor._num_bins(200)) + 1e-12
+
+
+def test_phi_star_uses_selected_estimator():
+    data = clustered(256, 32, seed=3)
+    results = {}
+    for estimator in ("histogram", "gaussian"):
+        monitor = PhiStarMonitor(num_agents=32, mi_estimator=estimator)
+        for row in data:
+            monitor.add_snapshot(row)
+        results[estimator] = monitor.compute_phi_star()
+    hist = results["histogram"]
+    assert hist.active_agents == 32
+    np.testing.assert_allclose(
+        hist.mi_matrix, PhiStarMonitor(32)._compute_mi_matrix(data), atol=1e-12)
+    assert not np.allclose(hist.mi_matrix, results["gaussian"].mi_matrix)
+
+
+def test_ring_window_order_and_running_moments():
+    monitor = PhiStarMonitor(num_agents=8, mi_estimator="gaussian")
+    W = monitor.WINDOW_SIZE
+    data = clustered(3 * W + 37, 8, seed=11) + 1e3     # wraps, crosses resyncs
+    data[:, 2] = 5e3                                    # constant, large offset
+    for i, row in enumerate(data):
+        monitor.add_snapshot(row)
+        if i in (10, W - 1, W, 2 * W + 5, len(data) - 1):
+            window = data[max(0, i + 1 - W):i + 1]
+            np.testing.assert_array_equal(monitor.window_data(), window)
+            mean, cov = monitor.window_moments()
+            np.testing.assert_allclose(mean, window.mean(axis=0), rtol=1e-12)
+            np.testing.assert_allclose(cov, np.cov(window.T, bias=True), atol=1e-9)
+    assert monitor.window_len == W
+    expected = monitor._compute_mi_matrix_fast(np.delete(monitor.window_data(), 2, axis=1))
+    result = monitor.compute_phi_star()
+    assert result.active_agents == 7                    # constant agent excluded
+    active = np.delete(np.arange(8), 2)
+    np.testing.assert_allclose(result.mi_matrix[np.ix_(active, active)], expected, atol=1e-9)
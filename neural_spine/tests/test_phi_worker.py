@@ -0,0 +1,154 @@
+"""
+═══════════════════════════════════════════════════════════════════════════════
+Phi* Worker — off-loop evaluation tests
+═══════════════════════════════════════════════════════════════════════════════
+  1. load_window rebuilds a monitor's window and running moments exactly
+  2. The worker process, reading the shared-memory window, returns the same
+     PhiResult as an inline compute_phi_star on the same snapshots
+  3. One evaluation outstanding at a time: extra requests are skipped, and
+     snapshots keep landing while the worker computes
+  4. A worker that dies is respawned; past the restart budget Phi* is
+     evaluated inline. An error reply is counted and the worker stays usable
+
+Usage:
+    python -m pytest neural_spine/tests/test_phi_worker.py -q
+═══════════════════════════════════════════════════════════════════════════════
+"""
+
+import multiprocessing
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from monitoring.phi_monitor import PhiStarMonitor
+from monitoring import phi_worker
+from monitoring.phi_worker import PhiWorker
+from tests.synthetic import clustered
+
+
+def _wait_result(worker: PhiWorker, timeout: float = 10.0):
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        result = worker.poll()
+        if result is not None:
+            return result
+        time.sleep(0.005)
+    raise AssertionError("no Phi* result from worker")
+
+
+def _wait_request(worker: PhiWorker, timeout: float = 30.0):
+    # A respawned worker takes requests once its ready message is polled
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        if worker.request():
+            return
+        worker.poll()
+        time.sleep(0.01)
+    raise AssertionError("worker never accepted a request")
+
+
+@pytest.fixture
+def worker():
+    w = PhiWorker(num_agents=16)
+    w.start()
+    yield w
+    w.close()
+
+
+def test_load_window_rebuilds_state():
+    source = PhiStarMonitor(num_agents=8)
+    for row in clustered(PhiStarMonitor.WINDOW_SIZE + 77, 8):
+        source.add_snapshot(row)
+    copy = PhiStarMonitor(num_agents=8)
+    copy.load_window(source._ring, source.window_len, source._head)
+    np.testing.assert_array_equal(copy.window_data(), source.window_data())
+    for a, b in zip(copy.window_moments(), source.window_moments()):
+        np.testing.assert_allclose(a, b, atol=1e-9)
+
+    copy.load_window(np.zeros_like(source._ring), 0, 0)
+    assert copy.window_len == 0
+    assert copy.compute_phi_star().active_agents == 0
+
+
+def test_worker_matches_inline(worker):
+    inline = PhiStarMonitor(num_agents=16)
+    for row in clustered(300, 16, seed=5):
+        worker.add_snapshot(row)
+        inline.add_snapshot(row)
+    assert worker.request()
+    result = _wait_result(worker)
+    expected = inline.compute_phi_star()
+
+    assert result.phi_star == pytest.approx(expected.phi_star, abs=1e-12)
+    assert result.mib_partition == expected.mib_partition
+    np.testing.assert_allclose(result.mi_matrix, expected.mi_matrix, atol=1e-12)
+    assert worker.stats()["results"] == 1 and worker.last_lag == 0
+
+
+def test_one_request_outstanding(worker):
+    for row in clustered(200, 16, seed=6):
+        worker.add_snapshot(row)
+    assert worker.request()
+    assert not worker.request()              # one outstanding: skipped
+    for row in clustered(20, 16, seed=7):   # keep writing while it computes
+        worker.add_snapshot(row)
+    assert _wait_result(worker).active_agents == 16
+    assert worker.stats()["skipped"] == 1
+    assert worker.request()
+    _wait_result(worker)
+
+
+def test_dead_worker_is_restarted(worker):
+    for row in clustered(200, 16, seed=8):
+        worker.add_snapshot(row)
+    assert worker.request()
+    worker._proc.kill()
+    worker._proc.join()
+    assert worker.poll() is None             # EOF: pending cleared, respawned
+    assert worker.stats()["restarts"] == 1
+    _wait_request(worker)
+    assert _wait_result(worker).active_agents == 16
+
+
+def test_inline_after_restart_budget(worker, monkeypatch):
+    monkeypatch.setattr(phi_worker, "MAX_RESTARTS", 0)
+    inline = PhiStarMonitor(num_agents=16)
+    for row in clustered(200, 16, seed=9):
+        worker.add_snapshot(row)
+        inline.add_snapshot(row)
+    worker._proc.kill()
+    worker._proc.join()
+    assert worker.request()                  # evaluated on the spot
+    result = worker.poll()
+    assert result.phi_star == pytest.approx(inline.compute_phi_star().phi_star, abs=1e-12)
+    assert worker.stats()["inline"] and worker.poll() is None
+
+
+def test_error_reply_is_counted(worker):
+    for row in clustered(100, 16, seed=10):
+        worker.add_snapshot(row)
+    real, (fake, sender) = worker._conn, multiprocessing.Pipe()
+    worker._conn, worker._pending = fake, True
+    sender.send((0, 0, None, "Traceback: ValueError"))
+    assert worker.poll() is None
+    assert worker.stats()["errors"] == 1 and worker.results == 0
+    worker._conn = real
+    fake.close()
+    sender.close()
+    assert worker.request()                  # not stuck pending
+    _wait_result(worker)
+
+
+def test_close_keeps_loop_window():
+    w = PhiWorker(num_agents=16)
+    for row in clustered(150, 16, seed=11):
+        w.add_snapshot(row)
+    before = w.monitor.compute_phi_star()
+    window = w.monitor.window_data().copy()
+    w.close()
+    np.testing.assert_array_equal(w.monitor.window_data(), window)
+    assert w.monitor.compute_phi_star().phi_star == pytest.approx(before.phi_star, abs=1e-12)
@@ -8,17 +8,22 @@ Port: 8090
 """
 
 import asyncio
+import base64
 import json
 import os
+import time
+from collections import Counter, OrderedDict, deque
 from contextlib import asynccontextmanager
+from contextvars import ContextVar
 from datetime import datetime, timezone
-from typing import Optional, List, Any
-from uuid import UUID
+from typing import Optional, List, Any, Dict
+from uuid import UUID, uuid4
 
 import asyncpg
 import redis.asyncio as aioredis
 from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse, StreamingResponse
 from pydantic import BaseModel
 
 # ─────────────────── Config ─────────────────────────────────────
@@ -29,6 +34,334 @@ DB_URL = os.getenv(
 REDIS_URL = os.getenv("REDIS_URL", "redis://nexus_redis:6379/0")
 CORTEX_VERSION = "2.0.0-sovereign"
 
+# Every targeted command is XADDed to COMMAND_STREAM (the orchestrators'
+# delivery path; command_id is the idempotency key they dedupe on).
+# Wire format: "json" (flat fields, v1) or "protobuf" (opt-in — serialized
+# TaskCommand, v2, used only while every live consumer in the orchestrators'
+# group advertises v2; a consumer without a live advert counts as v1)
+COMMAND_WIRE_FORMAT = os.getenv("COMMAND_WIRE_FORMAT", "json").lower()
+COMMAND_STREAM = "nexus:commands:stream"
+COMMAND_STREAM_MAXLEN = int(os.getenv("COMMAND_STREAM_MAXLEN", "10000"))
+COMMAND_GROUP = "orchestrator_group"
+COMMAND_WIRE_VERSION_PREFIX = "nexus:commands:wire_version:"
+# Consumers block in XREADGROUP for 2s at a time; one idle longer than this
+# is a dead pod's leftover and doesn't count
+COMMAND_CONSUMER_LIVE_MS = int(os.getenv("COMMAND_CONSUMER_LIVE_MS", "60000"))
+# A command whose XADD fails twice goes to nexus_core.command_outbox
+# (migration 003) and is re-XADDed every COMMAND_OUTBOX_RETRY_SEC
+COMMAND_OUTBOX_RETRY_SEC = float(os.getenv("COMMAND_OUTBOX_RETRY_SEC", "5"))
+
+# WebSocket fan-out: each client has a bounded outbound queue drained by its
+# own writer task. WS_SLOW_POLICY decides what happens when a client falls
+# behind: "downsample" (coalesce queued frames of the same type, then drop
+# oldest), "drop_oldest", or "disconnect"
+WS_QUEUE_SIZE = int(os.getenv("WS_QUEUE_SIZE", "256"))
+WS_SLOW_POLICY = os.getenv("WS_SLOW_POLICY", "downsample").lower()
+WS_SEND_TIMEOUT = float(os.getenv("WS_SEND_TIMEOUT", "5"))
+
+# Routing rule changes are announced here; every Cortex replica recompiles
+ROUTING_CHANNEL = "nexus:routing"
+
+# /dashboard is served from memory, kept current by Cortex's own Redis events
+# and reconciled against Postgres every DASHBOARD_RECONCILE seconds
+DASHBOARD_RECONCILE_SEC = float(os.getenv("DASHBOARD_RECONCILE", "30"))
+
+# events / changes_log are daily range partitions (cortex migration 002).
+# Cortex pre-creates PARTITION_PREMAKE_DAYS of partitions and drops days
+# older than the retention windows, every PARTITION_MAINTENANCE_SEC
+# (0 disables; the SQL takes an advisory lock, so replicas don't collide)
+EVENTS_RETENTION_DAYS = int(os.getenv("EVENTS_RETENTION_DAYS", "30"))
+CHANGES_LOG_RETENTION_DAYS = int(os.getenv("CHANGES_LOG_RETENTION_DAYS", "90"))
+PARTITION_PREMAKE_DAYS = int(os.getenv("PARTITION_PREMAKE_DAYS", "7"))
+PARTITION_MAINTENANCE_SEC = float(os.getenv("PARTITION_MAINTENANCE", "3600"))
+
+# POST /commands/batch: max commands per request
+COMMAND_BATCH_MAX = int(os.getenv("COMMAND_BATCH_MAX", "1000"))
+
+# History listings: page size cap for JSON pages, rows per round trip when
+# streaming NDJSON from a server-side cursor
+LIST_MAX_LIMIT = int(os.getenv("LIST_MAX_LIMIT", "1000"))
+STREAM_PREFETCH = int(os.getenv("STREAM_PREFETCH", "500"))
+
+# Agent records (agents + agent_state rows) are served from a per-process
+# LRU in front of a shared Redis hash. Cortex writes through on register /
+# heartbeat / event and publishes the changed records on AGENT_CACHE_CHANNEL
+# so other replicas patch their copies. The hash is a full snapshot, reloaded
+# from Postgres once AGENT_CACHE_TTL seconds pass — that bounds staleness
+# from writers outside Cortex (memory_keeper registers agents too). One
+# replica at a time rebuilds it, under AGENT_CACHE_RELOAD_LOCK_MS
+AGENT_CACHE_SIZE = int(os.getenv("AGENT_CACHE_SIZE", "2048"))
+AGENT_CACHE_TTL = float(os.getenv("AGENT_CACHE_TTL", "60"))
+AGENT_CACHE_KEY = "nexus:agents:registry"
+AGENT_CACHE_CHANNEL = "nexus:agents:invalidate"
+AGENT_CACHE_RELOAD_LOCK_MS = int(os.getenv("AGENT_CACHE_RELOAD_LOCK_MS", "10000"))
+
+# Topics a /ws client can subscribe to (Redis channel → topic name)
+WS_CHANNEL_TOPICS = {
+    "nexus:commands": "commands",
+    "nexus:events": "events",
+    "nexus:agents": "agents",
+    "nexus:spine:status": "spine_status",
+    "nexus:spine:phi": "spine_phi",
+    "nexus:spine:broadcast": "spine_broadcast",
+}
+
+# ─────────────────── Query Registry ─────────────────────────────
+# Every static statement is registered by name at import time and prepared
+# on each pool connection as it is created, so handlers never pay
+# parse/plan. Every call is timed into a per-statement histogram and
+# attributed to the HTTP route that issued it (/debug/queries, /metrics).
+
+QUERY_BUCKETS_MS = (0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 5000)
+
+# ASGI scope of the request being served; the router fills scope["route"]
+_request_scope: ContextVar[Optional[dict]] = ContextVar("cortex_request_scope", default=None)
+
+
+class QueryStats:
+    __slots__ = ("calls", "errors", "rows", "total_ms", "max_ms", "buckets")
+
+    def __init__(self):
+        self.calls = self.errors = self.rows = 0
+        self.total_ms = self.max_ms = 0.0
+        self.buckets = [0] * (len(QUERY_BUCKETS_MS) + 1)   # last one is +Inf
+
+    def observe(self, ms: float, rows: int, error: bool):
+        self.calls += 1
+        self.rows += rows
+        self.errors += error
+        self.total_ms += ms
+        if ms > self.max_ms:
+            self.max_ms = ms
+        for i, bound in enumerate(QUERY_BUCKETS_MS):
+            if ms <= bound:
+                self.buckets[i] += 1
+                return
+        self.buckets[-1] += 1
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-th call (max for +Inf)"""
+        rank, seen = q * self.calls, 0
+        for i, n in enumerate(self.buckets[:-1]):
+            seen += n
+            if seen >= rank:
+                return min(QUERY_BUCKETS_MS[i], self.max_ms)
+        return self.max_ms
+
+    def to_dict(self) -> dict:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "rows": self.rows,
+            "total_ms": round(self.total_ms, 2),
+            "avg_ms": round(self.total_ms / self.calls, 3) if self.calls else 0.0,
+            "p50_ms": self.quantile(0.5),
+            "p95_ms": self.quantile(0.95),
+            "p99_ms": self.quantile(0.99),
+            "max_ms": round(self.max_ms, 2),
+        }
+
+
+def _rowcount(status: str) -> int:
+    """Row count from a command tag ("UPDATE 3", "INSERT 0 1")"""
+    tail = status.rsplit(" ", 1)[-1]
+    return int(tail) if tail.isdigit() else 0
+
+
+class Statement:
+    """A named, registered statement: conn.fetch & co. with timing"""
+    __slots__ = ("name", "sql", "stats")
+
+    def __init__(self, name: str, sql: str, stats: QueryStats):
+        self.name, self.sql, self.stats = name, sql, stats
+
+    async def fetch(self, conn, *args) -> list:
+        t0 = time.perf_counter()
+        try:
+            rows = await conn.fetch(self.sql, *args)
+        except Exception:
+            queries.record(self.stats, t0, 0, error=True)
+            raise
+        queries.record(self.stats, t0, len(rows))
+        return rows
+
+    async def fetchrow(self, conn, *args):
+        t0 = time.perf_counter()
+        try:
+            row = await conn.fetchrow(self.sql, *args)
+        except Exception:
+            queries.record(self.stats, t0, 0, error=True)
+            raise
+        queries.record(self.stats, t0, row is not None)
+        return row
+
+    async def fetchval(self, conn, *args):
+        t0 = time.perf_counter()
+        try:
+            val = await conn.fetchval(self.sql, *args)
+        except Exception:
+            queries.record(self.stats, t0, 0, error=True)
+            raise
+        queries.record(self.stats, t0, val is not None)
+        return val
+
+    async def execute(self, conn, *args) -> str:
+        t0 = time.perf_counter()
+        try:
+            status = await conn.execute(self.sql, *args)
+        except Exception:
+            queries.record(self.stats, t0, 0, error=True)
+            raise
+        queries.record(self.stats, t0, _rowcount(status))
+        return status
+
+
+class QueryRegistry:
+    def __init__(self):
+        self.statements: Dict[str, Statement] = {}
+        self.stats: Dict[str, QueryStats] = {}          # registered + dynamic
+        self.endpoints: Dict[str, List[float]] = {}     # route → [queries, ms]
+        self.connections_prepared = 0
+        self.prepare_failed: set = set()
+
+    def add(self, name: str, sql: str) -> Statement:
+        sql = " ".join(sql.split())
+        stmt = self.statements[name] = Statement(name, sql, self.stats_for(name))
+        return stmt
+
+    def stats_for(self, name: str) -> QueryStats:
+        stats = self.stats.get(name)
+        if stats is None:
+            stats = self.stats[name] = QueryStats()
+        return stats
+
+    def record(self, stats: QueryStats, t0: float, rows: int, error: bool = False):
+        ms = (time.perf_counter() - t0) * 1000
+        stats.observe(ms, rows, error)
+        scope = _request_scope.get()
+        if scope is None:
+            endpoint = "background"
+        else:
+            route = scope.get("route")
+            # Raw paths of unmatched requests (404 probes) would be unbounded labels
+            endpoint = f"{scope.get('method', 'WS')} {route.path}" if route else "unmatched"
+        totals = self.endpoints.get(endpoint)
+        if totals is None:
+            totals = self.endpoints[endpoint] = [0, 0.0]
+        totals[0] += 1
+        totals[1] += ms
+
+    async def fetch(self, conn, name: str, sql: str, *args) -> list:
+        """Dynamic SQL (filters vary per call): timed, cached by asyncpg on first use"""
+        stats, t0 = self.stats_for(name), time.perf_counter()
+        try:
+            rows = await conn.fetch(sql, *args)
+        except Exception:
+            self.record(stats, t0, 0, error=True)
+            raise
+        self.record(stats, t0, len(rows))
+        return rows
+
+    async def prepare_connection(self, conn: "CortexConnection"):
+        """Pool init: prepare every registered statement into the connection's cache"""
+        for stmt in self.statements.values():
+            try:
+                await conn.prepare_cached(stmt.sql)
+            except Exception as e:
+                # e.g. migration not applied yet — prepared on first use instead
+                if stmt.name not in self.prepare_failed:
+                    self.prepare_failed.add(stmt.name)
+                    print(f"[CORTEX] ⚠️ Could not prepare {stmt.name}: {e}")
+        self.connections_prepared += 1
+
+    def snapshot(self) -> dict:
+        statements = [
+            {"name": name, "prepared": name in self.statements and name not in self.prepare_failed,
+             **stats.to_dict(),
+             "sql": self.statements[name].sql if name in self.statements else None}
+            for name, stats in self.stats.items()
+        ]
+        statements.sort(key=lambda s: s["total_ms"], reverse=True)
+        endpoints = [
+            {"endpoint": ep, "queries": n, "total_ms": round(ms, 2),
+             "avg_ms": round(ms / n, 3) if n else 0.0}
+            for ep, (n, ms) in self.endpoints.items()
+        ]
+        endpoints.sort(key=lambda e: e["total_ms"], reverse=True)
+        return {
+            "registered": len(self.statements),
+            "connections_prepared": self.connections_prepared,
+            "prepare_failed": sorted(self.prepare_failed),
+            "statements": statements,
+            "endpoints": endpoints,
+        }
+
+    def prometheus(self) -> str:
+        """Prometheus text exposition of the statement and endpoint counters"""
+        out = [
+            "# HELP cortex_db_query_duration_seconds Latency of Cortex SQL statements",
+            "# TYPE cortex_db_query_duration_seconds histogram",
+        ]
+        for name, st in self.stats.items():
+            label = f'statement="{name}"'
+            cumulative = 0
+            for bound, n in zip(QUERY_BUCKETS_MS, st.buckets):
+                cumulative += n
+                out.append(f'cortex_db_query_duration_seconds_bucket{{{label},le="{bound / 1000:g}"}} {cumulative}')
+            out.append(f'cortex_db_query_duration_seconds_bucket{{{label},le="+Inf"}} {st.calls}')
+            out.append(f"cortex_db_query_duration_seconds_sum{{{label}}} {st.total_ms / 1000:.6f}")
+            out.append(f"cortex_db_query_duration_seconds_count{{{label}}} {st.calls}")
+        for metric, help_text, attr in (
+            ("cortex_db_query_rows_total", "Rows returned or affected", "rows"),
+            ("cortex_db_query_errors_total", "Statements that raised", "errors"),
+        ):
+            out += [f"# HELP {metric} {help_text}", f"# TYPE {metric} counter"]
+            out += [f'{metric}{{statement="{name}"}} {getattr(st, attr)}'
+                    for name, st in self.stats.items()]
+        out += ["# HELP cortex_db_endpoint_queries_total SQL statements issued per route",
+                "# TYPE cortex_db_endpoint_queries_total counter"]
+        out += [f'cortex_db_endpoint_queries_total{{endpoint="{ep}"}} {n}'
+                for ep, (n, _) in self.endpoints.items()]
+        out += ["# HELP cortex_db_endpoint_query_seconds_total Time spent in SQL per route",
+                "# TYPE cortex_db_endpoint_query_seconds_total counter"]
+        out += [f'cortex_db_endpoint_query_seconds_total{{endpoint="{ep}"}} {ms / 1000:.6f}'
+                for ep, (_, ms) in self.endpoints.items()]
+        return "\n".join(out) + "\n"
+
+
+class CortexConnection(asyncpg.Connection):
+    """Pool connection whose statement cache is pre-filled with the registry"""
+
+    async def prepare_cached(self, sql: str):
+        # Same path conn.fetch() takes on a cache miss; later calls with this
+        # text reuse the server-side statement. Connection._prepare is private
+        # asyncpg API (checked against asyncpg==0.30.0, pinned in
+        # requirements.txt) — the public prepare() returns a statement object
+        # without filling the cache fetch() reads. Re-check on upgrade; if it
+        # changes, prepare_connection logs it and statements are prepared on
+        # first use instead.
+        await self._prepare(sql, use_cache=True)
+
+
+queries = QueryRegistry()
+
+
+class QueryAttributionMiddleware:
+    """Makes the current request's scope visible to QueryRegistry.record"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        token = _request_scope.set(scope)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _request_scope.reset(token)
+
+
 # ─────────────────── Connection Pools ───────────────────────────
 pool: asyncpg.Pool = None
 redis_pool: aioredis.Redis = None
@@ -36,25 +369,29 @@ redis_pool: aioredis.Redis = None
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     global pool, redis_pool
-    pool = await asyncpg.create_pool(DB_URL, min_size=5, max_size=20)
+    pool = await asyncpg.create_pool(
+        DB_URL, min_size=5, max_size=20,
+        connection_class=CortexConnection, init=queries.prepare_connection,
+        # registered statements + room for the dynamic listing variants
+        statement_cache_size=max(100, 2 * len(queries.statements)),
+    )
     print(f"[CORTEX] ✅ Connected to nexus_db")
     # Redis
     redis_pool = aioredis.from_url(REDIS_URL, decode_responses=True)
     await redis_pool.ping()
     print(f"[CORTEX] ✅ Connected to Redis")
+    await reload_routing()
     # Start subscriber
     asyncio.create_task(redis_subscriber())
+    asyncio.create_task(dashboard_reconciler())
+    if PARTITION_MAINTENANCE_SEC > 0:
+        asyncio.create_task(partition_maintainer())
+    asyncio.create_task(command_outbox_relay())
     # register cortex itself as online
     async with pool.acquire() as conn:
-        await conn.execute("""
-            INSERT INTO nexus_core.agent_state (agent_name, status, updated_at)
-            VALUES ('nexus_cortex', 'online', now())
-            ON CONFLICT (agent_name) DO UPDATE SET status='online', updated_at=now()
-        """)
-        await conn.execute("""
-            UPDATE nexus_core.agents SET status='online', last_seen=now()
-            WHERE name='nexus_cortex'
-        """)
+        await Q_CORTEX_STATE_ONLINE.execute(conn)
+        await Q_CORTEX_AGENT_ONLINE.execute(conn)
+    await agent_cache.reload()
     yield
     if redis_pool:
         await redis_pool.aclose()
@@ -63,6 +400,17 @@ async def lifespan(app: FastAPI):
     print(f"[CORTEX] 🛑 Pool closed")
 
 
+Q_CORTEX_STATE_ONLINE = queries.add("cortex.state_online", """
+    INSERT INTO nexus_core.agent_state (agent_name, status, updated_at)
+    VALUES ('nexus_cortex', 'online', now())
+    ON CONFLICT (agent_name) DO UPDATE SET status='online', updated_at=now()
+""")
+Q_CORTEX_AGENT_ONLINE = queries.add("cortex.agent_online", """
+    UPDATE nexus_core.agents SET status='online', last_seen=now()
+    WHERE name='nexus_cortex'
+""")
+
+
 # ─────────────────── App ────────────────────────────────────────
 app = FastAPI(
     title="NEXUS Cortex",
@@ -71,6 +419,7 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
+app.add_middleware(QueryAttributionMiddleware)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -80,28 +429,819 @@ app.add_middleware(
 )
 
 # ─────────────────── WebSocket Manager ──────────────────────────
+class WSSubscription:
+    """
+    Server-side filter for one /ws client. Empty selectors mean "everything";
+    the agent filter only applies to messages that name an agent and the
+    severity filter only to messages that carry one. rate_limits caps a
+    topic at N messages/second — frames arriving faster are skipped.
+
+    Client message:
+        {"type": "subscribe", "channels": ["events", "spine_phi"],
+         "agents": ["AS-SULTAN"], "severities": ["warning", "error"],
+         "rate_limits": {"spine_phi": 2}}
+    """
+
+    __slots__ = ("topics", "agents", "severities", "min_interval", "_last_sent")
+
+    def __init__(self, topics=None, agents=None, severities=None, rate_limits=None):
+        self.topics = {self._topic(t) for t in topics} if topics else None
+        self.agents = set(agents) if agents else None
+        self.severities = {s.lower() for s in severities} if severities else None
+        self.min_interval = {
+            self._topic(t): 1.0 / float(hz)
+            for t, hz in (rate_limits or {}).items() if float(hz) > 0
+        }
+        self._last_sent: Dict[str, float] = {}
+
+    @staticmethod
+    def _topic(name: str) -> str:
+        return WS_CHANNEL_TOPICS.get(name, name)
+
+    @classmethod
+    def from_message(cls, msg: dict) -> "WSSubscription":
+        unknown = [t for t in msg.get("channels") or []
+                   if cls._topic(t) not in WS_CHANNEL_TOPICS.values()]
+        if unknown:
+            raise ValueError(f"unknown channels: {unknown}")
+        return cls(msg.get("channels"), msg.get("agents"),
+                   msg.get("severities"), msg.get("rate_limits"))
+
+    def accepts(self, topic: Optional[str], data: dict, now: float) -> bool:
+        if topic is None:
+            return True
+        if self.topics is not None and topic not in self.topics:
+            return False
+        if self.agents is not None:
+            agent = data.get("agent") or data.get("target") or data.get("agent_name")
+            if agent and agent not in self.agents:
+                return False
+        if self.severities is not None:
+            severity = data.get("severity")
+            if severity and str(severity).lower() not in self.severities:
+                return False
+        interval = self.min_interval.get(topic)
+        if interval:
+            if now - self._last_sent.get(topic, 0.0) < interval:
+                return False
+            self._last_sent[topic] = now
+        return True
+
+    def describe(self) -> dict:
+        return {
+            "channels": sorted(self.topics) if self.topics is not None else "all",
+            "agents": sorted(self.agents) if self.agents is not None else "all",
+            "severities": sorted(self.severities) if self.severities is not None else "all",
+            "rate_limits": {t: round(1.0 / i, 3) for t, i in self.min_interval.items()},
+        }
+
+
+def _ws_frame(data: dict) -> str:
+    # Same encoding as WebSocket.send_json, done once per message
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+class WSClient:
+    """One dashboard connection: bounded outbound queue + dedicated writer task."""
+
+    __slots__ = ("ws", "id", "maxsize", "policy", "connected_at", "_queue",
+                 "_wakeup", "_writer", "sent", "dropped", "coalesced", "max_depth",
+                 "subscription", "filtered")
+
+    def __init__(self, ws: WebSocket, client_id: int,
+                 maxsize: int = WS_QUEUE_SIZE, policy: str = WS_SLOW_POLICY):
+        self.ws = ws
+        self.id = client_id
+        self.maxsize = max(1, maxsize)
+        self.policy = policy
+        self.connected_at = time.time()
+        self._queue: deque = deque()   # (type, frame)
+        self._wakeup = asyncio.Event()
+        self._writer: Optional[asyncio.Task] = None
+        self.sent = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.max_depth = 0
+        self.subscription = WSSubscription()
+        self.filtered = 0
+
+    def offer(self, kind: Optional[str], frame: str) -> bool:
+        """Queue a frame without waiting. Returns False if the client must be dropped."""
+        q = self._queue
+        if len(q) >= self.maxsize // 2 and self.policy == "downsample" and kind:
+            # Behind: newest frame of a type replaces the one still queued
+            for i in range(len(q) - 1, -1, -1):
+                if q[i][0] == kind:
+                    q[i] = (kind, frame)
+                    self.coalesced += 1
+                    return True
+        if len(q) >= self.maxsize:
+            if self.policy == "disconnect":
+                self.dropped += 1
+                return False
+            q.popleft()
+            self.dropped += 1
+        q.append((kind, frame))
+        if len(q) > self.max_depth:
+            self.max_depth = len(q)
+        self._wakeup.set()
+        return True
+
+    def send(self, data: dict) -> bool:
+        return self.offer(data.get("type"), _ws_frame(data))
+
+    async def run_writer(self, on_dead):
+        try:
+            while True:
+                if not self._queue:
+                    self._wakeup.clear()
+                    await self._wakeup.wait()
+                    continue
+                _, frame = self._queue.popleft()
+                await asyncio.wait_for(self.ws.send_text(frame), WS_SEND_TIMEOUT)
+                self.sent += 1
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            # Send failed or timed out — the client is gone or hopelessly slow
+            on_dead(self)
+
+    def stats(self) -> dict:
+        client = getattr(self.ws, "client", None)
+        return {
+            "id": self.id,
+            "client": f"{client.host}:{client.port}" if client else None,
+            "queue_depth": len(self._queue),
+            "max_depth": self.max_depth,
+            "queue_size": self.maxsize,
+            "sent": self.sent,
+            "dropped": self.dropped,
+            "coalesced": self.coalesced,
+            "filtered": self.filtered,
+            "subscription": self.subscription.describe(),
+            "connected_for_s": round(time.time() - self.connected_at, 1),
+        }
+
+
 class ConnectionManager:
     def __init__(self):
-        self.active: List[WebSocket] = []
+        self.active: Dict[WebSocket, WSClient] = {}
+        self._ids = 0
+        self.broadcasts = 0
+        self.evicted = 0
 
-    async def connect(self, ws: WebSocket):
+    async def connect(self, ws: WebSocket) -> WSClient:
         await ws.accept()
-        self.active.append(ws)
+        self._ids += 1
+        client = WSClient(ws, self._ids)
+        self.active[ws] = client
+        client._writer = asyncio.create_task(client.run_writer(self._evict))
+        return client
 
     def disconnect(self, ws: WebSocket):
-        self.active.remove(ws)
+        client = self.active.pop(ws, None)
+        if client and client._writer and client._writer is not asyncio.current_task():
+            client._writer.cancel()
+
+    def _evict(self, client: WSClient):
+        if self.active.get(client.ws) is not client:
+            return
+        self.evicted += 1
+        self.disconnect(client.ws)
+        print(f"[CORTEX] ✂️ WS client #{client.id} dropped "
+              f"(depth={len(client._queue)}, dropped={client.dropped})")
+        # Wake the endpoint's receive loop so the socket is torn down
+        asyncio.create_task(self._close(client.ws))
+
+    @staticmethod
+    async def _close(ws: WebSocket):
+        try:
+            await ws.close(code=1013)
+        except Exception:
+            pass
+
+    def broadcast(self, data: dict, channel: Optional[str] = None):
+        """
+        Enqueue on every subscribed client; never waits on a socket. The
+        frame is serialized at most once, and not at all if nobody wants it.
+        """
+        if not self.active:
+            return
+        self.broadcasts += 1
+        topic = WS_CHANNEL_TOPICS.get(channel)
+        kind = data.get("type") if isinstance(data, dict) else None
+        frame = None
+        now = time.monotonic()
+        for client in list(self.active.values()):
+            if not client.subscription.accepts(topic, data, now):
+                client.filtered += 1
+                continue
+            if frame is None:
+                frame = _ws_frame(data)
+            if not client.offer(kind, frame):
+                self._evict(client)
+
+    def stats(self) -> dict:
+        clients = [c.stats() for c in self.active.values()]
+        return {
+            "clients": len(clients),
+            "policy": WS_SLOW_POLICY,
+            "broadcasts": self.broadcasts,
+            "evicted": self.evicted,
+            "dropped_total": sum(c["dropped"] for c in clients),
+            "filtered_total": sum(c["filtered"] for c in clients),
+            "per_client": clients,
+        }
+
+ws_manager = ConnectionManager()
+
+
+# ─────────────────── Dashboard Cache ────────────────────────────
+class DashboardCache:
+    """
+    In-memory copy of the cortex_dashboard view plus its aggregate stats.
+
+    Updated incrementally from the events Cortex publishes (agent_online,
+    command_issued, command_updated, event) and from heartbeats Cortex
+    itself writes; reconcile() reloads everything from Postgres to repair
+    drift (status changes made outside Cortex, missed pub/sub messages).
+    Events per agent are kept in one-minute buckets, so "last hour" counts
+    are exact to the minute.
+    """
+
+    OPEN_STATUSES = ("queued", "dispatched", "running")
+    COUNTED = {"queued": "queued_commands", "running": "running_commands"}
+
+    def __init__(self):
+        self.agents: Dict[str, dict] = {}
+        self._ordered: List[dict] = []
+        self._commands: Dict[str, list] = {}          # id → [target, status]
+        self._buckets: deque = deque()                # [minute, Counter(agent)]
+        self._events_by_agent: Counter = Counter()
+        self.stats = self._empty_stats()
+        self.as_of: Optional[datetime] = None
+        self.reconciled_at: Optional[datetime] = None
+        self.loaded = False
+        self.counters = {"applied": 0, "reconciles": 0, "reconcile_errors": 0, "drift": 0}
+        self._reconciling = False
+        self._replay: list = []
+
+    @staticmethod
+    def _empty_stats() -> dict:
+        return {"online_count": 0, "queued_commands": 0,
+                "running_commands": 0, "recent_events": 0}
+
+    # ── Reads ────────────────────────────────────────────────────
+
+    def snapshot(self) -> dict:
+        self._expire(int(time.time() // 60))
+        return {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "as_of": self.as_of.isoformat() if self.as_of else None,
+            "reconciled_at": self.reconciled_at.isoformat() if self.reconciled_at else None,
+            "stats": dict(self.stats),
+            "agents": self._ordered,
+        }
+
+    # ── Incremental updates ──────────────────────────────────────
+
+    def apply(self, data: dict):
+        if not self.loaded or not isinstance(data, dict):
+            return
+        if self._reconciling:
+            # Re-applied on top of the fresh snapshot once it lands
+            self._replay.append(data)
+        self._apply(data)
+
+    def _apply(self, data: dict):
+        kind = data.get("type")
+        now = datetime.now(timezone.utc)
+        if kind == "agent_online":
+            row = self._agent(data.get("agent"))
+            if row is None:
+                return
+            self._set_status(row, "online")
+            row["last_seen"] = now
+        elif kind == "command_issued":
+            cid = data.get("command_id")
+            if not cid or cid in self._commands:
+                return
+            self._commands[cid] = [data.get("target"), "queued"]
+            self._count_command(data.get("target"), "queued", +1)
+            # Issuing also wrote a command_issued row to events (single and
+            # batch paths alike), which reconcile counts
+            self._count_event("nexus_cortex", int(time.time() // 60))
+        elif kind == "command_updated":
+            entry = self._commands.get(data.get("command_id"))
+            if entry is None:
+                return
+            target, old = entry
+            new = data.get("status")
+            self._count_command(target, old, -1)
+            if new in self.OPEN_STATUSES:
+                entry[1] = new
+                self._count_command(target, new, +1)
+            else:
+                del self._commands[data["command_id"]]
+        elif kind == "event":
+            self._count_event(data.get("agent"), int(time.time() // 60))
+        else:
+            return
+        self.counters["applied"] += 1
+        self.as_of = now
+
+    def heartbeat(self, names: List[str], tasks: List[Optional[str]], metrics: List[str]):
+        """Mirror of the heartbeat upserts (these are not published on Redis)."""
+        if not self.loaded:
+            return
+        now = datetime.now(timezone.utc)
+        for name, task, m in zip(names, tasks, metrics):
+            row = self.agents.get(name)
+            if row is None:
+                continue
+            self._set_status(row, "online")
+            row["last_seen"] = now
+            row["current_task"] = task
+            row["metrics"] = m
+        self.as_of = now
+
+    def _agent(self, name: Optional[str]) -> Optional[dict]:
+        if not name:
+            return None
+        row = self.agents.get(name)
+        if row is None:
+            # Newly registered — full row (display_name, type) arrives on reconcile
+            row = {"name": name, "display_name": name, "agent_type": "planet",
+                   "status": "offline", "last_seen": None, "current_task": None,
+                   "metrics": None, "pending_commands": 0,
+                   "events_last_hour": self._events_by_agent.get(name, 0)}
+            self.agents[name] = row
+            self._reorder()
+        return row
+
+    def _set_status(self, row: dict, status: str):
+        if row["status"] == status:
+            return
+        if row["status"] == "online":
+            self.stats["online_count"] -= 1
+        if status == "online":
+            self.stats["online_count"] += 1
+        row["status"] = status
+
+    def _count_command(self, target: Optional[str], status: str, delta: int):
+        field = self.COUNTED.get(status)
+        if field is None:
+            return
+        self.stats[field] += delta
+        row = self.agents.get(target) if target else None
+        if row is not None:
+            row["pending_commands"] += delta
+
+    def _count_event(self, agent: Optional[str], minute: int, n: int = 1):
+        if self._buckets and self._buckets[-1][0] == minute:
+            bucket = self._buckets[-1][1]
+        else:
+            bucket = Counter()
+            self._buckets.append([minute, bucket])
+        bucket[agent] += n
+        self._events_by_agent[agent] += n
+        self.stats["recent_events"] += n
+        row = self.agents.get(agent)
+        if row is not None:
+            row["events_last_hour"] = self._events_by_agent[agent]
+
+    def _expire(self, minute: int):
+        while self._buckets and self._buckets[0][0] <= minute - 60:
+            _, bucket = self._buckets.popleft()
+            for agent, n in bucket.items():
+                self._events_by_agent[agent] -= n
+                if self._events_by_agent[agent] <= 0:
+                    del self._events_by_agent[agent]
+                self.stats["recent_events"] -= n
+                row = self.agents.get(agent)
+                if row is not None:
+                    row["events_last_hour"] = self._events_by_agent.get(agent, 0)
+
+    def _reorder(self):
+        self._ordered = sorted(self.agents.values(),
+                               key=lambda r: (r["agent_type"] or "", r["name"]))
+
+    # ── Reconciliation ───────────────────────────────────────────
+
+    async def reconcile(self, db: asyncpg.Pool):
+        self._reconciling = True
+        self._replay = []
+        try:
+            async with db.acquire() as conn:
+                rows = await Q_DASHBOARD_VIEW.fetch(conn)
+                commands = await Q_DASHBOARD_OPEN_COMMANDS.fetch(conn)
+                buckets = await Q_DASHBOARD_EVENT_BUCKETS.fetch(conn)
+            before = dict(self.stats)
+
+            self.agents = {r["name"]: dict(r) for r in rows}
+            for row in self.agents.values():
+                row["pending_commands"] = 0
+                row["events_last_hour"] = 0
+            self._commands = {}
+            self._buckets = deque()
+            self._events_by_agent = Counter()
+            self.stats = self._empty_stats()
+            self.stats["online_count"] = sum(1 for r in self.agents.values() if r["status"] == "online")
+            for c in commands:
+                self._commands[c["id"]] = [c["target_agent"], c["status"]]
+                self._count_command(c["target_agent"], c["status"], +1)
+            for b in buckets:
+                self._count_event(b["agent_name"], int(b["minute"].timestamp() // 60), b["n"])
+            self._reorder()
+
+            replay, self._replay = self._replay, []
+            for data in replay:
+                self._apply(data)
+
+            if self.loaded:
+                self.counters["drift"] += sum(abs(self.stats[k] - before[k]) for k in before)
+            self.loaded = True
+            self.counters["reconciles"] += 1
+            self.reconciled_at = self.as_of = datetime.now(timezone.utc)
+        finally:
+            self._reconciling = False
+
+Q_DASHBOARD_VIEW = queries.add("dashboard.view", "SELECT * FROM nexus_core.cortex_dashboard")
+Q_DASHBOARD_STATS = queries.add("dashboard.stats", """
+    SELECT
+      (SELECT COUNT(*) FROM nexus_core.agents WHERE status='online') AS online_count,
+      (SELECT COUNT(*) FROM nexus_core.commands WHERE status='queued') AS queued_commands,
+      (SELECT COUNT(*) FROM nexus_core.commands WHERE status='running') AS running_commands,
+      (SELECT COUNT(*) FROM nexus_core.events WHERE created_at > now() - INTERVAL '1 hour') AS recent_events
+""")
+Q_DASHBOARD_OPEN_COMMANDS = queries.add("dashboard.open_commands", """
+    SELECT id::text AS id, target_agent, status FROM nexus_core.commands
+    WHERE status IN ('queued','dispatched','running')
+""")
+Q_DASHBOARD_EVENT_BUCKETS = queries.add("dashboard.event_buckets", """
+    SELECT agent_name, date_trunc('minute', created_at) AS minute, COUNT(*) AS n
+    FROM nexus_core.events WHERE created_at > now() - INTERVAL '1 hour'
+    GROUP BY 1, 2 ORDER BY 2
+""")
+
+dashboard_cache = DashboardCache()
+
+
+async def dashboard_reconciler():
+    """Initial load + periodic Postgres reconciliation of the dashboard cache"""
+    while True:
+        try:
+            await dashboard_cache.reconcile(pool)
+        except Exception as e:
+            dashboard_cache.counters["reconcile_errors"] += 1
+            print(f"[CORTEX] ⚠️ Dashboard reconcile failed: {e}")
+        await asyncio.sleep(DASHBOARD_RECONCILE_SEC)
+
+
+# ─────────────────── Partition Maintenance ──────────────────────
+
+Q_PARTITIONS_INSTALLED = queries.add(
+    "partitions.installed", "SELECT to_regproc('nexus_core.maintain_partitions') IS NOT NULL")
+Q_PARTITIONS_MAINTAIN = queries.add(
+    "partitions.maintain", "SELECT nexus_core.maintain_partitions($1, $2, $3)")
+
+
+async def partition_maintainer():
+    """Pre-create daily partitions and drop expired ones (migration 002)"""
+    while True:
+        try:
+            async with pool.acquire() as conn:
+                if not await Q_PARTITIONS_INSTALLED.fetchval(conn):
+                    print(f"[CORTEX] ℹ️ Partition maintenance off — cortex migration 002 not applied")
+                    return
+                result = json.loads(await Q_PARTITIONS_MAINTAIN.fetchval(
+                    conn, EVENTS_RETENTION_DAYS, CHANGES_LOG_RETENTION_DAYS, PARTITION_PREMAKE_DAYS))
+            if any(v for k, v in result.items() if k != "skipped"):
+                print(f"[CORTEX] 🗂️ Partitions maintained: {result}")
+        except Exception as e:
+            print(f"[CORTEX] ⚠️ Partition maintenance failed: {e}")
+        await asyncio.sleep(PARTITION_MAINTENANCE_SEC)
+
+
+# ─────────────────── Routing Table ──────────────────────────────
+class RoutingTable:
+    """
+    Active routing_rules compiled for lookup without a query.
+
+    A rule's command_type is either exact ("scan_market") or a prefix
+    pattern ending in "*" ("scan_*", or "*" for a catch-all). Exact rules
+    win; otherwise every prefix along the command type's path in the trie
+    is a candidate. Ties go to the lower priority value, then the longer
+    prefix, then the older rule.
+    """
+
+    _RULES = "\0"   # trie node key holding the rules that end at that node
+
+    def __init__(self, rows: list = (), loaded: bool = False):
+        self.rules = [dict(r) for r in rows]
+        self.loaded = loaded
+        self.loaded_at = datetime.now(timezone.utc)
+        self._exact: Dict[str, str] = {}
+        self._trie: dict = {}
+        best_exact: Dict[str, tuple] = {}
+        for r in self.rules:
+            pattern = r["command_type"]
+            rank = (r["priority"] if r["priority"] is not None else 5, r["id"])
+            if pattern.endswith("*"):
+                node = self._trie
+                for ch in pattern[:-1]:
+                    node = node.setdefault(ch, {})
+                node.setdefault(self._RULES, []).append((rank, r["target_agent"]))
+            elif pattern not in best_exact or rank < best_exact[pattern]:
+                best_exact[pattern] = rank
+                self._exact[pattern] = r["target_agent"]
+        self._prune_rules(self._trie)
+
+    def _prune_rules(self, node: dict):
+        # Keep only the best rule per trie node
+        for key, child in node.items():
+            if key == self._RULES:
+                node[key] = [min(child)]
+            else:
+                self._prune_rules(child)
+
+    def resolve(self, command_type: str) -> Optional[str]:
+        target = self._exact.get(command_type)
+        if target is not None:
+            return target
+        best = None
+        node = self._trie
+        depth = 0
+        while True:
+            here = node.get(self._RULES)
+            if here:
+                (priority, rule_id), agent = here[0]
+                key = (priority, -depth, rule_id)
+                if best is None or key < best[0]:
+                    best = (key, agent)
+            if depth == len(command_type):
+                break
+            node = node.get(command_type[depth])
+            if node is None:
+                break
+            depth += 1
+        return best[1] if best else None
+
+routing_table = RoutingTable()
+_routing_lock = asyncio.Lock()
+
+
+Q_ROUTING_ACTIVE = queries.add("routing.active", """
+    SELECT * FROM nexus_core.routing_rules
+    WHERE is_active=true ORDER BY command_type, priority, id
+""")
+
+
+async def reload_routing():
+    """Recompile the routing table from Postgres (startup + on ROUTING_CHANNEL)"""
+    global routing_table
+    try:
+        # Serialized so an older read can never replace a newer table
+        async with _routing_lock, pool.acquire() as conn:
+            rows = await Q_ROUTING_ACTIVE.fetch(conn)
+        routing_table = RoutingTable(rows, loaded=True)
+        print(f"[CORTEX] 🧭 Routing table compiled ({len(routing_table.rules)} rules)")
+    except Exception as e:
+        print(f"[CORTEX] ⚠️ Routing reload failed: {e}")
+
+
+# ─────────────────── Agent Registry Cache ───────────────────────
+
+def _json_default(o):
+    return o.isoformat() if isinstance(o, datetime) else str(o)
+
 
-    async def broadcast(self, data: dict):
-        dead = []
-        for ws in self.active:
+Q_AGENT_STATES_ALL = queries.add("agents.states_all", "SELECT * FROM nexus_core.agent_state")
+
+
+class AgentCache:
+    """
+    Agent records {"agent": <agents row>, "state": <agent_state row>} in two
+    tiers: a per-process LRU and the AGENT_CACHE_KEY Redis hash shared by
+    every replica. Records are JSON round-tripped on the way in, so both
+    tiers (and Postgres fallbacks) return the same shapes.
+
+    The hash always holds every agent while "<key>:loaded" exists, so a
+    name missing from it is a 404 without touching Postgres.
+
+    A rebuild empties the hash *before* reading Postgres and then fills it
+    with HSETNX: a write-through landing mid-rebuild is newer than the
+    snapshot and is kept, never overwritten by it.
+    """
+
+    # Release the rebuild lock only if this replica still holds it
+    _UNLOCK_LUA = """
+    if redis.call('GET', KEYS[1]) == ARGV[1] then
+        return redis.call('DEL', KEYS[1])
+    end
+    return 0
+    """
+
+    def __init__(self, size: int = AGENT_CACHE_SIZE, ttl: float = AGENT_CACHE_TTL):
+        self.size, self.ttl = size, ttl
+        self._lru: "OrderedDict[str, tuple]" = OrderedDict()   # name → (expires, record|None)
+        self._all: Optional[tuple] = None                      # (expires, {name: record})
+        self._reload_lock = asyncio.Lock()
+        self.instance = uuid4().hex
+        self.counters = {"local_hits": 0, "redis_hits": 0, "db_loads": 0,
+                         "writes": 0, "invalidations": 0, "redis_errors": 0}
+
+    @property
+    def loaded_key(self) -> str:
+        return f"{AGENT_CACHE_KEY}:loaded"
+
+    @property
+    def lock_key(self) -> str:
+        return f"{AGENT_CACHE_KEY}:reload_lock"
+
+    @staticmethod
+    def _record(agent, state) -> dict:
+        return json.loads(json.dumps(
+            {"agent": dict(agent), "state": dict(state) if state else None},
+            default=_json_default))
+
+    # ── Local tier ───────────────────────────────────────────────
+
+    def _local_put(self, name: str, record: Optional[dict]):
+        self._lru[name] = (time.monotonic() + self.ttl, record)
+        self._lru.move_to_end(name)
+        while len(self._lru) > self.size:
+            self._lru.popitem(last=False)
+        if self._all is not None and record is not None:
+            self._all[1][name] = record
+
+    def invalidate(self, names: List[str]):
+        for name in names:
+            self._lru.pop(name, None)
+        self._all = None
+        self.counters["invalidations"] += len(names)
+
+    def apply(self, records: Dict[str, dict]):
+        """A peer's write-through: patch the named entries, keep the rest"""
+        now = time.monotonic()
+        for name, record in records.items():
+            if name in self._lru:
+                self._lru[name] = (now + self.ttl, record)
+            if self._all is not None:
+                self._all[1][name] = record
+        self.counters["invalidations"] += len(records)
+
+    # ── Reads ────────────────────────────────────────────────────
+
+    async def get(self, name: str) -> Optional[dict]:
+        """Record for one agent, or None if no such agent"""
+        entry = self._lru.get(name)
+        if entry and entry[0] > time.monotonic():
+            self._lru.move_to_end(name)
+            self.counters["local_hits"] += 1
+            return entry[1]
+        try:
+            pipe = redis_pool.pipeline(transaction=False)
+            pipe.hget(AGENT_CACHE_KEY, name)
+            pipe.exists(self.loaded_key)
+            raw, loaded = await pipe.execute()
+        except Exception as e:
+            self.counters["redis_errors"] += 1
+            print(f"[CORTEX] ⚠️ Agent cache read failed, using Postgres: {e}")
+            return await self._load_one(name)
+        if loaded:
+            self.counters["redis_hits"] += 1
+            record = json.loads(raw) if raw else None
+            self._local_put(name, record)
+            return record
+        return (await self.reload()).get(name)
+
+    async def list_all(self) -> List[dict]:
+        """Every agent row, ordered like the agents table listing"""
+        if self._all is None or self._all[0] <= time.monotonic():
             try:
-                await ws.send_json(data)
+                pipe = redis_pool.pipeline(transaction=False)
+                pipe.hgetall(AGENT_CACHE_KEY)
+                pipe.exists(self.loaded_key)
+                raw, loaded = await pipe.execute()
+            except Exception as e:
+                self.counters["redis_errors"] += 1
+                print(f"[CORTEX] ⚠️ Agent cache read failed, using Postgres: {e}")
+                raw, loaded = None, False
+            if loaded:
+                self.counters["redis_hits"] += 1
+                self._all = (time.monotonic() + self.ttl,
+                             {name: json.loads(v) for name, v in raw.items()})
+            else:
+                self._all = (time.monotonic() + self.ttl, await self.reload())
+        else:
+            self.counters["local_hits"] += 1
+        agents = [r["agent"] for r in self._all[1].values()]
+        agents.sort(key=lambda a: (a.get("agent_type") or "", a["name"]))
+        return agents
+
+    async def _load_one(self, name: str) -> Optional[dict]:
+        self.counters["db_loads"] += 1
+        async with pool.acquire() as conn:
+            agent = await Q_AGENT_GET.fetchrow(conn, name)
+            state = await Q_AGENT_STATE_GET.fetchrow(conn, name) if agent else None
+        return self._record(agent, state) if agent else None
+
+    async def reload(self) -> Dict[str, dict]:
+        """Full snapshot from Postgres into both tiers"""
+        async with self._reload_lock:
+            token = uuid4().hex
+            try:
+                # One replica rebuilds the shared hash; the others serve this
+                # read from Postgres and leave Redis alone
+                owner = await redis_pool.set(self.lock_key, token, nx=True,
+                                             px=AGENT_CACHE_RELOAD_LOCK_MS)
+                if owner:
+                    await redis_pool.delete(AGENT_CACHE_KEY, self.loaded_key)
+            except Exception as e:
+                self.counters["redis_errors"] += 1
+                print(f"[CORTEX] ⚠️ Agent cache lock failed, snapshot not stored: {e}")
+                owner = False
+
+            try:
+                self.counters["db_loads"] += 1
+                async with pool.acquire() as conn:
+                    agents = await Q_AGENTS_LIST.fetch(conn)
+                    states = {r["agent_name"]: r for r in await Q_AGENT_STATES_ALL.fetch(conn)}
+                records = {a["name"]: self._record(a, states.get(a["name"])) for a in agents}
+                if owner:
+                    try:
+                        # HSETNX: fields written through since the DELETE are newer
+                        pipe = redis_pool.pipeline(transaction=True)
+                        for name, r in records.items():
+                            pipe.hsetnx(AGENT_CACHE_KEY, name, json.dumps(r))
+                        pipe.set(self.loaded_key, "1", ex=max(1, int(self.ttl)))
+                        await pipe.execute()
+                    except Exception as e:
+                        self.counters["redis_errors"] += 1
+                        print(f"[CORTEX] ⚠️ Agent cache snapshot not stored: {e}")
+            finally:
+                if owner:
+                    try:
+                        await redis_pool.eval(self._UNLOCK_LUA, 1, self.lock_key, token)
+                    except Exception:
+                        pass   # expires after AGENT_CACHE_RELOAD_LOCK_MS
+            self._lru.clear()
+            for name, record in records.items():
+                self._local_put(name, record)
+            self._all = (time.monotonic() + self.ttl, records)
+            return records
+
+    # ── Writes ───────────────────────────────────────────────────
+
+    async def write(self, records: Dict[str, dict]):
+        """Write-through after Cortex changed these agents in Postgres"""
+        if not records:
+            return
+        for name, record in records.items():
+            self._local_put(name, record)
+        self.counters["writes"] += len(records)
+        try:
+            pipe = redis_pool.pipeline(transaction=False)
+            pipe.hset(AGENT_CACHE_KEY, mapping={n: json.dumps(r) for n, r in records.items()})
+            pipe.publish(AGENT_CACHE_CHANNEL, json.dumps(
+                {"agents": records, "origin": self.instance}))
+            await pipe.execute()
+        except Exception as e:
+            # Peers keep their copy until AGENT_CACHE_TTL; drop the snapshot
+            # marker so the next reader rebuilds it from Postgres
+            self.counters["redis_errors"] += 1
+            print(f"[CORTEX] ⚠️ Agent cache write-through failed: {e}")
+            try:
+                await redis_pool.delete(self.loaded_key)
             except Exception:
-                dead.append(ws)
-        for ws in dead:
-            self.active.remove(ws)
+                pass
 
-ws_manager = ConnectionManager()
+    async def write_rows(self, agents: list, states: list):
+        """write() from RETURNING rows; agents without an agents row are skipped"""
+        states = {r["agent_name"]: r for r in states}
+        await self.write({a["name"]: self._record(a, states.get(a["name"])) for a in agents})
+
+    async def write_agent(self, agent):
+        """An agents row changed, agent_state did not"""
+        current = await self.get(agent["name"])
+        await self.write({agent["name"]: self._record(agent, current and current["state"])})
+
+    def on_message(self, data: dict):
+        if data.get("origin") == self.instance:
+            return
+        agents = data.get("agents", [])
+        if isinstance(agents, dict):
+            self.apply(agents)
+        else:
+            # Names only (older replicas mid-rollout): drop what we hold
+            self.invalidate(agents)
+
+    def stats(self) -> dict:
+        return {"local_entries": len(self._lru), "size": self.size, "ttl_s": self.ttl,
+                **self.counters}
+
+agent_cache = AgentCache()
 
 
 # ─────────────────── Redis Subscriber ───────────────────────────
@@ -111,19 +1251,27 @@ async def redis_subscriber():
         pubsub = redis_pool.pubsub()
         await pubsub.subscribe(
             "nexus:commands", "nexus:events", "nexus:agents",
-            "nexus:spine:status", "nexus:spine:phi", "nexus:spine:broadcast"
+            "nexus:spine:status", "nexus:spine:phi", "nexus:spine:broadcast",
+            ROUTING_CHANNEL, AGENT_CACHE_CHANNEL,
         )
         print(f"[CORTEX] 📡 Redis subscriber active on 6 channels (incl. spine)")
         async for message in pubsub.listen():
             if message["type"] == "message":
                 try:
                     channel = message.get("channel", "")
+                    if channel == ROUTING_CHANNEL:
+                        await reload_routing()
+                        continue
+                    if channel == AGENT_CACHE_CHANNEL:
+                        agent_cache.on_message(json.loads(message["data"]))
+                        continue
                     data = json.loads(message["data"])
+                    dashboard_cache.apply(data)
                     # Tag spine messages for frontend filtering
                     if channel.startswith("nexus:spine:"):
                         spine_type = channel.split(":")[-1]  # status, phi, broadcast
                         data = {"type": f"spine_{spine_type}", "data": data}
-                    await ws_manager.broadcast(data)
+                    ws_manager.broadcast(data, channel)
                 except Exception as e:
                     print(f"[CORTEX] ⚠️ Broadcast error: {e}")
     except Exception as e:
@@ -162,6 +1310,15 @@ class HeartbeatPost(BaseModel):
     current_task: Optional[str] = None
     metrics: dict = {}
 
+class AgentHeartbeat(HeartbeatPost):
+    agent_name: str
+
+class CommandBatch(BaseModel):
+    commands: List[CommandRequest] = []
+
+class HeartbeatBatch(BaseModel):
+    heartbeats: List[AgentHeartbeat] = []
+
 # ─────────────────── Routes ─────────────────────────────────────
 
 @app.get("/", tags=["Core"])
@@ -174,10 +1331,12 @@ async def root():
         "timestamp": datetime.now(timezone.utc).isoformat()
     }
 
+Q_HEALTH_PING = queries.add("health.ping", "SELECT 1")
+
 @app.get("/health", tags=["Core"])
 async def health():
     async with pool.acquire() as conn:
-        db_ok = await conn.fetchval("SELECT 1") == 1
+        db_ok = await Q_HEALTH_PING.fetchval(conn) == 1
     redis_ok = await redis_pool.ping() if redis_pool else False
     return {
         "cortex": "online",
@@ -189,122 +1348,409 @@ async def health():
 # ─── Dashboard ──────────────────────────────────────────────────
 
 @app.get("/dashboard", tags=["Dashboard"])
-async def dashboard():
-    """لوحة التحكم المركزية — حالة كل وكيل وكوكب"""
+async def dashboard(fresh: bool = False):
+    """لوحة التحكم المركزية — حالة كل وكيل وكوكب (from memory; ?fresh=true queries Postgres)"""
+    if dashboard_cache.loaded and not fresh:
+        return dashboard_cache.snapshot()
     async with pool.acquire() as conn:
-        rows = await conn.fetch("SELECT * FROM nexus_core.cortex_dashboard")
+        rows = await Q_DASHBOARD_VIEW.fetch(conn)
         agents = [dict(r) for r in rows]
 
         # إحصائيات عامة
-        stats = await conn.fetchrow("""
-            SELECT
-              (SELECT COUNT(*) FROM nexus_core.agents WHERE status='online') AS online_count,
-              (SELECT COUNT(*) FROM nexus_core.commands WHERE status='queued') AS queued_commands,
-              (SELECT COUNT(*) FROM nexus_core.commands WHERE status='running') AS running_commands,
-              (SELECT COUNT(*) FROM nexus_core.events WHERE created_at > now() - INTERVAL '1 hour') AS recent_events
-        """)
+        stats = await Q_DASHBOARD_STATS.fetchrow(conn)
+    now = datetime.now(timezone.utc).isoformat()
     return {
-        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "timestamp": now,
+        "as_of": now,
         "stats": dict(stats),
         "agents": agents
     }
 
+
+@app.get("/dashboard/cache", tags=["Dashboard"])
+async def dashboard_cache_stats():
+    """Dashboard cache freshness and reconciliation counters"""
+    return {
+        "loaded": dashboard_cache.loaded,
+        "as_of": dashboard_cache.as_of.isoformat() if dashboard_cache.as_of else None,
+        "reconciled_at": (dashboard_cache.reconciled_at.isoformat()
+                          if dashboard_cache.reconciled_at else None),
+        "reconcile_interval_s": DASHBOARD_RECONCILE_SEC,
+        "agents": len(dashboard_cache.agents),
+        "open_commands": len(dashboard_cache._commands),
+        **dashboard_cache.counters,
+    }
+
 # ─── Agents ─────────────────────────────────────────────────────
 
+Q_AGENTS_LIST = queries.add("agents.list", "SELECT * FROM nexus_core.agents ORDER BY agent_type, name")
+Q_AGENT_UPSERT = queries.add("agents.upsert", """
+    INSERT INTO nexus_core.agents (name, display_name, agent_type, capabilities, endpoint, status, last_seen)
+    VALUES ($1,$2,$3,$4,$5,'online',now())
+    ON CONFLICT (name) DO UPDATE SET
+      display_name=EXCLUDED.display_name,
+      capabilities=EXCLUDED.capabilities,
+      endpoint=EXCLUDED.endpoint,
+      status='online',
+      last_seen=now()
+    RETURNING *
+""")
+Q_AGENT_STATE_ONLINE = queries.add("agents.state_online", """
+    INSERT INTO nexus_core.agent_state (agent_name, status, updated_at)
+    VALUES ($1,'online',now())
+    ON CONFLICT (agent_name) DO UPDATE SET status='online', updated_at=now()
+    RETURNING *
+""")
+Q_AGENT_SEEN = queries.add("agents.seen", """
+    UPDATE nexus_core.agents SET status='online', last_seen=now()
+    WHERE name=$1
+    RETURNING *
+""")
+Q_AGENT_STATE_UPSERT = queries.add("agents.state_upsert", """
+    INSERT INTO nexus_core.agent_state (agent_name, status, current_task, metrics, updated_at)
+    VALUES ($1,'online',$2,$3,now())
+    ON CONFLICT (agent_name) DO UPDATE SET
+      status='online', current_task=$2, metrics=$3, updated_at=now()
+    RETURNING *
+""")
+Q_AGENTS_SEEN_BULK = queries.add("agents.seen_bulk", """
+    UPDATE nexus_core.agents a SET status='online', last_seen=now()
+    FROM unnest($1::text[]) AS hb(agent_name)
+    WHERE a.name = hb.agent_name
+    RETURNING a.*
+""")
+Q_AGENT_STATE_UPSERT_BULK = queries.add("agents.state_upsert_bulk", """
+    INSERT INTO nexus_core.agent_state (agent_name, status, current_task, metrics, updated_at)
+    SELECT hb.agent_name, 'online', hb.current_task, hb.metrics::jsonb, now()
+    FROM unnest($1::text[], $2::text[], $3::text[]) AS hb(agent_name, current_task, metrics)
+    ON CONFLICT (agent_name) DO UPDATE SET
+      status='online', current_task=EXCLUDED.current_task,
+      metrics=EXCLUDED.metrics, updated_at=now()
+    RETURNING *
+""")
+Q_AGENT_GET = queries.add("agents.get", "SELECT * FROM nexus_core.agents WHERE name=$1")
+Q_AGENT_STATE_GET = queries.add("agents.state_get", "SELECT * FROM nexus_core.agent_state WHERE agent_name=$1")
+Q_AGENT_RECENT_COMMANDS = queries.add("agents.recent_commands", """
+    SELECT id, command_type, status, priority, created_at
+    FROM nexus_core.commands
+    WHERE target_agent=$1 ORDER BY created_at DESC LIMIT 10
+""")
+
 @app.get("/agents", tags=["Agents"])
 async def list_agents():
-    async with pool.acquire() as conn:
-        rows = await conn.fetch("SELECT * FROM nexus_core.agents ORDER BY agent_type, name")
-    return {"agents": [dict(r) for r in rows]}
+    return {"agents": await agent_cache.list_all()}
+
+@app.get("/agents/cache", tags=["Agents"])
+async def agents_cache_stats():
+    """Agent registry cache hit/miss counters"""
+    return agent_cache.stats()
 
 @app.post("/agent/register", tags=["Agents"])
 async def register_agent(body: AgentRegister):
     async with pool.acquire() as conn:
-        await conn.execute("""
-            INSERT INTO nexus_core.agents (name, display_name, agent_type, capabilities, endpoint, status, last_seen)
-            VALUES ($1,$2,$3,$4,$5,'online',now())
-            ON CONFLICT (name) DO UPDATE SET
-              display_name=EXCLUDED.display_name,
-              capabilities=EXCLUDED.capabilities,
-              endpoint=EXCLUDED.endpoint,
-              status='online',
-              last_seen=now()
-        """, body.name, body.display_name or body.name, body.agent_type,
+        agent = await Q_AGENT_UPSERT.fetchrow(conn, body.name, body.display_name or body.name, body.agent_type,
             json.dumps(body.capabilities), body.endpoint)
 
-        await conn.execute("""
-            INSERT INTO nexus_core.agent_state (agent_name, status, updated_at)
-            VALUES ($1,'online',now())
-            ON CONFLICT (agent_name) DO UPDATE SET status='online', updated_at=now()
-        """, body.name)
+        state = await Q_AGENT_STATE_ONLINE.fetchrow(conn, body.name)
+    await agent_cache.write_rows([agent], [state])
 
     await redis_pool.publish("nexus:agents", json.dumps({"type": "agent_online", "agent": body.name}))
     return {"registered": body.name, "status": "online"}
 
 @app.post("/agent/{agent_name}/heartbeat", tags=["Agents"])
 async def agent_heartbeat(agent_name: str, body: HeartbeatPost):
+    metrics = json.dumps(body.metrics)
     async with pool.acquire() as conn:
-        await conn.execute("""
-            UPDATE nexus_core.agents SET status='online', last_seen=now()
-            WHERE name=$1
-        """, agent_name)
-        await conn.execute("""
-            INSERT INTO nexus_core.agent_state (agent_name, status, current_task, metrics, updated_at)
-            VALUES ($1,'online',$2,$3,now())
-            ON CONFLICT (agent_name) DO UPDATE SET
-              status='online', current_task=$2, metrics=$3, updated_at=now()
-        """, agent_name, body.current_task, json.dumps(body.metrics))
+        agent = await Q_AGENT_SEEN.fetchrow(conn, agent_name)
+        state = await Q_AGENT_STATE_UPSERT.fetchrow(conn, agent_name, body.current_task, metrics)
+    if agent:
+        await agent_cache.write_rows([agent], [state])
+    dashboard_cache.heartbeat([agent_name], [body.current_task], [metrics])
     return {"agent": agent_name, "heartbeat": "ok"}
 
+@app.post("/agents/heartbeats", tags=["Agents"])
+async def agent_heartbeats_bulk(body: HeartbeatBatch):
+    """نبضات مجمّعة — تحديث كل الوكلاء في استعلام واحد (orchestrator batching)"""
+    # آخر نبضة لكل وكيل فقط — ON CONFLICT لا يقبل نفس الصف مرتين
+    latest = {hb.agent_name: hb for hb in body.heartbeats}
+    if not latest:
+        return {"heartbeats": 0}
+    names = list(latest.keys())
+    tasks = [hb.current_task for hb in latest.values()]
+    metrics = [json.dumps(hb.metrics) for hb in latest.values()]
+
+    async with pool.acquire() as conn:
+        async with conn.transaction():
+            agents = await Q_AGENTS_SEEN_BULK.fetch(conn, names)
+            states = await Q_AGENT_STATE_UPSERT_BULK.fetch(conn, names, tasks, metrics)
+    await agent_cache.write_rows(agents, states)
+    dashboard_cache.heartbeat(names, tasks, metrics)
+    return {"heartbeats": len(names), "status": "ok"}
+
 @app.get("/agent/{agent_name}", tags=["Agents"])
 async def get_agent(agent_name: str):
+    record = await agent_cache.get(agent_name)
+    if not record:
+        raise HTTPException(404, f"Agent '{agent_name}' not found")
     async with pool.acquire() as conn:
-        agent = await conn.fetchrow("SELECT * FROM nexus_core.agents WHERE name=$1", agent_name)
-        if not agent:
-            raise HTTPException(404, f"Agent '{agent_name}' not found")
-        state = await conn.fetchrow("SELECT * FROM nexus_core.agent_state WHERE agent_name=$1", agent_name)
-        cmds = await conn.fetch("""
-            SELECT id, command_type, status, priority, created_at
-            FROM nexus_core.commands
-            WHERE target_agent=$1 ORDER BY created_at DESC LIMIT 10
-        """, agent_name)
+        cmds = await Q_AGENT_RECENT_COMMANDS.fetch(conn, agent_name)
     return {
-        "agent": dict(agent),
-        "state": dict(state) if state else None,
+        "agent": record["agent"],
+        "state": record["state"],
         "recent_commands": [dict(c) for c in cmds]
     }
 
 # ─── Commands ───────────────────────────────────────────────────
 
+def _pb_varint(n: int) -> bytes:
+    out = bytearray()
+    n &= (1 << 64) - 1
+    while n > 0x7F:
+        out.append((n & 0x7F) | 0x80)
+        n >>= 7
+    out.append(n)
+    return bytes(out)
+
+def _pb_string(field: int, value: str) -> bytes:
+    data = value.encode()
+    return _pb_varint(field << 3 | 2) + _pb_varint(len(data)) + data
+
+def encode_task_command(command_id: str, command_type: str,
+                        origin: str, priority: int) -> bytes:
+    """
+    nexus_pulse.TaskCommand wire bytes (fields 1,2,3,5 of shared_protos/
+    nexus_pulse.proto). Hand-encoded so the Cortex image needs no generated
+    stubs; the orchestrator parses it with the real message class.
+    """
+    out = _pb_string(1, command_id) + _pb_string(2, command_type)
+    if origin:
+        out += _pb_string(3, origin)
+    if priority:
+        out += _pb_varint(5 << 3) + _pb_varint(priority)
+    return out
+
+_wire_version = {"value": 1, "checked_at": 0.0}
+
+async def live_consumer_versions() -> dict:
+    """{consumer: advertised wire version} for the group's live consumers (1 = no advert)"""
+    consumers = await redis_pool.xinfo_consumers(COMMAND_STREAM, COMMAND_GROUP)
+    live = [c["name"] for c in consumers if c["idle"] < COMMAND_CONSUMER_LIVE_MS]
+    if not live:
+        return {}
+    adverts = await redis_pool.mget([COMMAND_WIRE_VERSION_PREFIX + name for name in live])
+    return {name: int(v) if v else 1 for name, v in zip(live, adverts)}
+
+async def negotiated_wire_version() -> int:
+    """Highest stream wire version every live orchestrator understands (cached 30s)."""
+    if COMMAND_WIRE_FORMAT != "protobuf":
+        return 1
+    now = time.monotonic()
+    if now - _wire_version["checked_at"] > 30:
+        try:
+            versions = await live_consumer_versions()
+            _wire_version["value"] = 2 if versions and min(versions.values()) >= 2 else 1
+        except Exception:
+            _wire_version["value"] = 1
+        _wire_version["checked_at"] = now
+    return _wire_version["value"]
+
+def command_stream_fields(command_id: str, command_type: str, origin: str,
+                          priority: int, target: str, wire_version: int) -> dict:
+    if wire_version >= 2:
+        return {
+            "v": "2",
+            "type": "command_issued",
+            "target": target,
+            "command_id": command_id,
+            "cmd": encode_task_command(command_id, command_type, origin, priority),
+        }
+    return {
+        "v": "1",
+        "type": "command_issued",
+        "target": target,
+        "command_id": command_id,
+        "command_type": command_type,
+        "origin": origin,
+        "priority": str(priority),
+    }
+
+async def xadd_commands(entries: List[dict]):
+    """
+    XADD command entries in one pipeline. Retried once: an XADD that landed
+    before the error is harmless, orchestrators drop repeated command_ids.
+    Raises if the second attempt fails too.
+    """
+    for attempt in (1, 2):
+        try:
+            pipe = redis_pool.pipeline(transaction=False)
+            for fields in entries:
+                pipe.xadd(COMMAND_STREAM, fields, maxlen=COMMAND_STREAM_MAXLEN, approximate=True)
+            await pipe.execute()
+            return
+        except Exception:
+            if attempt == 2:
+                raise
+
+async def enqueue_commands(entries: List[dict]):
+    """
+    Deliver committed commands to the stream. If Redis refuses them, they
+    go to the outbox and command_outbox_relay sends them later. Raises 503
+    only if the outbox can't take them either: nothing would ever deliver
+    those rows.
+    """
+    try:
+        await xadd_commands(entries)
+        return
+    except Exception as e:
+        print(f"[CORTEX] ⚠️ Command stream XADD failed ({len(entries)} commands), "
+              f"deferred to outbox: {e}")
+    try:
+        await command_outbox.add([fields["command_id"] for fields in entries])
+    except Exception as e:
+        print(f"[CORTEX] ❌ Command outbox write failed ({len(entries)} commands): {e}")
+        raise HTTPException(status_code=503, detail="command stream unavailable") from e
+
+
+# ─────────────────── Command Outbox ─────────────────────────────
+
+Q_OUTBOX_INSTALLED = queries.add(
+    "outbox.installed", "SELECT to_regclass('nexus_core.command_outbox') IS NOT NULL")
+Q_OUTBOX_ADD = queries.add("outbox.add", """
+    INSERT INTO nexus_core.command_outbox (command_id)
+    SELECT unnest($1::uuid[]) ON CONFLICT DO NOTHING
+""")
+Q_OUTBOX_DUE = queries.add("outbox.due", """
+    SELECT c.id::text AS id, c.command_type, c.origin, c.priority, c.target_agent, c.status
+    FROM nexus_core.command_outbox o JOIN nexus_core.commands c ON c.id = o.command_id
+    ORDER BY o.failed_at LIMIT $1
+""")
+Q_OUTBOX_DONE = queries.add(
+    "outbox.done", "DELETE FROM nexus_core.command_outbox WHERE command_id = ANY($1::uuid[])")
+Q_OUTBOX_ATTEMPT = queries.add("outbox.attempt", """
+    UPDATE nexus_core.command_outbox SET attempts = attempts + 1
+    WHERE command_id = ANY($1::uuid[])
+""")
+
+
+class CommandOutbox:
+    """
+    Targeted commands committed as queued whose stream XADD failed, kept in
+    nexus_core.command_outbox until command_outbox_relay gets them onto the
+    stream. Rows keep status 'queued' meanwhile: Cortex still owes the
+    delivery.
+    """
+
+    def __init__(self):
+        self.counters = {"deferred": 0, "relayed": 0, "relay_errors": 0}
+
+    async def add(self, command_ids: List[str]):
+        async with pool.acquire() as conn:
+            await Q_OUTBOX_ADD.execute(conn, [UUID(c) for c in command_ids])
+        self.counters["deferred"] += len(command_ids)
+
+    async def due(self, limit: int) -> List[dict]:
+        """Oldest deferred commands with their current status"""
+        async with pool.acquire() as conn:
+            return [dict(r) for r in await Q_OUTBOX_DUE.fetch(conn, limit)]
+
+    async def done(self, command_ids: List[str]):
+        async with pool.acquire() as conn:
+            await Q_OUTBOX_DONE.execute(conn, [UUID(c) for c in command_ids])
+        self.counters["relayed"] += len(command_ids)
+
+    async def failed(self, command_ids: List[str]):
+        self.counters["relay_errors"] += 1
+        async with pool.acquire() as conn:
+            await Q_OUTBOX_ATTEMPT.execute(conn, [UUID(c) for c in command_ids])
+
+command_outbox = CommandOutbox()
+
+
+async def command_outbox_relay():
+    """Re-XADD commands whose stream entry could not be written when issued"""
+    try:
+        async with pool.acquire() as conn:
+            if not await Q_OUTBOX_INSTALLED.fetchval(conn):
+                print(f"[CORTEX] ℹ️ Command outbox off — cortex migration 003 not applied")
+                return
+    except Exception as e:
+        print(f"[CORTEX] ⚠️ Command outbox check failed, relaying anyway: {e}")
+    while True:
+        await asyncio.sleep(COMMAND_OUTBOX_RETRY_SEC)
+        rows = []
+        try:
+            rows = await command_outbox.due(COMMAND_BATCH_MAX)
+            if not rows:
+                continue
+            # Anything past 'queued' was delivered by an XADD that landed
+            # before its error — only the still-queued ones are re-sent
+            queued = [r for r in rows if r["status"] == "queued"]
+            if queued:
+                wire_version = await negotiated_wire_version()
+                await xadd_commands([
+                    command_stream_fields(r["id"], r["command_type"], r["origin"],
+                                          r["priority"], r["target_agent"], wire_version)
+                    for r in queued])
+            await command_outbox.done([r["id"] for r in rows])
+            print(f"[CORTEX] 📤 Command outbox relayed {len(queued)} commands")
+        except Exception as e:
+            print(f"[CORTEX] ⚠️ Command outbox relay failed ({len(rows)} commands): {e}")
+            try:
+                await command_outbox.failed([r["id"] for r in rows])
+            except Exception:
+                pass
+
+Q_ROUTE_LOOKUP = queries.add("routing.lookup", """
+    SELECT target_agent FROM nexus_core.routing_rules
+    WHERE command_type=$1 AND is_active=true
+    ORDER BY priority LIMIT 1
+""")
+Q_ROUTE_LOOKUP_MANY = queries.add("routing.lookup_many", """
+    SELECT DISTINCT ON (command_type) command_type, target_agent
+    FROM nexus_core.routing_rules
+    WHERE command_type = ANY($1::text[]) AND is_active=true
+    ORDER BY command_type, priority
+""")
+Q_COMMAND_INSERT = queries.add("commands.insert", """
+    INSERT INTO nexus_core.commands
+      (command_type, origin, target_agent, payload, priority, status, created_at)
+    VALUES ($1,$2,$3,$4,$5,'queued',now())
+    RETURNING id
+""")
+Q_COMMAND_ISSUED_EVENT = queries.add("events.command_issued", """
+    INSERT INTO nexus_core.events (agent_name, event_type, severity, title, body, command_id)
+    VALUES ('nexus_cortex','command_issued','info',$1,$2,$3)
+""")
+Q_COMMAND_GET = queries.add("commands.get", "SELECT * FROM nexus_core.commands WHERE id=$1")
+Q_COMMAND_UPDATE = queries.add("commands.update", """
+    UPDATE nexus_core.commands
+    SET status=$1, result=$2, error_msg=$3,
+        completed_at = CASE WHEN $1 IN ('done','failed') THEN now() ELSE completed_at END,
+        updated_at=now()
+    WHERE id=$4
+    RETURNING *
+""")
+
 @app.post("/command", tags=["Commands"])
 async def issue_command(body: CommandRequest, bg: BackgroundTasks):
     """إصدار أمر — يُوجَّه تلقائياً للوكيل المناسب"""
     target = body.target_agent
 
+    # إذا لم يحدد الهدف → routing table (compiled in memory)
+    if not target and routing_table.loaded:
+        target = routing_table.resolve(body.command_type)
+
     async with pool.acquire() as conn:
-        # إذا لم يحدد الهدف → ابحث في routing_rules
-        if not target:
-            row = await conn.fetchrow("""
-                SELECT target_agent FROM nexus_core.routing_rules
-                WHERE command_type=$1 AND is_active=true
-                ORDER BY priority LIMIT 1
-            """, body.command_type)
+        if not target and not routing_table.loaded:
+            row = await Q_ROUTE_LOOKUP.fetchrow(conn, body.command_type)
             target = row["target_agent"] if row else None
 
         # أنشئ الأمر
-        cmd_id = await conn.fetchval("""
-            INSERT INTO nexus_core.commands
-              (command_type, origin, target_agent, payload, priority, status, created_at)
-            VALUES ($1,$2,$3,$4,$5,'queued',now())
-            RETURNING id
-        """, body.command_type, body.origin, target,
+        cmd_id = await Q_COMMAND_INSERT.fetchval(conn, body.command_type, body.origin, target,
             json.dumps(body.payload), body.priority)
 
         # سجّل حدث
-        await conn.execute("""
-            INSERT INTO nexus_core.events (agent_name, event_type, severity, title, body, command_id)
-            VALUES ('nexus_cortex','command_issued','info',$1,$2,$3)
-        """, f"Command {body.command_type} → {target or 'broadcast'}",
+        await Q_COMMAND_ISSUED_EVENT.execute(conn, f"Command {body.command_type} → {target or 'broadcast'}",
             json.dumps({"origin": body.origin, "target": target}),
             cmd_id)
 
@@ -316,6 +1762,12 @@ async def issue_command(body: CommandRequest, bg: BackgroundTasks):
         "priority": body.priority
     }))
 
+    if target:
+        await enqueue_commands([command_stream_fields(
+            str(cmd_id), body.command_type, body.origin, body.priority,
+            target, await negotiated_wire_version(),
+        )])
+
     return {
         "command_id": str(cmd_id),
         "status": "queued",
@@ -323,12 +1775,91 @@ async def issue_command(body: CommandRequest, bg: BackgroundTasks):
         "command_type": body.command_type
     }
 
+@app.post("/commands/batch", tags=["Commands"])
+async def issue_commands_batch(body: CommandBatch):
+    """
+    أوامر مجمّعة — routing resolved once per command type, all rows COPY'd
+    in one transaction, then one Redis pipeline each for the Pub/Sub
+    notifications and the command stream entries.
+    """
+    cmds = body.commands
+    if not cmds:
+        return {"count": 0, "commands": []}
+    if len(cmds) > COMMAND_BATCH_MAX:
+        raise HTTPException(status_code=413, detail=f"batch exceeds {COMMAND_BATCH_MAX} commands")
+
+    untargeted = {c.command_type for c in cmds if not c.target_agent}
+    routes: Dict[str, Optional[str]] = {}
+    async with pool.acquire() as conn:
+        if routing_table.loaded:
+            routes = {ct: routing_table.resolve(ct) for ct in untargeted}
+        elif untargeted:
+            rows = await Q_ROUTE_LOOKUP_MANY.fetch(conn, list(untargeted))
+            routes = {r["command_type"]: r["target_agent"] for r in rows}
+
+        now = datetime.now(timezone.utc)
+        issued = []
+        for c in cmds:
+            target = c.target_agent or routes.get(c.command_type)
+            issued.append((uuid4(), c, target))
+
+        t0 = time.perf_counter()
+        async with conn.transaction():
+            await conn.copy_records_to_table(
+                "commands", schema_name="nexus_core",
+                columns=["id", "command_type", "origin", "target_agent",
+                         "payload", "priority", "status", "created_at"],
+                records=[(cid, c.command_type, c.origin, target, json.dumps(c.payload),
+                          c.priority, "queued", now) for cid, c, target in issued],
+            )
+            await conn.copy_records_to_table(
+                "events", schema_name="nexus_core",
+                columns=["agent_name", "event_type", "severity", "title", "body",
+                         "command_id", "created_at"],
+                records=[("nexus_cortex", "command_issued", "info",
+                          f"Command {c.command_type} → {target or 'broadcast'}",
+                          json.dumps({"origin": c.origin, "target": target, "batch": True}),
+                          cid, now) for cid, c, target in issued],
+            )
+        queries.record(queries.stats_for("commands.copy_batch"), t0, len(issued))
+
+    wire_version = await negotiated_wire_version()
+    pipe = redis_pool.pipeline(transaction=False)
+    for cid, c, target in issued:
+        pipe.publish("nexus:commands", json.dumps({
+            "type": "command_issued",
+            "command_id": str(cid),
+            "command_type": c.command_type,
+            "target": target,
+            "priority": c.priority
+        }))
+    await pipe.execute()
+    stream_entries = [
+        command_stream_fields(str(cid), c.command_type, c.origin, c.priority,
+                              target, wire_version)
+        for cid, c, target in issued if target
+    ]
+    if stream_entries:
+        await enqueue_commands(stream_entries)
+
+    return {
+        "count": len(issued),
+        "commands": [
+            {"command_id": str(cid), "status": "queued",
+             "target_agent": target, "command_type": c.command_type}
+            for cid, c, target in issued
+        ],
+    }
+
+@app.get("/commands/outbox", tags=["Commands"])
+async def command_outbox_stats():
+    """Commands deferred after a failed stream XADD, and how many were relayed since"""
+    return command_outbox.counters
+
 @app.get("/command/{command_id}", tags=["Commands"])
 async def get_command(command_id: str):
     async with pool.acquire() as conn:
-        row = await conn.fetchrow(
-            "SELECT * FROM nexus_core.commands WHERE id=$1", UUID(command_id)
-        )
+        row = await Q_COMMAND_GET.fetchrow(conn, UUID(command_id))
         if not row:
             raise HTTPException(404, "Command not found")
     return dict(row)
@@ -337,26 +1868,82 @@ async def get_command(command_id: str):
 async def update_command(command_id: str, body: CommandUpdate):
     """الوكيل يُحدّث حالة الأمر بعد تنفيذه"""
     async with pool.acquire() as conn:
-        row = await conn.fetchrow("""
-            UPDATE nexus_core.commands
-            SET status=$2, result=$3, error_msg=$4,
-                completed_at = CASE WHEN $2 IN ('done','failed') THEN now() ELSE completed_at END,
-                updated_at=now()
-            WHERE id=$5
-            RETURNING *
-        """, None, body.status, json.dumps(body.result) if body.result else None,
+        row = await Q_COMMAND_UPDATE.fetchrow(conn, body.status, json.dumps(body.result) if body.result else None,
             body.error_msg, UUID(command_id))
         if not row:
             raise HTTPException(404, "Command not found")
     await redis_pool.publish("nexus:commands", json.dumps({"type": "command_updated", "command_id": command_id, "status": body.status}))
     return dict(row)
 
+# ─── Keyset pagination ──────────────────────────────────────────
+# Listings are ordered (created_at DESC, id DESC); a cursor is the opaque
+# (created_at, id) of the last row returned, so each page is an index range
+# scan no matter how deep the client has paged.
+
+def _encode_cursor(row) -> str:
+    raw = f"{row['created_at'].isoformat()}|{row['id']}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+def _decode_cursor(cursor: str, id_type) -> tuple:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, _, row_id = raw.partition("|")
+        return datetime.fromisoformat(created_at), id_type(row_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="invalid cursor")
+
+def _keyset_sql(table: str, filters: list, params: list,
+                cursor: Optional[str], id_type) -> str:
+    if cursor:
+        created_at, row_id = _decode_cursor(cursor, id_type)
+        params.extend([created_at, row_id])
+        filters.append(f"(created_at, id) < (${len(params) - 1}, ${len(params)})")
+    where = f"WHERE {' AND '.join(filters)}" if filters else ""
+    return f"SELECT * FROM {table} {where} ORDER BY created_at DESC, id DESC"
+
+async def _keyset_page(key: str, sql: str, params: list, limit: int) -> dict:
+    limit = max(1, min(limit, LIST_MAX_LIMIT))
+    params.append(limit + 1)
+    async with pool.acquire() as conn:
+        rows = await queries.fetch(conn, f"{key}.page", f"{sql} LIMIT ${len(params)}", *params)
+    more = len(rows) > limit
+    rows = rows[:limit]
+    return {
+        key: [dict(r) for r in rows],
+        "count": len(rows),
+        "next_cursor": _encode_cursor(rows[-1]) if more else None,
+    }
+
+def _ndjson_stream(key: str, sql: str, params: list, limit: Optional[int]) -> StreamingResponse:
+    """Stream rows from a server-side cursor — memory stays flat for any row count."""
+    if limit:
+        params.append(limit)
+        sql = f"{sql} LIMIT ${len(params)}"
+
+    async def rows():
+        stats, t0, n, failed = queries.stats_for(f"{key}.stream"), time.perf_counter(), 0, True
+        try:
+            async with pool.acquire() as conn:
+                async with conn.transaction():
+                    async for r in conn.cursor(sql, *params, prefetch=STREAM_PREFETCH):
+                        n += 1
+                        yield json.dumps(dict(r), default=str, ensure_ascii=False) + "\n"
+            failed = False
+        finally:
+            # Includes time the client took to read — it holds the cursor open
+            queries.record(stats, t0, n, error=failed)
+
+    return StreamingResponse(rows(), media_type="application/x-ndjson")
+
 @app.get("/commands", tags=["Commands"])
 async def list_commands(
     status: Optional[str] = None,
     agent: Optional[str] = None,
-    limit: int = 50
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    format: str = "json",
 ):
+    """Newest first. Page with ?cursor=<next_cursor>; ?format=ndjson streams every match."""
     filters = []
     params: List[Any] = []
     if status:
@@ -365,35 +1952,34 @@ async def list_commands(
     if agent:
         params.append(agent)
         filters.append(f"target_agent=${len(params)}")
-    params.append(limit)
-    where = f"WHERE {' AND '.join(filters)}" if filters else ""
-    async with pool.acquire() as conn:
-        rows = await conn.fetch(
-            f"SELECT * FROM nexus_core.commands {where} ORDER BY created_at DESC LIMIT ${len(params)}",
-            *params
-        )
-    return {"commands": [dict(r) for r in rows], "count": len(rows)}
+    sql = _keyset_sql("nexus_core.commands", filters, params, cursor, UUID)
+    if format == "ndjson":
+        return _ndjson_stream("commands", sql, params, limit)
+    return await _keyset_page("commands", sql, params, limit or 50)
 
 # ─── Events ─────────────────────────────────────────────────────
 
+Q_EVENT_INSERT = queries.add("events.insert", """
+    INSERT INTO nexus_core.events
+      (agent_name, event_type, severity, title, body, command_id, created_at)
+    VALUES ($1,$2,$3,$4,$5,$6,now())
+    RETURNING id
+""")
+Q_AGENT_LAST_SEEN = queries.add(
+    "agents.last_seen", "UPDATE nexus_core.agents SET last_seen=now() WHERE name=$1 RETURNING *")
+
 @app.post("/event", tags=["Events"])
 async def post_event(body: EventPost):
     """أي وكيل يرسل حدث هنا"""
     async with pool.acquire() as conn:
-        eid = await conn.fetchval("""
-            INSERT INTO nexus_core.events
-              (agent_name, event_type, severity, title, body, command_id, created_at)
-            VALUES ($1,$2,$3,$4,$5,$6,now())
-            RETURNING id
-        """, body.agent_name, body.event_type, body.severity,
+        eid = await Q_EVENT_INSERT.fetchval(conn, body.agent_name, body.event_type, body.severity,
             body.title, json.dumps(body.body),
             UUID(body.command_id) if body.command_id else None)
 
         # تحديث last_seen للوكيل
-        await conn.execute(
-            "UPDATE nexus_core.agents SET last_seen=now() WHERE name=$1",
-            body.agent_name
-        )
+        agent = await Q_AGENT_LAST_SEEN.fetchrow(conn, body.agent_name)
+    if agent:
+        await agent_cache.write_agent(agent)
     await redis_pool.publish("nexus:events", json.dumps({
         "type": "event",
         "event_id": eid,
@@ -408,8 +1994,11 @@ async def post_event(body: EventPost):
 async def list_events(
     agent: Optional[str] = None,
     severity: Optional[str] = None,
-    limit: int = 100
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    format: str = "json",
 ):
+    """Newest first. Page with ?cursor=<next_cursor>; ?format=ndjson streams every match."""
     filters = []
     params: List[Any] = []
     if agent:
@@ -418,54 +2007,92 @@ async def list_events(
     if severity:
         params.append(severity)
         filters.append(f"severity=${len(params)}")
-    params.append(limit)
-    where = f"WHERE {' AND '.join(filters)}" if filters else ""
-    async with pool.acquire() as conn:
-        rows = await conn.fetch(
-            f"SELECT * FROM nexus_core.events {where} ORDER BY created_at DESC LIMIT ${len(params)}",
-            *params
-        )
-    return {"events": [dict(r) for r in rows], "count": len(rows)}
+    sql = _keyset_sql("nexus_core.events", filters, params, cursor, int)
+    if format == "ndjson":
+        return _ndjson_stream("events", sql, params, limit)
+    return await _keyset_page("events", sql, params, limit or 100)
 
 # ─── Routing Rules ───────────────────────────────────────────────
 
 @app.get("/routing", tags=["Routing"])
 async def get_routing_rules():
-    async with pool.acquire() as conn:
-        rows = await conn.fetch("SELECT * FROM nexus_core.routing_rules WHERE is_active=true ORDER BY command_type")
-    return {"routing_rules": [dict(r) for r in rows]}
+    if not routing_table.loaded:
+        await reload_routing()
+    return {
+        "routing_rules": routing_table.rules,
+        "compiled_at": routing_table.loaded_at.isoformat(),
+    }
+
+@app.get("/routing/resolve", tags=["Routing"])
+async def resolve_routing(command_type: str):
+    """Which agent an untargeted command of this type would go to"""
+    return {"command_type": command_type, "target_agent": routing_table.resolve(command_type)}
+
+Q_ROUTING_INSERT = queries.add("routing.insert", """
+    INSERT INTO nexus_core.routing_rules (command_type, target_agent, priority)
+    VALUES ($1,$2,$3) RETURNING id
+""")
 
 @app.post("/routing", tags=["Routing"])
 async def add_routing_rule(command_type: str, target_agent: str, priority: int = 5):
     async with pool.acquire() as conn:
-        rid = await conn.fetchval("""
-            INSERT INTO nexus_core.routing_rules (command_type, target_agent, priority)
-            VALUES ($1,$2,$3) RETURNING id
-        """, command_type, target_agent, priority)
+        rid = await Q_ROUTING_INSERT.fetchval(conn, command_type, target_agent, priority)
+    # Recompile here, then tell the other replicas
+    await reload_routing()
+    await redis_pool.publish(ROUTING_CHANNEL, json.dumps({"type": "routing_changed", "rule_id": rid}))
     return {"rule_id": rid, "command_type": command_type, "target_agent": target_agent}
 
+# ─── Query Stats ────────────────────────────────────────────────
+
+@app.get("/debug/queries", tags=["Debug"])
+async def debug_queries():
+    """Per-statement latency/rows and per-route DB time, hottest first"""
+    return queries.snapshot()
+
+@app.get("/metrics", tags=["Debug"], response_class=PlainTextResponse)
+async def metrics():
+    """Prometheus scrape endpoint"""
+    return PlainTextResponse(queries.prometheus(), media_type="text/plain; version=0.0.4")
+
 # ─── WebSocket ──────────────────────────────────────────────────
 
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
     """Real-time feed — كل حدث وأمر يُبث هنا"""
-    await ws_manager.connect(websocket)
+    client = await ws_manager.connect(websocket)
     try:
-        # أرسل الحالة الأولية
-        await websocket.send_json({"type": "connected", "cortex": CORTEX_VERSION})
+        # أرسل الحالة الأولية — all sends go through the client's writer task
+        client.send({"type": "connected", "cortex": CORTEX_VERSION})
         while True:
             data = await websocket.receive_text()
             # الوكيل يمكن أن يرسل heartbeat عبر WS
             try:
                 msg = json.loads(data)
                 if msg.get("type") == "ping":
-                    await websocket.send_json({"type": "pong"})
+                    client.send({"type": "pong"})
+                elif msg.get("type") == "subscribe":
+                    try:
+                        client.subscription = WSSubscription.from_message(msg)
+                        client.send({"type": "subscribed", **client.subscription.describe()})
+                    except (ValueError, TypeError, AttributeError) as e:
+                        client.send({"type": "error", "error": f"bad subscription: {e}"})
+                elif msg.get("type") == "unsubscribe":
+                    client.subscription = WSSubscription()
+                    client.send({"type": "subscribed", **client.subscription.describe()})
             except Exception:
                 pass
-    except WebSocketDisconnect:
+    except (WebSocketDisconnect, RuntimeError):
+        pass
+    finally:
         ws_manager.disconnect(websocket)
 
 
+@app.get("/ws/stats", tags=["WebSocket"])
+async def websocket_stats():
+    """Per-client queue depth, dropped and coalesced frames"""
+    return ws_manager.stats()
+
+
 # ─── Neural Spine Integration ───────────────────────────────────
 
 import httpx
@@ -46,10 +46,24 @@ CREATE TABLE IF NOT EXISTS nexus_core.commands (
 CREATE INDEX IF NOT EXISTS idx_commands_status ON nexus_core.commands(status);
 CREATE INDEX IF NOT EXISTS idx_commands_target ON nexus_core.commands(target_agent);
 CREATE INDEX IF NOT EXISTS idx_commands_created ON nexus_core.commands(created_at DESC);
+-- keyset pagination: ORDER BY created_at DESC, id DESC (scripts/db/cortex_migrations/001)
+CREATE INDEX IF NOT EXISTS idx_commands_keyset ON nexus_core.commands(created_at DESC, id DESC);
+
+-- Queued commands whose stream XADD failed; Cortex's command_outbox_relay
+-- re-XADDs them and deletes the row (scripts/db/cortex_migrations/003)
+CREATE TABLE IF NOT EXISTS nexus_core.command_outbox (
+  command_id  UUID PRIMARY KEY REFERENCES nexus_core.commands(id) ON DELETE CASCADE,
+  failed_at   TIMESTAMPTZ NOT NULL DEFAULT now(),
+  attempts    INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_commands_status_keyset ON nexus_core.commands(status, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_commands_target_keyset ON nexus_core.commands(target_agent, created_at DESC, id DESC);
 
 -- ---------------------------------------------------------------
 -- 3. سجل الأحداث (Event Log)
 --    كل وكيل يرسل أحداثه هنا — مصدر الحقيقة الوحيد
+--    Partitioned by day (created_at) by cortex_migrations/002 —
+--    run scripts/db/apply_cortex_migrations.sh after this file
 -- ---------------------------------------------------------------
 CREATE TABLE IF NOT EXISTS nexus_core.events (
   id           BIGSERIAL PRIMARY KEY,
@@ -65,6 +79,9 @@ CREATE TABLE IF NOT EXISTS nexus_core.events (
 CREATE INDEX IF NOT EXISTS idx_events_agent ON nexus_core.events(agent_name);
 CREATE INDEX IF NOT EXISTS idx_events_type  ON nexus_core.events(event_type);
 CREATE INDEX IF NOT EXISTS idx_events_time  ON nexus_core.events(created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_events_keyset ON nexus_core.events(created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_events_agent_keyset ON nexus_core.events(agent_name, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_events_severity_keyset ON nexus_core.events(severity, created_at DESC, id DESC);
 
 -- ---------------------------------------------------------------
 -- 4. الحالة اللحظية للوكلاء (Agent Live State)
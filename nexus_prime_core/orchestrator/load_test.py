@@ -0,0 +1,233 @@
+"""
+═══════════════════════════════════════════════════════════════════════════════
+NEXUS PRIME CORE — Pulse Stream Capacity Load Test
+═══════════════════════════════════════════════════════════════════════════════
+Measures how many concurrent Pulse streams / heartbeats per second the
+Meta-Orchestrator sustains as ORCHESTRATOR_WORKERS grows.
+
+For each worker count it:
+  1. Launches orchestrator_server.py on a scratch port with N workers
+  2. Opens --agents Pulse streams from --client-procs load processes
+  3. Sends heartbeats at --rate Hz per agent for --duration seconds
+  4. Counts heartbeat ACKs and pulse→ACK latency
+
+Requires a reachable Redis (REDIS_URL). Cortex is not needed — the bridge
+degrades to logged failures, which is what we want for a capacity test.
+
+Usage:
+    REDIS_URL=redis://localhost:6379/0 python load_test.py --workers 1,2,4 \\
+        --agents 2000 --rate 2 --duration 20
+═══════════════════════════════════════════════════════════════════════════════
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+import grpc
+import nexus_pulse_pb2 as pb
+import nexus_pulse_pb2_grpc as pb_grpc
+
+
+SERVER_SCRIPT = os.path.join(os.path.dirname(__file__), "orchestrator_server.py")
+
+
+# ═════════════════════════════════════════════════════════════════════════════
+# LOAD CLIENT — runs inside each client process
+# ═════════════════════════════════════════════════════════════════════════════
+
+async def _agent_stream(host: str, agent_id: str, rate: float, duration: float,
+                        stats: dict, latencies: list):
+    """One simulated agent: open a Pulse stream and heartbeat at `rate` Hz."""
+    sent_at = {}
+    channel = grpc.aio.insecure_channel(host)
+    stub = pb_grpc.NexusPulseServiceStub(channel)
+
+    async def _pulses():
+        deadline = time.monotonic() + duration
+        seq = 0
+        while time.monotonic() < deadline:
+            seq += 1
+            sent_at[str(seq)] = time.perf_counter()
+            yield pb.AgentPulse(
+                agent_id=agent_id,
+                pulse_type=pb.PULSE_TYPE_HEARTBEAT,
+                state=pb.AgentState(status=pb.AGENT_STATUS_IDLE),
+                sequence_number=seq,
+            )
+            stats["sent"] += 1
+            await asyncio.sleep(1.0 / rate)
+
+    try:
+        stream = stub.Pulse(_pulses())
+        connected = False
+        async for directive in stream:
+            if not connected:
+                connected = True
+                stats["streams"] += 1
+            t0 = sent_at.pop(directive.ack_for_pulse_id, None)
+            if t0 is not None:
+                stats["acked"] += 1
+                latencies.append((time.perf_counter() - t0) * 1000)
+    except grpc.aio.AioRpcError:
+        stats["errors"] += 1
+    finally:
+        await channel.close()
+
+
+async def _client_main(host: str, agent_ids: list, rate: float, duration: float) -> dict:
+    stats = {"streams": 0, "sent": 0, "acked": 0, "errors": 0}
+    latencies: list = []
+    # Stagger connects over one heartbeat period to avoid a synthetic thundering herd
+    tasks = []
+    for i, agent_id in enumerate(agent_ids):
+        tasks.append(asyncio.create_task(
+            _agent_stream(host, agent_id, rate, duration, stats, latencies)
+        ))
+        if i % 50 == 49:
+            await asyncio.sleep(0.01)
+    await asyncio.wait_for(asyncio.gather(*tasks, return_exceptions=True),
+                           timeout=duration + 30)
+    stats["latencies"] = latencies
+    return stats
+
+
+def _client_proc(host, agent_ids, rate, duration, out_queue):
+    out_queue.put(asyncio.run(_client_main(host, agent_ids, rate, duration)))
+
+
+# ═════════════════════════════════════════════════════════════════════════════
+# SERVER LIFECYCLE
+# ═════════════════════════════════════════════════════════════════════════════
+
+def _start_server(port: int, workers: int) -> subprocess.Popen:
+    env = dict(os.environ)
+    env.update({
+        "GRPC_PORT": str(port),
+        "ORCHESTRATOR_WORKERS": str(workers),
+        "CORTEX_URL": env.get("LOAD_TEST_CORTEX_URL", "http://127.0.0.1:9"),
+        "PYTHONUNBUFFERED": "1",
+    })
+    return subprocess.Popen(
+        [sys.executable, SERVER_SCRIPT],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+
+
+async def _wait_ready(host: str, timeout: float = 20.0):
+    channel = grpc.aio.insecure_channel(host)
+    try:
+        await asyncio.wait_for(channel.channel_ready(), timeout=timeout)
+    finally:
+        await channel.close()
+    # Give the remaining workers a moment to bind
+    await asyncio.sleep(1.0)
+
+
+def _percentile(values: list, pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def run_scenario(workers: int, args) -> dict:
+    host = f"localhost:{args.port}"
+    server = _start_server(args.port, workers)
+    try:
+        asyncio.run(_wait_ready(host))
+
+        ctx = multiprocessing.get_context("spawn")
+        out_queue = ctx.Queue()
+        agent_ids = [f"LOAD-{workers}W-{i:05d}" for i in range(args.agents)]
+        shards = [agent_ids[i::args.client_procs] for i in range(args.client_procs)]
+        procs = [
+            ctx.Process(target=_client_proc,
+                        args=(host, shard, args.rate, args.duration, out_queue))
+            for shard in shards if shard
+        ]
+
+        t0 = time.monotonic()
+        for p in procs:
+            p.start()
+        partials = [out_queue.get() for _ in procs]
+        for p in procs:
+            p.join()
+        elapsed = time.monotonic() - t0
+    finally:
+        server.terminate()
+        try:
+            server.wait(timeout=15)
+        except subprocess.TimeoutExpired:
+            server.kill()
+
+    latencies = [l for part in partials for l in part["latencies"]]
+    acked = sum(p["acked"] for p in partials)
+    sent = sum(p["sent"] for p in partials)
+    return {
+        "workers": workers,
+        "agents": args.agents,
+        "streams_established": sum(p["streams"] for p in partials),
+        "stream_errors": sum(p["errors"] for p in partials),
+        "pulses_sent": sent,
+        "pulses_acked": acked,
+        "ack_ratio": round(acked / sent, 4) if sent else 0.0,
+        "acked_per_sec": round(acked / args.duration, 1),
+        "latency_p50_ms": round(_percentile(latencies, 50), 2),
+        "latency_p99_ms": round(_percentile(latencies, 99), 2),
+        "wall_time_s": round(elapsed, 1),
+    }
+
+
+# ═════════════════════════════════════════════════════════════════════════════
+# MAIN
+# ═════════════════════════════════════════════════════════════════════════════
+
+def main():
+    parser = argparse.ArgumentParser(description="Pulse stream capacity vs worker count")
+    parser.add_argument("--workers", default="1,2,4",
+                        help="comma-separated ORCHESTRATOR_WORKERS values")
+    parser.add_argument("--agents", type=int, default=1000)
+    parser.add_argument("--rate", type=float, default=2.0, help="heartbeats/s per agent")
+    parser.add_argument("--duration", type=float, default=20.0, help="seconds per scenario")
+    parser.add_argument("--client-procs", type=int,
+                        default=max(1, (os.cpu_count() or 2) // 2))
+    parser.add_argument("--port", type=int, default=50151)
+    parser.add_argument("--output", default="/tmp/nexus_pulse_load_test.json")
+    args = parser.parse_args()
+
+    print("═" * 70)
+    print("  NEXUS PRIME — Pulse Stream Capacity Load Test")
+    print(f"  Agents: {args.agents} @ {args.rate} Hz | Duration: {args.duration}s "
+          f"| Client procs: {args.client_procs}")
+    print("═" * 70)
+
+    results = []
+    for workers in [int(w) for w in args.workers.split(",") if w]:
+        r = run_scenario(workers, args)
+        results.append(r)
+        print(f"  workers={r['workers']:<2} streams={r['streams_established']:<6} "
+              f"acked/s={r['acked_per_sec']:<9} ack_ratio={r['ack_ratio']:<6} "
+              f"p50={r['latency_p50_ms']}ms p99={r['latency_p99_ms']}ms")
+
+    base = results[0]["acked_per_sec"] if results and results[0]["acked_per_sec"] else None
+    if base:
+        for r in results:
+            r["scaling_vs_first"] = round(r["acked_per_sec"] / base, 2)
+        print("\n  Scaling: " + ", ".join(
+            f"{r['workers']}w={r['scaling_vs_first']}x" for r in results))
+
+    with open(args.output, "w") as f:
+        json.dump({"config": vars(args), "results": results}, f, indent=2)
+    print(f"\n  📄 JSON report saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
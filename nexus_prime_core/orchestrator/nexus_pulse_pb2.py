@@ -27,7 +27,7 @@ from google.protobuf import struct_pb2 as google_dot_protobuf_dot_struct__pb2
 from google.protobuf import empty_pb2 as google_dot_protobuf_dot_empty__pb2
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x11nexus_pulse.proto\x12\x0bnexus.prime\x1a\x1fgoogle/protobuf/timestamp.proto\x1a\x1cgoogle/protobuf/struct.proto\x1a\x1bgoogle/protobuf/empty.proto\"\xbc\x02\n\x0c\x41gentMetrics\x12\x19\n\x11\x63pu_usage_percent\x18\x01 \x01(\x01\x12\x1c\n\x14memory_usage_percent\x18\x02 \x01(\x01\x12\x1a\n\x12request_latency_ms\x18\x03 \x01(\x01\x12\x14\n\x0c\x61\x63tive_tasks\x18\x04 \x01(\x03\x12\x17\n\x0f\x63ompleted_tasks\x18\x05 \x01(\x03\x12\x14\n\x0c\x66\x61iled_tasks\x18\x06 \x01(\x03\x12\x16\n\x0euptime_seconds\x18\x07 \x01(\x01\x12\x44\n\x0e\x63ustom_metrics\x18\x08 \x03(\x0b\x32,.nexus.prime.AgentMetrics.CustomMetricsEntry\x1a\x34\n\x12\x43ustomMetricsEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\x01:\x02\x38\x01\"\xa8\x01\n\nAgentState\x12(\n\x06status\x18\x01 \x01(\x0e\x32\x18.nexus.prime.AgentStatus\x12\x14\n\x0c\x63urrent_task\x18\x02 \x01(\t\x12*\n\x07metrics\x18\x03 \x01(\x0b\x32\x19.nexus.prime.AgentMetrics\x12.\n\nlast_pulse\x18\x04 \x01(\x0b\x32\x1a.google.protobuf.Timestamp\"\xa7\x01\n\x0b\x41gentIntent\x12\x18\n\x10requested_action\x18\x01 \x01(\t\x12\x14\n\x0ctarget_agent\x18\x02 \x01(\t\x12\x10\n\x08priority\x18\x03 \x01(\x05\x12(\n\x07payload\x18\x04 \x01(\x0b\x32\x17.google.protobuf.Struct\x12,\n\x08\x64\x65\x61\x64line\x18\x05 \x01(\x0b\x32\x1a.google.protobuf.Timestamp\"\xbd\x01\n\nTaskResult\x12\x12\n\ncommand_id\x18\x01 \x01(\t\x12\'\n\x06status\x18\x02 \x01(\x0e\x32\x17.nexus.prime.TaskStatus\x12\'\n\x06output\x18\x03 \x01(\x0b\x32\x17.google.protobuf.Struct\x12\x15\n\rerror_message\x18\x04 \x01(\t\x12\x19\n\x11\x65xecution_time_ms\x18\x05 \x01(\x03\x12\x17\n\x0f\x65xecuting_agent\x18\x06 \x01(\t\"\xda\x01\n\x0bTaskCommand\x12\x12\n\ncommand_id\x18\x01 \x01(\t\x12\x14\n\x0c\x63ommand_type\x18\x02 \x01(\t\x12\x0e\n\x06origin\x18\x03 \x01(\t\x12(\n\x07payload\x18\x04 \x01(\x0b\x32\x17.google.protobuf.Struct\x12\x10\n\x08priority\x18\x05 \x01(\x05\x12,\n\x08\x64\x65\x61\x64line\x18\x06 \x01(\x0b\x32\x1a.google.protobuf.Timestamp\x12\x13\n\x0bmax_retries\x18\x07 \x01(\x05\x12\x12\n\ntimeout_ms\x18\x08 \x01(\x03\"j\n\x0bRoutingInfo\x12\x14\n\x0ctarget_agent\x18\x01 \x01(\t\x12\x17\n\x0f\x66\x61llback_agents\x18\x02 \x03(\t\x12\x13\n\x0bmax_retries\x18\x03 \x01(\x05\x12\x17\n\x0frouting_rule_id\x18\x04 \x01(\t\"\xd5\x03\n\nAgentPulse\x12\x10\n\x08\x61gent_id\x18\x01 \x01(\t\x12*\n\npulse_type\x18\x02 \x01(\x0e\x32\x16.nexus.prime.PulseType\x12-\n\ttimestamp\x18\x03 \x01(\x0b\x32\x1a.google.protobuf.Timestamp\x12&\n\x05state\x18\x04 \x01(\x0b\x32\x17.nexus.prime.AgentState\x12(\n\x06intent\x18\x05 \x01(\x0b\x32\x18.nexus.prime.AgentIntent\x12\'\n\x06result\x18\x06 \x01(\x0b\x32\x17.nexus.prime.TaskResult\x12\x14\n\x0c\x63\x61pabilities\x18\x07 \x03(\t\x12\x10\n\x08\x65ndpoint\x18\x08 \x01(\t\x12*\n\nagent_type\x18\t \x01(\x0e\x32\x16.nexus.prime.AgentType\x12\x14\n\x0c\x64isplay_name\x18\n \x01(\t\x12\x12\n\nerror_code\x18\x0b \x01(\t\x12\x15\n\rerror_message\x18\x0c \x01(\t\x12\x19\n\x11\x65rror_stack_trace\x18\r \x01(\t\x12\x17\n\x0fsequence_number\x18\x0e \x01(\x03\x12\x16\n\x0e\x63orrelation_id\x18\x0f \x01(\t\"\x9e\x03\n\x15OrchestratorDirective\x12\x14\n\x0c\x64irective_id\x18\x01 \x01(\t\x12\x32\n\x0e\x64irective_type\x18\x02 \x01(\x0e\x32\x1a.nexus.prime.DirectiveType\x12-\n\ttimestamp\x18\x03 \x01(\x0b\x32\x1a.google.protobuf.Timestamp\x12)\n\x07\x63ommand\x18\x04 \x01(\x0b\x32\x18.nexus.prime.TaskCommand\x12)\n\x07routing\x18\x05 \x01(\x0b\x32\x18.nexus.prime.RoutingInfo\x12\x31\n\x0csystem_state\x18\x06 \x01(\x0b\x32\x1b.nexus.prime.SystemSnapshot\x12\'\n\x06\x63onfig\x18\x07 \x01(\x0b\x32\x17.google.protobuf.Struct\x12\x18\n\x10\x61\x63k_for_pulse_id\x18\x08 \x01(\t\x12\x0f\n\x07message\x18\t \x01(\t\x12\x17\n\x0fsequence_number\x18\n \x01(\x03\x12\x16\n\x0e\x63orrelation_id\x18\x0b \x01(\t\"\xfc\x01\n\x11\x41gentRegistration\x12\x0c\n\x04name\x18\x01 \x01(\t\x12\x14\n\x0c\x64isplay_name\x18\x02 \x01(\t\x12*\n\nagent_type\x18\x03 \x01(\x0e\x32\x16.nexus.prime.AgentType\x12\x14\n\x0c\x63\x61pabilities\x18\x04 \x03(\t\x12\x10\n\x08\x65ndpoint\x18\x05 \x01(\t\x12>\n\x08metadata\x18\x06 \x03(\x0b\x32,.nexus.prime.AgentRegistration.MetadataEntry\x1a/\n\rMetadataEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\"\xab\x01\n\x0fRegistrationAck\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x10\n\x08\x61gent_id\x18\x02 \x01(\t\x12\x0f\n\x07message\x18\x03 \x01(\t\x12\x31\n\rregistered_at\x18\x04 \x01(\x0b\x32\x1a.google.protobuf.Timestamp\x12\x31\n\x0csystem_state\x18\x05 \x01(\x0b\x32\x1b.nexus.prime.SystemSnapshot\"\x81\x01\n\nCommandAck\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x12\n\ncommand_id\x18\x02 \x01(\t\x12\x14\n\x0ctarget_agent\x18\x03 \x01(\t\x12\'\n\x06status\x18\x04 \x01(\x0e\x32\x17.nexus.prime.TaskStatus\x12\x0f\n\x07message\x18\x05 \x01(\t\"\x87\x02\n\x0eSystemSnapshot\x12\x15\n\ronline_agents\x18\x01 \x01(\x05\x12\x14\n\x0ctotal_agents\x18\x02 \x01(\x05\x12\x17\n\x0fqueued_commands\x18\x03 \x01(\x05\x12\x18\n\x10running_commands\x18\x04 \x01(\x05\x12\x1b\n\x13\x63luster_cpu_percent\x18\x05 \x01(\x01\x12\x1e\n\x16\x63luster_memory_percent\x18\x06 \x01(\x01\x12-\n\ttimestamp\x18\x07 \x01(\x0b\x32\x1a.google.protobuf.Timestamp\x12)\n\x06\x61gents\x18\x08 \x03(\x0b\x32\x19.nexus.prime.AgentSummary\"\xe3\x01\n\x0c\x41gentSummary\x12\x0c\n\x04name\x18\x01 \x01(\t\x12\x14\n\x0c\x64isplay_name\x18\x02 \x01(\t\x12(\n\x06status\x18\x03 \x01(\x0e\x32\x18.nexus.prime.AgentStatus\x12*\n\nagent_type\x18\x04 \x01(\x0e\x32\x16.nexus.prime.AgentType\x12-\n\tlast_seen\x18\x05 \x01(\x0b\x32\x1a.google.protobuf.Timestamp\x12\x14\n\x0c\x63urrent_task\x18\x06 \x01(\t\x12\x14\n\x0c\x63\x61pabilities\x18\x07 \x03(\t*\xc0\x01\n\x0b\x41gentStatus\x12\x1c\n\x18\x41GENT_STATUS_UNSPECIFIED\x10\x00\x12\x15\n\x11\x41GENT_STATUS_IDLE\x10\x01\x12\x15\n\x11\x41GENT_STATUS_BUSY\x10\x02\x12\x16\n\x12\x41GENT_STATUS_ERROR\x10\x03\x12\x18\n\x14\x41GENT_STATUS_OFFLINE\x10\x04\x12\x18\n\x14\x41GENT_STATUS_BOOTING\x10\x05\x12\x19\n\x15\x41GENT_STATUS_DRAINING\x10\x06*\xc4\x01\n\tPulseType\x12\x1a\n\x16PULSE_TYPE_UNSPECIFIED\x10\x00\x12\x18\n\x14PULSE_TYPE_HEARTBEAT\x10\x01\x12\x1b\n\x17PULSE_TYPE_STATE_UPDATE\x10\x02\x12\x1a\n\x16PULSE_TYPE_TASK_RESULT\x10\x03\x12\x14\n\x10PULSE_TYPE_ERROR\x10\x04\x12\x1b\n\x17PULSE_TYPE_REGISTRATION\x10\x05\x12\x15\n\x11PULSE_TYPE_INTENT\x10\x06*\xdd\x01\n\rDirectiveType\x12\x1e\n\x1a\x44IRECTIVE_TYPE_UNSPECIFIED\x10\x00\x12\x1f\n\x1b\x44IRECTIVE_TYPE_EXECUTE_TASK\x10\x01\x12\x1e\n\x1a\x44IRECTIVE_TYPE_RECONFIGURE\x10\x02\x12\x18\n\x14\x44IRECTIVE_TYPE_SCALE\x10\x03\x12\x1b\n\x17\x44IRECTIVE_TYPE_SHUTDOWN\x10\x04\x12\x16\n\x12\x44IRECTIVE_TYPE_ACK\x10\x05\x12\x1c\n\x18\x44IRECTIVE_TYPE_BROADCAST\x10\x06*\xd9\x01\n\nTaskStatus\x12\x1b\n\x17TASK_STATUS_UNSPECIFIED\x10\x00\x12\x16\n\x12TASK_STATUS_QUEUED\x10\x01\x12\x1a\n\x16TASK_STATUS_DISPATCHED\x10\x02\x12\x17\n\x13TASK_STATUS_RUNNING\x10\x03\x12\x17\n\x13TASK_STATUS_SUCCESS\x10\x04\x12\x16\n\x12TASK_STATUS_FAILED\x10\x05\x12\x17\n\x13TASK_STATUS_PARTIAL\x10\x06\x12\x17\n\x13TASK_STATUS_TIMEOUT\x10\x07*\x82\x01\n\tAgentType\x12\x1a\n\x16\x41GENT_TYPE_UNSPECIFIED\x10\x00\x12\x15\n\x11\x41GENT_TYPE_PLANET\x10\x01\x12\x16\n\x12\x41GENT_TYPE_SERVICE\x10\x02\x12\x14\n\x10\x41GENT_TYPE_HUMAN\x10\x03\x12\x14\n\x10\x41GENT_TYPE_SWARM\x10\x04\x32\xb8\x02\n\x11NexusPulseService\x12H\n\x05Pulse\x12\x17.nexus.prime.AgentPulse\x1a\".nexus.prime.OrchestratorDirective(\x01\x30\x01\x12M\n\rRegisterAgent\x12\x1e.nexus.prime.AgentRegistration\x1a\x1c.nexus.prime.RegistrationAck\x12\x42\n\rSubmitCommand\x12\x18.nexus.prime.TaskCommand\x1a\x17.nexus.prime.CommandAck\x12\x46\n\x0fGetSystemStatus\x12\x16.google.protobuf.Empty\x1a\x1b.nexus.prime.SystemSnapshotb\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x11nexus_pulse.proto\x12\x0bnexus.prime\x1a\x1fgoogle/protobuf/timestamp.proto\x1a\x1cgoogle/protobuf/struct.proto\x1a\x1bgoogle/protobuf/empty.proto\"\xbc\x02\n\x0c\x41gentMetrics\x12\x19\n\x11\x63pu_usage_percent\x18\x01 \x01(\x01\x12\x1c\n\x14memory_usage_percent\x18\x02 \x01(\x01\x12\x1a\n\x12request_latency_ms\x18\x03 \x01(\x01\x12\x14\n\x0c\x61\x63tive_tasks\x18\x04 \x01(\x03\x12\x17\n\x0f\x63ompleted_tasks\x18\x05 \x01(\x03\x12\x14\n\x0c\x66\x61iled_tasks\x18\x06 \x01(\x03\x12\x16\n\x0euptime_seconds\x18\x07 \x01(\x01\x12\x44\n\x0e\x63ustom_metrics\x18\x08 \x03(\x0b\x32,.nexus.prime.AgentMetrics.CustomMetricsEntry\x1a\x34\n\x12\x43ustomMetricsEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\x01:\x02\x38\x01\"\xa8\x01\n\nAgentState\x12(\n\x06status\x18\x01 \x01(\x0e\x32\x18.nexus.prime.AgentStatus\x12\x14\n\x0c\x63urrent_task\x18\x02 \x01(\t\x12*\n\x07metrics\x18\x03 \x01(\x0b\x32\x19.nexus.prime.AgentMetrics\x12.\n\nlast_pulse\x18\x04 \x01(\x0b\x32\x1a.google.protobuf.Timestamp\"\xa7\x01\n\x0b\x41gentIntent\x12\x18\n\x10requested_action\x18\x01 \x01(\t\x12\x14\n\x0ctarget_agent\x18\x02 \x01(\t\x12\x10\n\x08priority\x18\x03 \x01(\x05\x12(\n\x07payload\x18\x04 \x01(\x0b\x32\x17.google.protobuf.Struct\x12,\n\x08\x64\x65\x61\x64line\x18\x05 \x01(\x0b\x32\x1a.google.protobuf.Timestamp\"\xbd\x01\n\nTaskResult\x12\x12\n\ncommand_id\x18\x01 \x01(\t\x12\'\n\x06status\x18\x02 \x01(\x0e\x32\x17.nexus.prime.TaskStatus\x12\'\n\x06output\x18\x03 \x01(\x0b\x32\x17.google.protobuf.Struct\x12\x15\n\rerror_message\x18\x04 \x01(\t\x12\x19\n\x11\x65xecution_time_ms\x18\x05 \x01(\x03\x12\x17\n\x0f\x65xecuting_agent\x18\x06 \x01(\t\"\xda\x01\n\x0bTaskCommand\x12\x12\n\ncommand_id\x18\x01 \x01(\t\x12\x14\n\x0c\x63ommand_type\x18\x02 \x01(\t\x12\x0e\n\x06origin\x18\x03 \x01(\t\x12(\n\x07payload\x18\x04 \x01(\x0b\x32\x17.google.protobuf.Struct\x12\x10\n\x08priority\x18\x05 \x01(\x05\x12,\n\x08\x64\x65\x61\x64line\x18\x06 \x01(\x0b\x32\x1a.google.protobuf.Timestamp\x12\x13\n\x0bmax_retries\x18\x07 \x01(\x05\x12\x12\n\ntimeout_ms\x18\x08 \x01(\x03\"j\n\x0bRoutingInfo\x12\x14\n\x0ctarget_agent\x18\x01 \x01(\t\x12\x17\n\x0f\x66\x61llback_agents\x18\x02 \x03(\t\x12\x13\n\x0bmax_retries\x18\x03 \x01(\x05\x12\x17\n\x0frouting_rule_id\x18\x04 \x01(\t\"\xd5\x03\n\nAgentPulse\x12\x10\n\x08\x61gent_id\x18\x01 \x01(\t\x12*\n\npulse_type\x18\x02 \x01(\x0e\x32\x16.nexus.prime.PulseType\x12-\n\ttimestamp\x18\x03 \x01(\x0b\x32\x1a.google.protobuf.Timestamp\x12&\n\x05state\x18\x04 \x01(\x0b\x32\x17.nexus.prime.AgentState\x12(\n\x06intent\x18\x05 \x01(\x0b\x32\x18.nexus.prime.AgentIntent\x12\'\n\x06result\x18\x06 \x01(\x0b\x32\x17.nexus.prime.TaskResult\x12\x14\n\x0c\x63\x61pabilities\x18\x07 \x03(\t\x12\x10\n\x08\x65ndpoint\x18\x08 \x01(\t\x12*\n\nagent_type\x18\t \x01(\x0e\x32\x16.nexus.prime.AgentType\x12\x14\n\x0c\x64isplay_name\x18\n \x01(\t\x12\x12\n\nerror_code\x18\x0b \x01(\t\x12\x15\n\rerror_message\x18\x0c \x01(\t\x12\x19\n\x11\x65rror_stack_trace\x18\r \x01(\t\x12\x17\n\x0fsequence_number\x18\x0e \x01(\x03\x12\x16\n\x0e\x63orrelation_id\x18\x0f \x01(\t\"\x9e\x03\n\x15OrchestratorDirective\x12\x14\n\x0c\x64irective_id\x18\x01 \x01(\t\x12\x32\n\x0e\x64irective_type\x18\x02 \x01(\x0e\x32\x1a.nexus.prime.DirectiveType\x12-\n\ttimestamp\x18\x03 \x01(\x0b\x32\x1a.google.protobuf.Timestamp\x12)\n\x07\x63ommand\x18\x04 \x01(\x0b\x32\x18.nexus.prime.TaskCommand\x12)\n\x07routing\x18\x05 \x01(\x0b\x32\x18.nexus.prime.RoutingInfo\x12\x31\n\x0csystem_state\x18\x06 \x01(\x0b\x32\x1b.nexus.prime.SystemSnapshot\x12\'\n\x06\x63onfig\x18\x07 \x01(\x0b\x32\x17.google.protobuf.Struct\x12\x18\n\x10\x61\x63k_for_pulse_id\x18\x08 \x01(\t\x12\x0f\n\x07message\x18\t \x01(\t\x12\x17\n\x0fsequence_number\x18\n \x01(\x03\x12\x16\n\x0e\x63orrelation_id\x18\x0b \x01(\t\"\xfc\x01\n\x11\x41gentRegistration\x12\x0c\n\x04name\x18\x01 \x01(\t\x12\x14\n\x0c\x64isplay_name\x18\x02 \x01(\t\x12*\n\nagent_type\x18\x03 \x01(\x0e\x32\x16.nexus.prime.AgentType\x12\x14\n\x0c\x63\x61pabilities\x18\x04 \x03(\t\x12\x10\n\x08\x65ndpoint\x18\x05 \x01(\t\x12>\n\x08metadata\x18\x06 \x03(\x0b\x32,.nexus.prime.AgentRegistration.MetadataEntry\x1a/\n\rMetadataEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\"\xab\x01\n\x0fRegistrationAck\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x10\n\x08\x61gent_id\x18\x02 \x01(\t\x12\x0f\n\x07message\x18\x03 \x01(\t\x12\x31\n\rregistered_at\x18\x04 \x01(\x0b\x32\x1a.google.protobuf.Timestamp\x12\x31\n\x0csystem_state\x18\x05 \x01(\x0b\x32\x1b.nexus.prime.SystemSnapshot\"\x81\x01\n\nCommandAck\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x12\n\ncommand_id\x18\x02 \x01(\t\x12\x14\n\x0ctarget_agent\x18\x03 \x01(\t\x12\'\n\x06status\x18\x04 \x01(\x0e\x32\x17.nexus.prime.TaskStatus\x12\x0f\n\x07message\x18\x05 \x01(\t\"\xed\x02\n\x0eSystemSnapshot\x12\x15\n\ronline_agents\x18\x01 \x01(\x05\x12\x14\n\x0ctotal_agents\x18\x02 \x01(\x05\x12\x17\n\x0fqueued_commands\x18\x03 \x01(\x05\x12\x18\n\x10running_commands\x18\x04 \x01(\x05\x12\x1b\n\x13\x63luster_cpu_percent\x18\x05 \x01(\x01\x12\x1e\n\x16\x63luster_memory_percent\x18\x06 \x01(\x01\x12-\n\ttimestamp\x18\x07 \x01(\x0b\x32\x1a.google.protobuf.Timestamp\x12)\n\x06\x61gents\x18\x08 \x03(\x0b\x32\x19.nexus.prime.AgentSummary\x12:\n\x10\x64irective_queues\x18\t \x03(\x0b\x32 .nexus.prime.DirectiveQueueStats\x12(\n\x06reaper\x18\n \x01(\x0b\x32\x18.nexus.prime.ReaperStats\"\xe3\x01\n\x0c\x41gentSummary\x12\x0c\n\x04name\x18\x01 \x01(\t\x12\x14\n\x0c\x64isplay_name\x18\x02 \x01(\t\x12(\n\x06status\x18\x03 \x01(\x0e\x32\x18.nexus.prime.AgentStatus\x12*\n\nagent_type\x18\x04 \x01(\x0e\x32\x16.nexus.prime.AgentType\x12-\n\tlast_seen\x18\x05 \x01(\x0b\x32\x1a.google.protobuf.Timestamp\x12\x14\n\x0c\x63urrent_task\x18\x06 \x01(\t\x12\x14\n\x0c\x63\x61pabilities\x18\x07 \x03(\t\"\x95\x01\n\x13\x44irectiveQueueStats\x12\x10\n\x08\x61gent_id\x18\x01 \x01(\t\x12\r\n\x05\x64\x65pth\x18\x02 \x01(\x05\x12\x10\n\x08\x63\x61pacity\x18\x03 \x01(\x05\x12\x16\n\x0ehigh_watermark\x18\x04 \x01(\x05\x12\x0f\n\x07\x64ropped\x18\x05 \x01(\x03\x12\x11\n\tcoalesced\x18\x06 \x01(\x03\x12\x0f\n\x07lagging\x18\x07 \x01(\x08\"\x99\x01\n\x0bReaperStats\x12\r\n\x05ticks\x18\x01 \x01(\x03\x12\x0e\n\x06reaped\x18\x02 \x01(\x03\x12\x1b\n\x13reap_latency_p50_ms\x18\x03 \x01(\x01\x12\x1b\n\x13reap_latency_p99_ms\x18\x04 \x01(\x01\x12\x1b\n\x13reap_latency_max_ms\x18\x05 \x01(\x01\x12\x14\n\x0clast_tick_ms\x18\x06 \x01(\x01*\xc0\x01\n\x0b\x41gentStatus\x12\x1c\n\x18\x41GENT_STATUS_UNSPECIFIED\x10\x00\x12\x15\n\x11\x41GENT_STATUS_IDLE\x10\x01\x12\x15\n\x11\x41GENT_STATUS_BUSY\x10\x02\x12\x16\n\x12\x41GENT_STATUS_ERROR\x10\x03\x12\x18\n\x14\x41GENT_STATUS_OFFLINE\x10\x04\x12\x18\n\x14\x41GENT_STATUS_BOOTING\x10\x05\x12\x19\n\x15\x41GENT_STATUS_DRAINING\x10\x06*\xc4\x01\n\tPulseType\x12\x1a\n\x16PULSE_TYPE_UNSPECIFIED\x10\x00\x12\x18\n\x14PULSE_TYPE_HEARTBEAT\x10\x01\x12\x1b\n\x17PULSE_TYPE_STATE_UPDATE\x10\x02\x12\x1a\n\x16PULSE_TYPE_TASK_RESULT\x10\x03\x12\x14\n\x10PULSE_TYPE_ERROR\x10\x04\x12\x1b\n\x17PULSE_TYPE_REGISTRATION\x10\x05\x12\x15\n\x11PULSE_TYPE_INTENT\x10\x06*\xdd\x01\n\rDirectiveType\x12\x1e\n\x1a\x44IRECTIVE_TYPE_UNSPECIFIED\x10\x00\x12\x1f\n\x1b\x44IRECTIVE_TYPE_EXECUTE_TASK\x10\x01\x12\x1e\n\x1a\x44IRECTIVE_TYPE_RECONFIGURE\x10\x02\x12\x18\n\x14\x44IRECTIVE_TYPE_SCALE\x10\x03\x12\x1b\n\x17\x44IRECTIVE_TYPE_SHUTDOWN\x10\x04\x12\x16\n\x12\x44IRECTIVE_TYPE_ACK\x10\x05\x12\x1c\n\x18\x44IRECTIVE_TYPE_BROADCAST\x10\x06*\xd9\x01\n\nTaskStatus\x12\x1b\n\x17TASK_STATUS_UNSPECIFIED\x10\x00\x12\x16\n\x12TASK_STATUS_QUEUED\x10\x01\x12\x1a\n\x16TASK_STATUS_DISPATCHED\x10\x02\x12\x17\n\x13TASK_STATUS_RUNNING\x10\x03\x12\x17\n\x13TASK_STATUS_SUCCESS\x10\x04\x12\x16\n\x12TASK_STATUS_FAILED\x10\x05\x12\x17\n\x13TASK_STATUS_PARTIAL\x10\x06\x12\x17\n\x13TASK_STATUS_TIMEOUT\x10\x07*\x82\x01\n\tAgentType\x12\x1a\n\x16\x41GENT_TYPE_UNSPECIFIED\x10\x00\x12\x15\n\x11\x41GENT_TYPE_PLANET\x10\x01\x12\x16\n\x12\x41GENT_TYPE_SERVICE\x10\x02\x12\x14\n\x10\x41GENT_TYPE_HUMAN\x10\x03\x12\x14\n\x10\x41GENT_TYPE_SWARM\x10\x04\x32\xb8\x02\n\x11NexusPulseService\x12H\n\x05Pulse\x12\x17.nexus.prime.AgentPulse\x1a\".nexus.prime.OrchestratorDirective(\x01\x30\x01\x12M\n\rRegisterAgent\x12\x1e.nexus.prime.AgentRegistration\x1a\x1c.nexus.prime.RegistrationAck\x12\x42\n\rSubmitCommand\x12\x18.nexus.prime.TaskCommand\x1a\x17.nexus.prime.CommandAck\x12\x46\n\x0fGetSystemStatus\x12\x16.google.protobuf.Empty\x1a\x1b.nexus.prime.SystemSnapshotb\x06proto3')
 
 _globals = globals()
 _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
@@ -38,16 +38,16 @@ if not _descriptor._USE_C_DESCRIPTORS:
   _globals['_AGENTMETRICS_CUSTOMMETRICSENTRY']._serialized_options = b'8\001'
   _globals['_AGENTREGISTRATION_METADATAENTRY']._loaded_options = None
   _globals['_AGENTREGISTRATION_METADATAENTRY']._serialized_options = b'8\001'
-  _globals['_AGENTSTATUS']._serialized_start=3254
-  _globals['_AGENTSTATUS']._serialized_end=3446
-  _globals['_PULSETYPE']._serialized_start=3449
-  _globals['_PULSETYPE']._serialized_end=3645
-  _globals['_DIRECTIVETYPE']._serialized_start=3648
-  _globals['_DIRECTIVETYPE']._serialized_end=3869
-  _globals['_TASKSTATUS']._serialized_start=3872
-  _globals['_TASKSTATUS']._serialized_end=4089
-  _globals['_AGENTTYPE']._serialized_start=4092
-  _globals['_AGENTTYPE']._serialized_end=4222
+  _globals['_AGENTSTATUS']._serialized_start=3664
+  _globals['_AGENTSTATUS']._serialized_end=3856
+  _globals['_PULSETYPE']._serialized_start=3859
+  _globals['_PULSETYPE']._serialized_end=4055
+  _globals['_DIRECTIVETYPE']._serialized_start=4058
+  _globals['_DIRECTIVETYPE']._serialized_end=4279
+  _globals['_TASKSTATUS']._serialized_start=4282
+  _globals['_TASKSTATUS']._serialized_end=4499
+  _globals['_AGENTTYPE']._serialized_start=4502
+  _globals['_AGENTTYPE']._serialized_end=4632
   _globals['_AGENTMETRICS']._serialized_start=127
   _globals['_AGENTMETRICS']._serialized_end=443
   _globals['_AGENTMETRICS_CUSTOMMETRICSENTRY']._serialized_start=391
@@ -75,9 +75,13 @@ if not _descriptor._USE_C_DESCRIPTORS:
   _globals['_COMMANDACK']._serialized_start=2626
   _globals['_COMMANDACK']._serialized_end=2755
   _globals['_SYSTEMSNAPSHOT']._serialized_start=2758
-  _globals['_SYSTEMSNAPSHOT']._serialized_end=3021
-  _globals['_AGENTSUMMARY']._serialized_start=3024
-  _globals['_AGENTSUMMARY']._serialized_end=3251
-  _globals['_NEXUSPULSESERVICE']._serialized_start=4225
-  _globals['_NEXUSPULSESERVICE']._serialized_end=4537
+  _globals['_SYSTEMSNAPSHOT']._serialized_end=3123
+  _globals['_AGENTSUMMARY']._serialized_start=3126
+  _globals['_AGENTSUMMARY']._serialized_end=3353
+  _globals['_DIRECTIVEQUEUESTATS']._serialized_start=3356
+  _globals['_DIRECTIVEQUEUESTATS']._serialized_end=3505
+  _globals['_REAPERSTATS']._serialized_start=3508
+  _globals['_REAPERSTATS']._serialized_end=3661
+  _globals['_NEXUSPULSESERVICE']._serialized_start=4635
+  _globals['_NEXUSPULSESERVICE']._serialized_end=4947
 # @@protoc_insertion_point(module_scope)
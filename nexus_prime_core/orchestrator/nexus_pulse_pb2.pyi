@@ -305,7 +305,7 @@ class CommandAck(_message.Message):
     def __init__(self, success: bool = ..., command_id: _Optional[str] = ..., target_agent: _Optional[str] = ..., status: _Optional[_Union[TaskStatus, str]] = ..., message: _Optional[str] = ...) -> None: ...
 
 class SystemSnapshot(_message.Message):
-    __slots__ = ("online_agents", "total_agents", "queued_commands", "running_commands", "cluster_cpu_percent", "cluster_memory_percent", "timestamp", "agents")
+    __slots__ = ("online_agents", "total_agents", "queued_commands", "running_commands", "cluster_cpu_percent", "cluster_memory_percent", "timestamp", "agents", "directive_queues", "reaper")
     ONLINE_AGENTS_FIELD_NUMBER: _ClassVar[int]
     TOTAL_AGENTS_FIELD_NUMBER: _ClassVar[int]
     QUEUED_COMMANDS_FIELD_NUMBER: _ClassVar[int]
@@ -314,6 +314,8 @@ class SystemSnapshot(_message.Message):
     CLUSTER_MEMORY_PERCENT_FIELD_NUMBER: _ClassVar[int]
     TIMESTAMP_FIELD_NUMBER: _ClassVar[int]
     AGENTS_FIELD_NUMBER: _ClassVar[int]
+    DIRECTIVE_QUEUES_FIELD_NUMBER: _ClassVar[int]
+    REAPER_FIELD_NUMBER: _ClassVar[int]
     online_agents: int
     total_agents: int
     queued_commands: int
@@ -322,7 +324,9 @@ class SystemSnapshot(_message.Message):
     cluster_memory_percent: float
     timestamp: _timestamp_pb2.Timestamp
     agents: _containers.RepeatedCompositeFieldContainer[AgentSummary]
-    def __init__(self, online_agents: _Optional[int] = ..., total_agents: _Optional[int] = ..., queued_commands: _Optional[int] = ..., running_commands: _Optional[int] = ..., cluster_cpu_percent: _Optional[float] = ..., cluster_memory_percent: _Optional[float] = ..., timestamp: _Optional[_Union[_timestamp_pb2.Timestamp, _Mapping]] = ..., agents: _Optional[_Iterable[_Union[AgentSummary, _Mapping]]] = ...) -> None: ...
+    directive_queues: _containers.RepeatedCompositeFieldContainer[DirectiveQueueStats]
+    reaper: ReaperStats
+    def __init__(self, online_agents: _Optional[int] = ..., total_agents: _Optional[int] = ..., queued_commands: _Optional[int] = ..., running_commands: _Optional[int] = ..., cluster_cpu_percent: _Optional[float] = ..., cluster_memory_percent: _Optional[float] = ..., timestamp: _Optional[_Union[_timestamp_pb2.Timestamp, _Mapping]] = ..., agents: _Optional[_Iterable[_Union[AgentSummary, _Mapping]]] = ..., directive_queues: _Optional[_Iterable[_Union[DirectiveQueueStats, _Mapping]]] = ..., reaper: _Optional[_Union[ReaperStats, _Mapping]] = ...) -> None: ...
 
 class AgentSummary(_message.Message):
     __slots__ = ("name", "display_name", "status", "agent_type", "last_seen", "current_task", "capabilities")
@@ -341,3 +345,37 @@ class AgentSummary(_message.Message):
     current_task: str
     capabilities: _containers.RepeatedScalarFieldContainer[str]
     def __init__(self, name: _Optional[str] = ..., display_name: _Optional[str] = ..., status: _Optional[_Union[AgentStatus, str]] = ..., agent_type: _Optional[_Union[AgentType, str]] = ..., last_seen: _Optional[_Union[_timestamp_pb2.Timestamp, _Mapping]] = ..., current_task: _Optional[str] = ..., capabilities: _Optional[_Iterable[str]] = ...) -> None: ...
+
+class DirectiveQueueStats(_message.Message):
+    __slots__ = ("agent_id", "depth", "capacity", "high_watermark", "dropped", "coalesced", "lagging")
+    AGENT_ID_FIELD_NUMBER: _ClassVar[int]
+    DEPTH_FIELD_NUMBER: _ClassVar[int]
+    CAPACITY_FIELD_NUMBER: _ClassVar[int]
+    HIGH_WATERMARK_FIELD_NUMBER: _ClassVar[int]
+    DROPPED_FIELD_NUMBER: _ClassVar[int]
+    COALESCED_FIELD_NUMBER: _ClassVar[int]
+    LAGGING_FIELD_NUMBER: _ClassVar[int]
+    agent_id: str
+    depth: int
+    capacity: int
+    high_watermark: int
+    dropped: int
+    coalesced: int
+    lagging: bool
+    def __init__(self, agent_id: _Optional[str] = ..., depth: _Optional[int] = ..., capacity: _Optional[int] = ..., high_watermark: _Optional[int] = ..., dropped: _Optional[int] = ..., coalesced: _Optional[int] = ..., lagging: bool = ...) -> None: ...
+
+class ReaperStats(_message.Message):
+    __slots__ = ("ticks", "reaped", "reap_latency_p50_ms", "reap_latency_p99_ms", "reap_latency_max_ms", "last_tick_ms")
+    TICKS_FIELD_NUMBER: _ClassVar[int]
+    REAPED_FIELD_NUMBER: _ClassVar[int]
+    REAP_LATENCY_P50_MS_FIELD_NUMBER: _ClassVar[int]
+    REAP_LATENCY_P99_MS_FIELD_NUMBER: _ClassVar[int]
+    REAP_LATENCY_MAX_MS_FIELD_NUMBER: _ClassVar[int]
+    LAST_TICK_MS_FIELD_NUMBER: _ClassVar[int]
+    ticks: int
+    reaped: int
+    reap_latency_p50_ms: float
+    reap_latency_p99_ms: float
+    reap_latency_max_ms: float
+    last_tick_ms: float
+    def __init__(self, ticks: _Optional[int] = ..., reaped: _Optional[int] = ..., reap_latency_p50_ms: _Optional[float] = ..., reap_latency_p99_ms: _Optional[float] = ..., reap_latency_max_ms: _Optional[float] = ..., last_tick_ms: _Optional[float] = ...) -> None: ...
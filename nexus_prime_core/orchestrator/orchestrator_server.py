@@ -13,16 +13,20 @@ Port: 50051  |  Protocol: gRPC (HTTP/2)  |  Async: uvloop + grpc.aio
 """
 
 import asyncio
+import base64
+import itertools
 import json
 import logging
+import multiprocessing
 import os
-import random
 import signal
+import socket
 import sys
 import time
 import uuid
+from collections import defaultdict, deque
 from datetime import datetime, timezone
-from typing import Dict, Optional, Set
+from typing import Dict, Optional, Set, Tuple
 
 import grpc
 from grpc_reflection.v1alpha import reflection
@@ -43,13 +47,102 @@ REDIS_URL    = os.getenv("REDIS_URL", "redis://nexus_redis:6379/0")
 GRPC_PORT    = int(os.getenv("GRPC_PORT", "50051"))
 MAX_WORKERS  = int(os.getenv("MAX_WORKERS", "10"))
 
+# Multi-process mode: N worker processes share GRPC_PORT via SO_REUSEPORT and
+# route directives to each other through the Redis agent→worker registry
+ORCHESTRATOR_WORKERS = int(os.getenv("ORCHESTRATOR_WORKERS", "1"))
+
 # Staleness: if no pulse in N seconds, mark agent offline
 STALENESS_THRESHOLD_SEC = int(os.getenv("STALENESS_THRESHOLD", "60"))
 STALENESS_CHECK_INTERVAL = int(os.getenv("STALENESS_CHECK_INTERVAL", "15"))
+# Timer-wheel slot width: agents are reaped at most this late after their
+# deadline (on top of the check interval); ticks only touch expiring slots
+STALENESS_WHEEL_RESOLUTION = float(os.getenv("STALENESS_WHEEL_RESOLUTION", "1.0"))
+
+# Per-agent outbound directive queue: capacity, overflow policy
+# ("coalesce_ack" evicts ACKs before tasks, "drop_oldest" evicts FIFO) and the
+# fill ratio above which an agent counts as lagging (heartbeat ACKs are skipped)
+DIRECTIVE_QUEUE_SIZE = int(os.getenv("DIRECTIVE_QUEUE_SIZE", "100"))
+DIRECTIVE_OVERFLOW_POLICY = os.getenv("DIRECTIVE_OVERFLOW_POLICY", "coalesce_ack")
+DIRECTIVE_LAG_RATIO = float(os.getenv("DIRECTIVE_LAG_RATIO", "0.8"))
+
+# SystemSnapshot cache: Cortex is re-read at most once per staleness window
+# (single-flight); local connect/heartbeat events are applied in between
+SNAPSHOT_MAX_STALENESS_SEC = float(os.getenv("SNAPSHOT_MAX_STALENESS", "10"))
+SNAPSHOT_REBUILD_INTERVAL_SEC = float(os.getenv("SNAPSHOT_REBUILD_INTERVAL", "1.0"))
+
+# Redis Streams command consumer: messages per XREADGROUP, independent targets
+# dispatched concurrently, stream cap (MAXLEN ~) and pending-entry recovery —
+# entries idle longer than STREAM_CLAIM_IDLE_MS (crashed pod, failed dispatch)
+# are XAUTOCLAIMed every STREAM_CLAIM_INTERVAL seconds
+STREAM_BATCH_SIZE = int(os.getenv("STREAM_BATCH_SIZE", "200"))
+STREAM_CONCURRENCY = int(os.getenv("STREAM_CONCURRENCY", "32"))
+STREAM_MAXLEN = int(os.getenv("STREAM_MAXLEN", "10000"))
+STREAM_CLAIM_IDLE_MS = int(os.getenv("STREAM_CLAIM_IDLE_MS", "30000"))
+STREAM_CLAIM_INTERVAL = float(os.getenv("STREAM_CLAIM_INTERVAL", "15"))
+STREAM_MAX_RETRIES = int(os.getenv("STREAM_MAX_RETRIES", "3"))
+# Consumer names are unique per process, so restarted pods leave their old
+# names in the group; ones idle this long with nothing pending are deleted
+STREAM_CONSUMER_PRUNE_MS = int(os.getenv("STREAM_CONSUMER_PRUNE_MS", "600000"))
+
+# Command de-duplication: a command_id is claimed under a lease before
+# dispatch and recorded in a bounded "delivered" sorted set in the same
+# MULTI as its XACK. Redelivered entries, producer retries and the same
+# command arriving over Pub/Sub are all dropped by command_id
+COMMAND_DEDUP_KEY = "nexus:commands:delivered"
+COMMAND_DEDUP_MAX = int(os.getenv("COMMAND_DEDUP_MAX", "100000"))
+COMMAND_CLAIM_PREFIX = "nexus:commands:claim:"
+COMMAND_CLAIM_LEASE_MS = int(os.getenv("COMMAND_CLAIM_LEASE_MS", str(STREAM_CLAIM_IDLE_MS)))
+
+# Legacy Pub/Sub listener: "off", "events" (log nexus:events / nexus:agents)
+# or "commands" (also deliver command_issued from nexus:commands, for
+# publishers that don't write the stream — deduplicated against it)
+LEGACY_PUBSUB = os.getenv("LEGACY_PUBSUB", "events").lower()
+
+# Command stream wire versions this build understands. Each consumer
+# advertises its highest one at COMMAND_WIRE_VERSION_PREFIX + consumer name
+# with a TTL, refreshed while it runs; producers join the adverts with the
+# group's live consumers (XINFO CONSUMERS) and only switch to binary
+# TaskCommand entries (v2) when every live consumer advertises v2.
+#   1 — flat string fields (command_id, command_type, priority, ...)
+#   2 — "cmd" field holds a serialized nexus_pulse.TaskCommand
+COMMAND_WIRE_VERSION = 2
+COMMAND_WIRE_VERSION_PREFIX = "nexus:commands:wire_version:"
+COMMAND_WIRE_ADVERT_TTL = int(os.getenv("COMMAND_WIRE_ADVERT_TTL", "60"))
 
 # Heartbeat ACK
 HEARTBEAT_ACK_ENABLED = os.getenv("HEARTBEAT_ACK", "true").lower() == "true"
 
+# Heartbeat aggregation: latest state per agent is flushed to Cortex in one
+# bulk request every N seconds (0 = relay every beat synchronously)
+HEARTBEAT_FLUSH_INTERVAL_SEC = float(os.getenv("HEARTBEAT_FLUSH_INTERVAL", "2.0"))
+
+# Cortex HTTP pool: HTTP/2 multiplexing when h2 is installed and Cortex speaks
+# it (TLS/ALPN), otherwise pooled HTTP/1.1 keepalive connections
+CORTEX_HTTP2 = os.getenv("CORTEX_HTTP2", "true").lower() == "true"
+CORTEX_MAX_CONNECTIONS = int(os.getenv("CORTEX_MAX_CONNECTIONS", "100"))
+CORTEX_MAX_KEEPALIVE = int(os.getenv("CORTEX_MAX_KEEPALIVE", "40"))
+CORTEX_KEEPALIVE_EXPIRY = float(os.getenv("CORTEX_KEEPALIVE_EXPIRY", "30"))
+
+# Per-endpoint request timeouts (seconds); override with e.g.
+# CORTEX_TIMEOUTS="event=1.0,dashboard=2.5"
+CORTEX_TIMEOUTS = {
+    "health": 2.0, "register": 5.0, "heartbeat": 3.0, "heartbeats": 5.0,
+    "command_submit": 5.0, "command_update": 3.0, "event": 2.0,
+    "dashboard": 3.0, "agents": 3.0, "replay": 5.0,
+}
+for _item in filter(None, os.getenv("CORTEX_TIMEOUTS", "").split(",")):
+    _name, _, _value = _item.partition("=")
+    CORTEX_TIMEOUTS[_name.strip()] = float(_value)
+
+# Circuit breaker: open after N consecutive failures, probe again after the
+# reset timeout. While open (or while a backlog exists) writes go to the
+# write-behind buffer, spilled to CORTEX_SPILL_DIR past the in-memory cap
+CORTEX_BREAKER_FAILURES = int(os.getenv("CORTEX_BREAKER_FAILURES", "5"))
+CORTEX_BREAKER_RESET_SEC = float(os.getenv("CORTEX_BREAKER_RESET", "10"))
+CORTEX_BUFFER_MEMORY = int(os.getenv("CORTEX_BUFFER_MEMORY", "1000"))
+CORTEX_SPILL_DIR = os.getenv("CORTEX_SPILL_DIR", "/tmp/nexus_orchestrator")
+CORTEX_SPILL_MAX_BYTES = int(os.getenv("CORTEX_SPILL_MAX_BYTES", str(64 * 2**20)))
+
 # ── Logging ──────────────────────────────────────────────────────────────────
 logging.basicConfig(
     level=logging.INFO,
@@ -66,25 +159,380 @@ log_redis = logging.getLogger("nexus.redis_bridge")
 # CORTEX BRIDGE — HTTP proxy to existing FastAPI Cortex
 # ═════════════════════════════════════════════════════════════════════════════
 
+class CortexUnavailable(Exception):
+    """Cortex request not attempted (breaker open) or failed at transport/5xx level."""
+
+
+class CircuitBreaker:
+    """Consecutive-failure breaker: closed → open → half-open trial → closed."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = CORTEX_BREAKER_FAILURES,
+                 reset_timeout: float = CORTEX_BREAKER_RESET_SEC):
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.trial_at = 0.0
+        self.opens = 0
+
+    def allow(self) -> bool:
+        if self.state == self.CLOSED:
+            return True
+        now = time.monotonic()
+        # A trial that never reported back (its task was cancelled) must not
+        # pin the breaker half-open: after reset_timeout another one goes out
+        since = self.opened_at if self.state == self.OPEN else self.trial_at
+        if now - since >= self.reset_timeout:
+            # Let exactly one request through as the trial
+            self.state = self.HALF_OPEN
+            self.trial_at = now
+            return True
+        return False
+
+    def record_success(self):
+        if self.state != self.CLOSED:
+            log_bridge.info("🟢 Cortex circuit closed — Cortex reachable again")
+        self.state = self.CLOSED
+        self.failures = 0
+
+    def record_failure(self):
+        self.failures += 1
+        if self.state == self.HALF_OPEN or (
+                self.state == self.CLOSED and self.failures >= self.failure_threshold):
+            if self.state == self.CLOSED:
+                log_bridge.warning(
+                    f"🔴 Cortex circuit open after {self.failures} failures — "
+                    f"buffering writes, retry in {self.reset_timeout:g}s"
+                )
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+            self.opens += 1
+
+
+class WriteBehindBuffer:
+    """
+    FIFO of Cortex writes (method, path, body) held while Cortex is
+    unavailable. Past max_memory entries the in-memory backlog is appended
+    to a JSONL spill file; replay drains the file first, then memory, so
+    Cortex sees writes in the order they were made. The spill file survives
+    restarts and is replayed by the next process using the same path.
+
+    Replay never reads the live spill file: take_spill() renames it to
+    <spill_path>.replaying under the spill lock, so writes spilled while a
+    replay is in flight land in a fresh file and cannot be overwritten or
+    removed by it. File I/O runs in a thread, off the event loop.
+    """
+
+    def __init__(self, spill_path: Optional[str] = None,
+                 max_memory: int = CORTEX_BUFFER_MEMORY,
+                 max_spill_bytes: int = CORTEX_SPILL_MAX_BYTES):
+        self.spill_path = spill_path
+        self.replay_path = spill_path + ".replaying" if spill_path else None
+        self.max_memory = max(1, max_memory)
+        self.max_spill_bytes = max_spill_bytes
+        self._memory: deque = deque()
+        # Held while the spill file is written or rotated, and by replay
+        # while it sends the memory head (so a spill cannot move it to disk
+        # mid-request)
+        self.spill_lock = asyncio.Lock()
+        # Whether anything may be on disk. This process is the only writer,
+        # so the flag is kept in memory and the files are stat'ed once here
+        # instead of on every write.
+        self.spill_pending = bool(spill_path) and any(
+            os.path.exists(p) and os.path.getsize(p) > 0
+            for p in (self.spill_path, self.replay_path))
+        self.stats = {"buffered": 0, "spilled": 0, "replayed": 0, "dropped": 0}
+
+    def __len__(self) -> int:
+        return len(self._memory) + (1 if self.spill_pending else 0)
+
+    def __bool__(self) -> bool:
+        return bool(self._memory) or self.spill_pending
+
+    def has_spill(self) -> bool:
+        return self.spill_pending
+
+    async def append(self, method: str, path: str, body: dict):
+        self._memory.append((method, path, body))
+        self.stats["buffered"] += 1
+        # While the lock is busy the backlog briefly overshoots max_memory;
+        # the next append after it frees up spills it
+        if len(self._memory) > self.max_memory and not self.spill_lock.locked():
+            await self.spill()
+
+    async def spill(self, force: bool = False):
+        """Move the in-memory backlog to the spill file (memory over max_memory, or force)."""
+        if not self.spill_path:
+            while len(self._memory) > self.max_memory:
+                self._memory.popleft()
+                self.stats["dropped"] += 1
+            return
+        async with self.spill_lock:
+            # Another append may have spilled while this one waited
+            if not self._memory or (not force and len(self._memory) <= self.max_memory):
+                return
+            size = await asyncio.to_thread(self._spill_size)
+            if size >= self.max_spill_bytes:
+                self._memory.popleft()
+                self.stats["dropped"] += 1
+                return
+            batch = list(self._memory)
+            self._memory.clear()
+            self.spill_pending = True
+            await asyncio.to_thread(self._append_lines, batch)
+            self.stats["spilled"] += len(batch)
+
+    def _spill_size(self) -> int:
+        return os.path.getsize(self.spill_path) if os.path.exists(self.spill_path) else 0
+
+    def _append_lines(self, entries: list):
+        os.makedirs(os.path.dirname(self.spill_path) or ".", exist_ok=True)
+        with open(self.spill_path, "a") as f:
+            for method, path, body in entries:
+                f.write(json.dumps([method, path, body]) + "\n")
+
+    async def take_spill(self) -> list:
+        """
+        The oldest spilled entries, or [] once nothing is left on disk. An
+        unfinished replay file (failed replay, or a crash mid-replay) is
+        returned before the spill file is rotated into its place.
+        """
+        if not self.spill_path:
+            return []
+        async with self.spill_lock:
+            entries = await asyncio.to_thread(self._rotate_and_load)
+            if not entries:
+                self.spill_pending = False
+            return entries
+
+    def _rotate_and_load(self) -> list:
+        while True:
+            if not os.path.exists(self.replay_path):
+                if not os.path.exists(self.spill_path):
+                    return []
+                os.replace(self.spill_path, self.replay_path)
+            entries = []
+            with open(self.replay_path) as f:
+                for line in f:
+                    try:
+                        entries.append(tuple(json.loads(line)))
+                    except (json.JSONDecodeError, TypeError):
+                        self.stats["dropped"] += 1
+            if entries:
+                return entries
+            os.remove(self.replay_path)
+
+    async def finish_replay(self, remaining: list):
+        """Atomically replace the replay file with the not-yet-replayed entries."""
+        await asyncio.to_thread(self._rewrite_replay, remaining)
+
+    def _rewrite_replay(self, remaining: list):
+        if not remaining:
+            os.remove(self.replay_path)
+            return
+        tmp = self.replay_path + ".tmp"
+        with open(tmp, "w") as f:
+            for entry in remaining:
+                f.write(json.dumps(list(entry)) + "\n")
+        os.replace(tmp, self.replay_path)
+
+    def peek(self):
+        return self._memory[0] if self._memory else None
+
+    def pop(self):
+        self._memory.popleft()
+        self.stats["replayed"] += 1
+
+
 class CortexBridge:
-    """Async HTTP bridge to the existing Cortex REST API (port 8090)."""
+    """
+    Async HTTP bridge to the existing Cortex REST API (port 8090).
 
-    def __init__(self, base_url: str):
+    One pooled client (HTTP/2 when available) with per-endpoint timeouts.
+    A circuit breaker sheds load when Cortex is down: writes (registrations,
+    command updates, events) land in a write-behind buffer and return
+    immediately, reads fail fast, and the buffer is replayed in order once
+    a health probe succeeds — Pulse handling never waits on a dead Cortex.
+    """
+
+    def __init__(self, base_url: str,
+                 heartbeat_flush_interval: float = HEARTBEAT_FLUSH_INTERVAL_SEC,
+                 spill_path: Optional[str] = None):
         self.base_url = base_url.rstrip("/")
         self._client: Optional[httpx.AsyncClient] = None
+        self.breaker = CircuitBreaker()
+        self.write_buffer = WriteBehindBuffer(spill_path)
+        self._recovery_task: Optional[asyncio.Task] = None
+        self._replay_lock = asyncio.Lock()
+
+        # Heartbeat aggregation stage — agent_name -> latest (current_task, metrics)
+        self.heartbeat_flush_interval = heartbeat_flush_interval
+        self._pending_heartbeats: Dict[str, Tuple[Optional[str], Optional[pb.AgentMetrics]]] = {}
+        self._flush_task: Optional[asyncio.Task] = None
+        self.heartbeat_stats = {
+            "received": 0,     # beats handed to the bridge
+            "coalesced": 0,    # beats overwritten by a newer one before flush
+            "flushed": 0,      # beats delivered to Cortex
+            "flushes": 0,      # bulk requests sent
+            "flush_errors": 0,
+        }
 
     async def start(self):
+        http2 = CORTEX_HTTP2
+        if http2:
+            try:
+                import h2  # noqa: F401 — httpx's optional HTTP/2 backend
+            except ImportError:
+                http2 = False
         self._client = httpx.AsyncClient(
             base_url=self.base_url,
-            timeout=httpx.Timeout(10.0, connect=5.0),
-            limits=httpx.Limits(max_connections=50, max_keepalive_connections=20),
+            http2=http2,
+            timeout=httpx.Timeout(10.0, connect=2.0),
+            limits=httpx.Limits(
+                max_connections=CORTEX_MAX_CONNECTIONS,
+                max_keepalive_connections=CORTEX_MAX_KEEPALIVE,
+                keepalive_expiry=CORTEX_KEEPALIVE_EXPIRY,
+            ),
+        )
+        if self.heartbeat_flush_interval > 0:
+            self._flush_task = asyncio.create_task(self._heartbeat_flush_loop())
+        self._recovery_task = asyncio.create_task(self._recovery_loop())
+        if self.write_buffer.has_spill():
+            log_bridge.info(f"Found spilled Cortex writes at {self.write_buffer.spill_path} — will replay")
+        log_bridge.info(
+            f"Cortex bridge connected → {self.base_url} "
+            f"(http2={'on' if http2 else 'off'}, pool={CORTEX_MAX_CONNECTIONS})"
         )
-        log_bridge.info(f"Cortex bridge connected → {self.base_url}")
 
     async def stop(self):
+        for task in (self._flush_task, self._recovery_task):
+            if task:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._flush_task = self._recovery_task = None
         if self._client:
+            # Deliver whatever is still buffered before closing
+            await self.flush_heartbeats()
+            if self.write_buffer._memory and self.write_buffer.spill_path:
+                # Not deliverable now — persist for the next process
+                await self.write_buffer.spill(force=True)
             await self._client.aclose()
-            log_bridge.info("Cortex bridge closed")
+            log_bridge.info(
+                f"Cortex bridge closed (heartbeats: {self.heartbeat_stats}, "
+                f"write-behind: {self.write_buffer.stats})"
+            )
+
+    # ── Resilient request path ───────────────────────────────────────────────
+
+    async def _request(self, endpoint: str, method: str, path: str,
+                       json_body: dict = None, probe: bool = False) -> httpx.Response:
+        """
+        Issue one Cortex request under the breaker with the endpoint's
+        timeout. Transport errors, timeouts and 5xx count as failures and
+        raise CortexUnavailable; 4xx responses are returned to the caller.
+        """
+        if not probe and not self.breaker.allow():
+            raise CortexUnavailable("circuit open")
+        trial = self.breaker.state == CircuitBreaker.HALF_OPEN
+        try:
+            r = await self.client.request(
+                method, path, json=json_body,
+                timeout=CORTEX_TIMEOUTS.get(endpoint, 5.0),
+            )
+        except asyncio.CancelledError:
+            # A cancelled trial still has to settle the breaker, or every
+            # other request keeps being refused until the trial times out
+            if trial:
+                self.breaker.record_failure()
+            raise
+        except httpx.HTTPError as e:
+            self.breaker.record_failure()
+            raise CortexUnavailable(f"{type(e).__name__}: {e}") from e
+        if r.status_code >= 500:
+            self.breaker.record_failure()
+            raise CortexUnavailable(f"HTTP {r.status_code}")
+        self.breaker.record_success()
+        return r
+
+    async def _write(self, endpoint: str, method: str, path: str, body: dict) -> dict:
+        """
+        Deliver a write now, or buffer it. Once anything is buffered, later
+        writes queue behind it so replay preserves ordering.
+        """
+        if self.write_buffer:
+            await self.write_buffer.append(method, path, body)
+            return {"status": "buffered"}
+        try:
+            r = await self._request(endpoint, method, path, body)
+        except CortexUnavailable:
+            await self.write_buffer.append(method, path, body)
+            return {"status": "buffered"}
+        return r.json()
+
+    async def _recovery_loop(self):
+        """Probe Cortex while the breaker is open; replay the backlog once closed."""
+        while True:
+            await asyncio.sleep(1.0)
+            try:
+                if self.breaker.state != CircuitBreaker.CLOSED:
+                    if not self.breaker.allow():
+                        continue
+                    await self._request("health", "GET", "/health", probe=True)
+                if self.write_buffer:
+                    await self.replay()
+            except asyncio.CancelledError:
+                raise
+            except CortexUnavailable:
+                pass
+            except Exception as e:
+                log_bridge.error(f"Cortex recovery loop error: {e}")
+
+    async def replay(self) -> int:
+        """Send buffered writes to Cortex in order; stops at the first failure."""
+        buf = self.write_buffer
+        async with self._replay_lock:
+            sent = 0
+            while True:
+                spilled = await buf.take_spill()
+                for i, (method, path, body) in enumerate(spilled):
+                    try:
+                        await self._request("replay", method, path, body)
+                    except CortexUnavailable:
+                        await buf.finish_replay(spilled[i:])
+                        return sent
+                    sent += 1
+                    buf.stats["replayed"] += 1
+                if spilled:
+                    # Writes spilled meanwhile went to a fresh file — drain it next
+                    await buf.finish_replay([])
+                    continue
+
+                # Disk is empty, so memory holds the oldest writes. Should a
+                # spill move them to disk between requests, go back to the file.
+                while not buf.spill_pending:
+                    async with buf.spill_lock:
+                        if (entry := buf.peek()) is None:
+                            break
+                        method, path, body = entry
+                        try:
+                            await self._request("replay", method, path, body)
+                        except CortexUnavailable:
+                            return sent
+                        buf.pop()
+                        sent += 1
+                if not buf.spill_pending:
+                    break
+            if sent:
+                log_bridge.info(f"♻️  Replayed {sent} buffered Cortex writes")
+            return sent
 
     @property
     def client(self) -> httpx.AsyncClient:
@@ -94,7 +542,7 @@ class CortexBridge:
     async def health(self) -> dict:
         """GET /health"""
         try:
-            r = await self.client.get("/health")
+            r = await self._request("health", "GET", "/health", probe=True)
             return r.json()
         except Exception as e:
             log_bridge.error(f"Cortex health check failed: {e}")
@@ -112,10 +560,12 @@ class CortexBridge:
             "endpoint": endpoint,
         }
         try:
-            r = await self.client.post("/agent/register", json=body)
-            r.raise_for_status()
-            log_bridge.info(f"Registered agent via Cortex: {name}")
-            return r.json()
+            result = await self._write("register", "POST", "/agent/register", body)
+            log_bridge.info(
+                f"Registered agent via Cortex: {name}"
+                + (" (buffered)" if result.get("status") == "buffered" else "")
+            )
+            return result
         except Exception as e:
             log_bridge.error(f"Agent registration failed for {name}: {e}")
             return {"error": str(e)}
@@ -128,12 +578,91 @@ class CortexBridge:
             "metrics": metrics or {},
         }
         try:
-            r = await self.client.post(f"/agent/{agent_name}/heartbeat", json=body)
+            r = await self._request("heartbeat", "POST", f"/agent/{agent_name}/heartbeat", body)
             return r.json()
         except Exception as e:
             log_bridge.warning(f"Heartbeat relay failed for {agent_name}: {e}")
             return {"error": str(e)}
 
+    # ── Heartbeat aggregation ────────────────────────────────────────────────
+
+    @staticmethod
+    def _metrics_dict(metrics) -> dict:
+        """Heartbeat metrics body from a dict or a pb.AgentMetrics."""
+        if metrics is None:
+            return {}
+        if isinstance(metrics, dict):
+            return metrics
+        return {
+            "cpu": metrics.cpu_usage_percent,
+            "memory": metrics.memory_usage_percent,
+            "latency_ms": metrics.request_latency_ms,
+            "active_tasks": metrics.active_tasks,
+        }
+
+    async def queue_heartbeat(self, agent_name: str, current_task: str = None,
+                              metrics=None):
+        """
+        Record the latest heartbeat for an agent without touching the network.
+        Only the newest state per agent survives until the next bulk flush.
+        Falls back to a direct POST when aggregation is disabled.
+
+        `metrics` may be the pulse's pb.AgentMetrics — it is only turned into
+        a JSON dict at flush time, so coalesced beats never build one.
+        """
+        if self.heartbeat_flush_interval <= 0:
+            await self.heartbeat(agent_name, current_task, self._metrics_dict(metrics))
+            return
+
+        self.heartbeat_stats["received"] += 1
+        if agent_name in self._pending_heartbeats:
+            self.heartbeat_stats["coalesced"] += 1
+        self._pending_heartbeats[agent_name] = (current_task, metrics)
+
+    async def flush_heartbeats(self) -> int:
+        """POST /agents/heartbeats — deliver all buffered heartbeats at once."""
+        if not self._pending_heartbeats:
+            return 0
+
+        batch = self._pending_heartbeats
+        self._pending_heartbeats = {}
+        try:
+            r = await self._request(
+                "heartbeats", "POST", "/agents/heartbeats",
+                {"heartbeats": [
+                    {
+                        "agent_name": name,
+                        "current_task": current_task,
+                        "metrics": self._metrics_dict(metrics),
+                    }
+                    for name, (current_task, metrics) in batch.items()
+                ]},
+            )
+            r.raise_for_status()
+        except Exception as e:
+            self.heartbeat_stats["flush_errors"] += 1
+            if self.breaker.state == CircuitBreaker.CLOSED:
+                log_bridge.warning(f"Bulk heartbeat flush failed ({len(batch)} agents): {e}")
+            # Re-queue, but never overwrite a newer beat that arrived meanwhile
+            for name, hb in batch.items():
+                self._pending_heartbeats.setdefault(name, hb)
+            return 0
+
+        self.heartbeat_stats["flushed"] += len(batch)
+        self.heartbeat_stats["flushes"] += 1
+        return len(batch)
+
+    async def _heartbeat_flush_loop(self):
+        """Background task: flush the heartbeat buffer on a fixed interval."""
+        while True:
+            await asyncio.sleep(self.heartbeat_flush_interval)
+            try:
+                await self.flush_heartbeats()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                log_bridge.error(f"Heartbeat flush loop error: {e}")
+
     async def submit_command(self, command_type: str, origin: str,
                               target_agent: str = None, payload: dict = None,
                               priority: int = 5) -> dict:
@@ -146,7 +675,8 @@ class CortexBridge:
             "priority": priority,
         }
         try:
-            r = await self.client.post("/command", json=body)
+            # Needs Cortex's command_id back — fails fast instead of buffering
+            r = await self._request("command_submit", "POST", "/command", body)
             r.raise_for_status()
             data = r.json()
             log_bridge.info(f"Command submitted: {data.get('command_id')} → {target_agent or 'auto-route'}")
@@ -165,8 +695,7 @@ class CortexBridge:
         if error_msg:
             body["error_msg"] = error_msg
         try:
-            r = await self.client.patch(f"/command/{command_id}", json=body)
-            return r.json()
+            return await self._write("command_update", "PATCH", f"/command/{command_id}", body)
         except Exception as e:
             log_bridge.warning(f"Command update failed for {command_id}: {e}")
             return {"error": str(e)}
@@ -185,8 +714,7 @@ class CortexBridge:
         if command_id:
             event["command_id"] = command_id
         try:
-            r = await self.client.post("/event", json=event)
-            return r.json()
+            return await self._write("event", "POST", "/event", event)
         except Exception as e:
             log_bridge.warning(f"Event post failed: {e}")
             return {"error": str(e)}
@@ -194,7 +722,7 @@ class CortexBridge:
     async def get_dashboard(self) -> dict:
         """GET /dashboard"""
         try:
-            r = await self.client.get("/dashboard")
+            r = await self._request("dashboard", "GET", "/dashboard")
             return r.json()
         except Exception as e:
             log_bridge.error(f"Dashboard fetch failed: {e}")
@@ -203,7 +731,7 @@ class CortexBridge:
     async def get_agents(self) -> list:
         """GET /agents"""
         try:
-            r = await self.client.get("/agents")
+            r = await self._request("agents", "GET", "/agents")
             data = r.json()
             return data.get("agents", [])
         except Exception as e:
@@ -215,21 +743,199 @@ class CortexBridge:
 # CONNECTED AGENT TRACKER
 # ═════════════════════════════════════════════════════════════════════════════
 
+class DirectiveQueue:
+    """
+    Bounded, event-driven outbound queue for one Pulse stream.
+
+    put() never blocks the producer: when full, the overflow policy evicts a
+    directive instead. get() parks the single sender coroutine on a future
+    created only while the queue is empty, so idle streams cost no timer
+    wakeups and no Event/waiter-deque per connection.
+    """
+
+    __slots__ = ("agent_id", "maxsize", "policy", "lag_threshold", "_items",
+                 "_waiter", "high_watermark", "dropped", "coalesced",
+                 "_lag_reported")
+
+    POLICY_COALESCE_ACK = "coalesce_ack"
+    POLICY_DROP_OLDEST = "drop_oldest"
+
+    def __init__(self, agent_id: str = "",
+                 maxsize: int = DIRECTIVE_QUEUE_SIZE,
+                 policy: str = DIRECTIVE_OVERFLOW_POLICY,
+                 lag_ratio: float = DIRECTIVE_LAG_RATIO):
+        self.agent_id = agent_id
+        self.maxsize = max(1, maxsize)
+        self.policy = policy
+        self.lag_threshold = max(1, int(self.maxsize * lag_ratio))
+        self._items: deque = deque()
+        self._waiter: Optional[asyncio.Future] = None
+        self.high_watermark = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self._lag_reported = False
+
+    def qsize(self) -> int:
+        return len(self._items)
+
+    def empty(self) -> bool:
+        return not self._items
+
+    @property
+    def lagging(self) -> bool:
+        return len(self._items) >= self.lag_threshold
+
+    def put_nowait(self, directive: pb.OrchestratorDirective) -> bool:
+        """Enqueue a directive. Returns False if the directive itself was dropped."""
+        if len(self._items) >= self.maxsize and not self._make_room(directive):
+            return False
+        self._items.append(directive)
+        if len(self._items) > self.high_watermark:
+            self.high_watermark = len(self._items)
+        if not self._lag_reported and self.lagging:
+            self._lag_reported = True
+            log_pulse.warning(
+                f"🐢 Agent {self.agent_id} falling behind: {len(self._items)}/"
+                f"{self.maxsize} directives queued (policy: {self.policy})"
+            )
+        waiter = self._waiter
+        if waiter is not None and not waiter.done():
+            waiter.set_result(None)
+        return True
+
+    async def put(self, directive: pb.OrchestratorDirective) -> bool:
+        return self.put_nowait(directive)
+
+    def _make_room(self, incoming: pb.OrchestratorDirective) -> bool:
+        if self.policy == self.POLICY_COALESCE_ACK:
+            # An ACK is only a liveness signal; a queued one already covers it
+            if incoming.directive_type == pb.DIRECTIVE_TYPE_ACK:
+                self.coalesced += 1
+                return False
+            for i, queued in enumerate(self._items):
+                if queued.directive_type == pb.DIRECTIVE_TYPE_ACK:
+                    del self._items[i]
+                    self.coalesced += 1
+                    return True
+        # drop_oldest, or coalesce_ack with nothing but tasks queued
+        self._items.popleft()
+        self.dropped += 1
+        return True
+
+    async def get(self) -> pb.OrchestratorDirective:
+        while not self._items:
+            self._waiter = asyncio.get_running_loop().create_future()
+            try:
+                await self._waiter
+            finally:
+                self._waiter = None
+        directive = self._items.popleft()
+        if self._lag_reported and not self._items:
+            self._lag_reported = False
+            log_pulse.info(f"Agent {self.agent_id} caught up on directives")
+        return directive
+
+    def stats(self) -> pb.DirectiveQueueStats:
+        return pb.DirectiveQueueStats(
+            agent_id=self.agent_id,
+            depth=len(self._items),
+            capacity=self.maxsize,
+            high_watermark=self.high_watermark,
+            dropped=self.dropped,
+            coalesced=self.coalesced,
+            lagging=self.lagging,
+        )
+
+
+class StalenessWheel:
+    """
+    Hashed timer wheel of pulse deadlines.
+
+    Each agent sits in the slot covering last_pulse_at + threshold. touch()
+    recomputes the slot (O(1)) and only moves the agent when the slot
+    changes; expire() pops the slots that have passed, so a reaper tick
+    costs O(expiring agents) instead of O(connected agents).
+    """
+
+    def __init__(self, threshold: float = STALENESS_THRESHOLD_SEC,
+                 resolution: float = STALENESS_WHEEL_RESOLUTION):
+        self.threshold = threshold
+        self.resolution = resolution
+        self._slots: Dict[int, Set["ConnectedAgent"]] = {}
+        self._cursor = int(time.monotonic() / resolution)
+
+    def __len__(self) -> int:
+        return sum(len(bucket) for bucket in self._slots.values())
+
+    def schedule(self, conn: "ConnectedAgent"):
+        # +1: a slot fires only once its whole span is past the deadline.
+        # A deadline already behind the cursor goes in the next slot due,
+        # not one expire() has walked past
+        slot = max(int((conn.last_pulse_at + self.threshold) / self.resolution) + 1,
+                   self._cursor)
+        if slot == conn.wheel_slot:
+            return
+        self.cancel(conn)
+        self._slots.setdefault(slot, set()).add(conn)
+        conn.wheel_slot = slot
+
+    def cancel(self, conn: "ConnectedAgent"):
+        if conn.wheel_slot is None:
+            return
+        bucket = self._slots.get(conn.wheel_slot)
+        if bucket is not None:
+            bucket.discard(conn)
+            if not bucket:
+                del self._slots[conn.wheel_slot]
+        conn.wheel_slot = None
+
+    def expire(self, now: float) -> list:
+        """Remove and return every agent whose deadline is before `now`."""
+        current = int(now / self.resolution)
+        expired = []
+        if current - self._cursor > len(self._slots):
+            # Long gap (or sparse wheel): walk occupied slots, not the span
+            due = sorted(slot for slot in self._slots if slot <= current)
+        else:
+            due = range(self._cursor, current + 1)
+        for slot in due:
+            bucket = self._slots.pop(slot, None)
+            if bucket:
+                for conn in bucket:
+                    conn.wheel_slot = None
+                expired.extend(bucket)
+        self._cursor = current + 1
+        return expired
+
+
 class ConnectedAgent:
     """Tracks a single gRPC-connected agent's state."""
 
-    def __init__(self, agent_id: str):
+    __slots__ = ("agent_id", "connected_at", "last_pulse_at", "directive_queue",
+                 "sequence_out", "pulse_count", "status", "wheel", "wheel_slot")
+
+    def __init__(self, agent_id: str, wheel: Optional[StalenessWheel] = None):
         self.agent_id = agent_id
         self.connected_at = time.monotonic()
         self.last_pulse_at = time.monotonic()
-        self.directive_queue: asyncio.Queue = asyncio.Queue(maxsize=100)
+        self.directive_queue = DirectiveQueue(agent_id)
         self.sequence_out: int = 0
         self.pulse_count: int = 0
         self.status = pb.AGENT_STATUS_IDLE
+        self.wheel = wheel
+        self.wheel_slot: Optional[int] = None
+        if wheel is not None:
+            wheel.schedule(self)
 
     def touch(self):
         self.last_pulse_at = time.monotonic()
         self.pulse_count += 1
+        if self.wheel is not None:
+            self.wheel.schedule(self)
+
+    @property
+    def deadline(self) -> float:
+        return self.last_pulse_at + STALENESS_THRESHOLD_SEC
 
     @property
     def idle_seconds(self) -> float:
@@ -240,6 +946,93 @@ class ConnectedAgent:
         return self.sequence_out
 
 
+# ═════════════════════════════════════════════════════════════════════════════
+# AGENT AFFINITY REGISTRY — Which worker holds which Pulse stream
+# ═════════════════════════════════════════════════════════════════════════════
+
+class AgentAffinityRegistry:
+    """
+    Shared agent → worker map in Redis.
+
+    Every orchestrator worker (process or pod) claims the agents whose Pulse
+    stream it holds and listens on its own forward channel, so a worker that
+    consumes a command for an agent it does not hold can hand it to the owner
+    instead of dropping it.
+    """
+
+    REGISTRY_KEY = "nexus:orchestrator:agent_workers"
+    FORWARD_CHANNEL_PREFIX = "nexus:orchestrator:forward:"
+
+    # Release only if this worker still owns the agent (it may have
+    # reconnected to another worker in the meantime)
+    _RELEASE_SCRIPT = """
+    if redis.call('HGET', KEYS[1], ARGV[1]) == ARGV[2] then
+        return redis.call('HDEL', KEYS[1], ARGV[1])
+    end
+    return 0
+    """
+
+    def __init__(self, redis_client: aioredis.Redis, worker_id: str = None):
+        self.redis = redis_client
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self.forward_channel = self.channel_for(self.worker_id)
+        self._stats = {"claims": 0, "releases": 0, "forwarded": 0,
+                       "forward_misses": 0, "errors": 0}
+
+    @classmethod
+    def channel_for(cls, worker_id: str) -> str:
+        return f"{cls.FORWARD_CHANNEL_PREFIX}{worker_id}"
+
+    @property
+    def stats(self) -> dict:
+        return dict(self._stats)
+
+    async def claim(self, agent_id: str):
+        """Record this worker as the holder of agent_id's Pulse stream."""
+        try:
+            await self.redis.hset(self.REGISTRY_KEY, agent_id, self.worker_id)
+            self._stats["claims"] += 1
+        except Exception as e:
+            self._stats["errors"] += 1
+            log_redis.warning(f"Affinity claim failed for {agent_id}: {e}")
+
+    async def release(self, agent_id: str, worker_id: str = None):
+        """Drop agent_id from the registry if worker_id (default: self) owns it."""
+        try:
+            await self.redis.eval(self._RELEASE_SCRIPT, 1, self.REGISTRY_KEY,
+                                  agent_id, worker_id or self.worker_id)
+            self._stats["releases"] += 1
+        except Exception as e:
+            self._stats["errors"] += 1
+            log_redis.warning(f"Affinity release failed for {agent_id}: {e}")
+
+    async def owner_of(self, agent_id: str) -> Optional[str]:
+        try:
+            return await self.redis.hget(self.REGISTRY_KEY, agent_id)
+        except Exception as e:
+            self._stats["errors"] += 1
+            log_redis.warning(f"Affinity lookup failed for {agent_id}: {e}")
+            return None
+
+    async def forward(self, worker_id: str, fields: dict) -> bool:
+        """
+        Hand a stream message to the worker holding its target agent.
+        Returns False when nobody is listening (stale entry, worker gone).
+        """
+        try:
+            receivers = await self.redis.publish(self.channel_for(worker_id),
+                                                 json.dumps(fields))
+        except Exception as e:
+            self._stats["errors"] += 1
+            log_redis.warning(f"Forward to worker {worker_id} failed: {e}")
+            return False
+        if receivers:
+            self._stats["forwarded"] += 1
+            return True
+        self._stats["forward_misses"] += 1
+        return False
+
+
 # ═════════════════════════════════════════════════════════════════════════════
 # gRPC SERVICE IMPLEMENTATION — NexusPulseServicer
 # ═════════════════════════════════════════════════════════════════════════════
@@ -250,9 +1043,14 @@ class NexusPulseServicer(pb_grpc.NexusPulseServiceServicer):
     Bridges gRPC Pulse streams ←→ Cortex REST API.
     """
 
-    def __init__(self, cortex: CortexBridge, redis_client: aioredis.Redis):
+    def __init__(self, cortex: CortexBridge, redis_client: aioredis.Redis,
+                 registry: Optional[AgentAffinityRegistry] = None):
         self.cortex = cortex
         self.redis = redis_client
+        self.registry = registry
+        self.snapshot_cache = SystemSnapshotCache(cortex)
+        self.staleness_wheel = StalenessWheel()
+        self.reaper: Optional["StalenessReaper"] = None      # set by serve()
         self.connected_agents: Dict[str, ConnectedAgent] = {}
         self._shutting_down = False
         self._stats = {
@@ -303,19 +1101,24 @@ class NexusPulseServicer(pb_grpc.NexusPulseServiceServicer):
             "offline": pb.AGENT_STATUS_OFFLINE,
         }.get(s, pb.AGENT_STATUS_UNSPECIFIED)
 
+    # ACKs are copied from a pre-built template and numbered from a
+    # per-process counter — no uuid4 / datetime / Timestamp temporaries
+    _ACK_TEMPLATE = pb.OrchestratorDirective(directive_type=pb.DIRECTIVE_TYPE_ACK)
+    _ACK_ID_PREFIX = f"ack-{os.getpid():x}-"
+    _ack_ids = itertools.count(1)
+
     def _make_ack_directive(self, pulse_id: str, message: str,
                              correlation_id: str = "") -> pb.OrchestratorDirective:
         """Create an ACK directive for a received pulse."""
-        agent_conn = None
-        # find agent for sequence
-        return pb.OrchestratorDirective(
-            directive_id=str(uuid.uuid4()),
-            directive_type=pb.DIRECTIVE_TYPE_ACK,
-            timestamp=self._now_ts(),
-            ack_for_pulse_id=pulse_id,
-            message=message,
-            correlation_id=correlation_id,
-        )
+        ack = pb.OrchestratorDirective()
+        ack.CopyFrom(self._ACK_TEMPLATE)
+        ack.directive_id = f"{self._ACK_ID_PREFIX}{next(self._ack_ids)}"
+        ack.timestamp.FromNanoseconds(time.time_ns())
+        ack.ack_for_pulse_id = pulse_id
+        ack.message = message
+        if correlation_id:
+            ack.correlation_id = correlation_id
+        return ack
 
     # ── RPC: Bidirectional Pulse Stream ──────────────────────────────────────
 
@@ -328,21 +1131,18 @@ class NexusPulseServicer(pb_grpc.NexusPulseServiceServicer):
         agent_conn = None
 
         async def _send_directives():
-            """Background coroutine: dequeue directives and yield to agent."""
+            """Background coroutine: dequeue directives and yield to agent.
+            Parks on the queue until a directive arrives; cancelled on teardown."""
             nonlocal agent_conn
+            queue = agent_conn.directive_queue
             try:
                 while not self._shutting_down:
-                    try:
-                        directive = await asyncio.wait_for(
-                            agent_conn.directive_queue.get(), timeout=1.0
-                        )
-                        directive.sequence_number = agent_conn.next_sequence()
-                        self._stats["total_directives"] += 1
-                        await context.write(directive)
-                    except asyncio.TimeoutError:
-                        continue
-                    except asyncio.CancelledError:
-                        break
+                    directive = await queue.get()
+                    directive.sequence_number = agent_conn.next_sequence()
+                    self._stats["total_directives"] += 1
+                    await context.write(directive)
+            except asyncio.CancelledError:
+                pass
             except Exception as e:
                 log.warning(f"Directive sender for {agent_id} ended: {e}")
 
@@ -361,8 +1161,11 @@ class NexusPulseServicer(pb_grpc.NexusPulseServiceServicer):
                         return
 
                     # Register in connected agents
-                    agent_conn = ConnectedAgent(agent_id)
+                    agent_conn = ConnectedAgent(agent_id, self.staleness_wheel)
                     self.connected_agents[agent_id] = agent_conn
+                    self.snapshot_cache.on_connect(agent_id)
+                    if self.registry:
+                        await self.registry.claim(agent_id)
                     log_pulse.info(
                         f"⚡ Agent connected: {agent_id} "
                         f"(total: {len(self.connected_agents)})"
@@ -400,8 +1203,15 @@ class NexusPulseServicer(pb_grpc.NexusPulseServiceServicer):
                 except asyncio.CancelledError:
                     pass
 
-            if agent_id and agent_id in self.connected_agents:
+            if agent_conn is not None:
+                self.staleness_wheel.cancel(agent_conn)
+
+            # Only tear down if a reconnect hasn't already replaced this stream
+            if agent_id and self.connected_agents.get(agent_id) is agent_conn:
                 del self.connected_agents[agent_id]
+                self.snapshot_cache.on_disconnect(agent_id)
+                if self.registry:
+                    await self.registry.release(agent_id)
                 log_pulse.info(
                     f"🔌 Agent disconnected: {agent_id} "
                     f"(remaining: {len(self.connected_agents)})"
@@ -420,19 +1230,19 @@ class NexusPulseServicer(pb_grpc.NexusPulseServiceServicer):
         pt = pulse.pulse_type
 
         if pt == pb.PULSE_TYPE_HEARTBEAT:
-            metrics = {}
-            if pulse.state and pulse.state.metrics:
-                m = pulse.state.metrics
-                metrics = {
-                    "cpu": m.cpu_usage_percent,
-                    "memory": m.memory_usage_percent,
-                    "latency_ms": m.request_latency_ms,
-                    "active_tasks": m.active_tasks,
-                }
-            current_task = pulse.state.current_task if pulse.state else None
-            await self.cortex.heartbeat(agent_id, current_task, metrics)
+            state = pulse.state
+            current_task = state.current_task
+            await self.cortex.queue_heartbeat(
+                agent_id, current_task,
+                state.metrics if state.HasField("metrics") else None,
+            )
+            self.snapshot_cache.on_heartbeat(agent_id, current_task)
 
-            if HEARTBEAT_ACK_ENABLED:
+            # Backpressure: a lagging agent gets no further heartbeat ACKs
+            # until its stream drains — the queued ones already prove liveness
+            if HEARTBEAT_ACK_ENABLED and conn.directive_queue.lagging:
+                conn.directive_queue.coalesced += 1
+            elif HEARTBEAT_ACK_ENABLED:
                 ack = self._make_ack_directive(
                     str(pulse.sequence_number),
                     f"Heartbeat #{conn.pulse_count} received",
@@ -448,6 +1258,10 @@ class NexusPulseServicer(pb_grpc.NexusPulseServiceServicer):
                 capabilities=list(pulse.capabilities),
                 endpoint=pulse.endpoint,
             )
+            self.snapshot_cache.on_register(
+                agent_id, pulse.display_name or agent_id,
+                pulse.agent_type, list(pulse.capabilities),
+            )
             self._stats["total_registrations"] += 1
             ack = self._make_ack_directive(
                 str(pulse.sequence_number),
@@ -510,16 +1324,16 @@ class NexusPulseServicer(pb_grpc.NexusPulseServiceServicer):
                 await conn.directive_queue.put(ack)
 
         elif pt == pb.PULSE_TYPE_STATE_UPDATE:
-            if pulse.state:
-                conn.status = pulse.state.status
-                metrics = {}
-                if pulse.state.metrics:
-                    m = pulse.state.metrics
-                    metrics = {
-                        "cpu": m.cpu_usage_percent,
-                        "memory": m.memory_usage_percent,
-                    }
-                await self.cortex.heartbeat(agent_id, pulse.state.current_task, metrics)
+            if pulse.HasField("state"):
+                state = pulse.state
+                conn.status = state.status
+                await self.cortex.queue_heartbeat(
+                    agent_id, state.current_task,
+                    state.metrics if state.HasField("metrics") else None,
+                )
+                self.snapshot_cache.on_heartbeat(
+                    agent_id, state.current_task, state.status
+                )
 
     # ── RPC: RegisterAgent (Unary) ───────────────────────────────────────────
 
@@ -541,6 +1355,10 @@ class NexusPulseServicer(pb_grpc.NexusPulseServiceServicer):
                 message=f"Registration failed: {result['error']}",
             )
 
+        self.snapshot_cache.on_register(
+            request.name, request.display_name or request.name,
+            request.agent_type, list(request.capabilities),
+        )
         log.info(f"Agent registered (unary): {request.name}")
         return pb.RegistrationAck(
             success=True,
@@ -603,56 +1421,276 @@ class NexusPulseServicer(pb_grpc.NexusPulseServiceServicer):
 
     async def GetSystemStatus(self, request, context):
         """Returns current NEXUS PRIME cluster state."""
-        return await self._build_system_snapshot()
+        snapshot = pb.SystemSnapshot()
+        snapshot.CopyFrom(await self._build_system_snapshot())
+        snapshot.directive_queues.extend(self._directive_queue_stats())
+        if self.reaper is not None:
+            snapshot.reaper.CopyFrom(self.reaper.snapshot_stats())
+        return snapshot
 
     async def _build_system_snapshot(self) -> pb.SystemSnapshot:
-        """Build system snapshot from Cortex dashboard + local gRPC state."""
+        """Cached cluster view (Cortex dashboard + local gRPC events)."""
+        return await self.snapshot_cache.get()
+
+    def _directive_queue_stats(self) -> list:
+        """Per-agent outbound queue depth, deepest first."""
+        stats = [conn.directive_queue.stats()
+                 for conn in self.connected_agents.values()]
+        stats.sort(key=lambda q: q.depth, reverse=True)
+        return stats
+
+
+# ═════════════════════════════════════════════════════════════════════════════
+# SYSTEM SNAPSHOT CACHE — O(1) cluster view for welcomes & status RPCs
+# ═════════════════════════════════════════════════════════════════════════════
+
+class SystemSnapshotCache:
+    """
+    Keeps the SystemSnapshot in memory instead of rebuilding it from the
+    Cortex dashboard on every Pulse welcome and GetSystemStatus call.
+
+      • Connect / disconnect / register events mark the snapshot dirty and it
+        is rebuilt on the next read; heartbeat details are folded in at most
+        every SNAPSHOT_REBUILD_INTERVAL_SEC. Reads in between are O(1).
+      • Cortex is re-read once the data is older than SNAPSHOT_MAX_STALENESS_SEC.
+        Concurrent readers share a single in-flight refresh (reconnect storms
+        cost one dashboard call), and a failed refresh keeps serving local
+        state until the next window instead of retrying per caller.
+    """
+
+    def __init__(self, cortex: CortexBridge,
+                 max_staleness: float = SNAPSHOT_MAX_STALENESS_SEC,
+                 rebuild_interval: float = SNAPSHOT_REBUILD_INTERVAL_SEC):
+        self.cortex = cortex
+        self.max_staleness = max_staleness
+        self.rebuild_interval = rebuild_interval
+
+        self._agents: Dict[str, pb.AgentSummary] = {}
+        self._local_online: Set[str] = set()
+        self._cortex_stats: dict = {}
+        self._refreshed_at: Optional[float] = None
+        self._refresh_future: Optional[asyncio.Future] = None
+
+        self._snapshot: Optional[pb.SystemSnapshot] = None
+        self._built_at = 0.0
+        self._dirty = True          # membership/status changed
+        self._detail_dirty = False  # heartbeat detail changed
+
+        self.stats = {"hits": 0, "rebuilds": 0, "refreshes": 0,
+                      "refresh_errors": 0, "refresh_waiters": 0}
+
+    # ── Reads ────────────────────────────────────────────────────────────────
+
+    async def get(self) -> pb.SystemSnapshot:
+        now = time.monotonic()
+        if self._refreshed_at is None or now - self._refreshed_at > self.max_staleness:
+            await self._refresh_single_flight()
+            now = time.monotonic()
+
+        if (self._dirty or self._snapshot is None or
+                (self._detail_dirty and now - self._built_at >= self.rebuild_interval)):
+            self._rebuild(now)
+        else:
+            self.stats["hits"] += 1
+        return self._snapshot
+
+    def _rebuild(self, now: float):
+        agents = list(self._agents.values())
+        online = sum(1 for a in agents
+                     if a.status not in (pb.AGENT_STATUS_OFFLINE, pb.AGENT_STATUS_UNSPECIFIED))
+        self._snapshot = pb.SystemSnapshot(
+            online_agents=online,
+            total_agents=len(agents),
+            queued_commands=self._cortex_stats.get("queued_commands", 0),
+            running_commands=self._cortex_stats.get("running_commands", 0),
+            timestamp=NexusPulseServicer._now_ts(),
+            agents=agents,
+        )
+        self._built_at = now
+        self._dirty = False
+        self._detail_dirty = False
+        self.stats["rebuilds"] += 1
+
+    async def _refresh_single_flight(self):
+        if self._refresh_future is not None:
+            self.stats["refresh_waiters"] += 1
+            await asyncio.shield(self._refresh_future)
+            return
+
+        fut = asyncio.get_running_loop().create_future()
+        self._refresh_future = fut
+        try:
+            await self._refresh()
+        finally:
+            self._refresh_future = None
+            fut.set_result(None)
+
+    async def _refresh(self):
+        """Reload agents + counters from the Cortex dashboard."""
         dashboard = await self.cortex.get_dashboard()
-        stats = dashboard.get("stats", {})
-        cortex_agents = dashboard.get("agents", [])
+        # Success or not, the window restarts — no per-caller retries
+        self._refreshed_at = time.monotonic()
+        self.stats["refreshes"] += 1
+        if "error" in dashboard:
+            self.stats["refresh_errors"] += 1
+            return
+
+        self._cortex_stats = dashboard.get("stats", {}) or {}
+        agents = {}
+        for a in dashboard.get("agents", []):
+            summary = self._summary_from_cortex(a)
+            agents[summary.name] = summary
+        # Streams this process holds are online regardless of Cortex lag
+        for agent_id in self._local_online:
+            summary = agents.get(agent_id) or self._new_summary(agent_id)
+            if summary.status in (pb.AGENT_STATUS_OFFLINE, pb.AGENT_STATUS_UNSPECIFIED):
+                summary.status = pb.AGENT_STATUS_IDLE
+            agents[agent_id] = summary
+        self._agents = agents
+        self._dirty = True
 
-        agent_summaries = []
-        for a in cortex_agents:
-            ts = timestamp_pb2.Timestamp()
-            if a.get("last_seen"):
-                try:
-                    dt = datetime.fromisoformat(a["last_seen"].replace("Z", "+00:00"))
-                    ts.FromDatetime(dt)
-                except Exception:
-                    pass
+    @staticmethod
+    def _summary_from_cortex(a: dict) -> pb.AgentSummary:
+        ts = timestamp_pb2.Timestamp()
+        if a.get("last_seen"):
+            try:
+                dt = datetime.fromisoformat(a["last_seen"].replace("Z", "+00:00"))
+                ts.FromDatetime(dt)
+            except Exception:
+                pass
 
-            caps = a.get("capabilities", [])
-            if isinstance(caps, str):
-                try:
-                    caps = json.loads(caps)
-                except Exception:
-                    caps = []
-
-            agent_summaries.append(pb.AgentSummary(
-                name=a.get("name", ""),
-                display_name=a.get("display_name", a.get("name", "")),
-                status=self._str_to_agent_status(a.get("status", "offline")),
-                agent_type=pb.AGENT_TYPE_PLANET if a.get("agent_type") == "planet" else pb.AGENT_TYPE_SERVICE,
-                last_seen=ts,
-                current_task=a.get("current_task", ""),
-                capabilities=caps,
-            ))
-
-        return pb.SystemSnapshot(
-            online_agents=stats.get("online_count", len(self.connected_agents)),
-            total_agents=len(cortex_agents) if cortex_agents else len(self.connected_agents),
-            queued_commands=stats.get("queued_commands", 0),
-            running_commands=stats.get("running_commands", 0),
-            timestamp=self._now_ts(),
-            agents=agent_summaries,
+        caps = a.get("capabilities", [])
+        if isinstance(caps, str):
+            try:
+                caps = json.loads(caps)
+            except Exception:
+                caps = []
+
+        return pb.AgentSummary(
+            name=a.get("name", ""),
+            display_name=a.get("display_name", a.get("name", "")),
+            status=NexusPulseServicer._str_to_agent_status(a.get("status", "offline")),
+            agent_type=pb.AGENT_TYPE_PLANET if a.get("agent_type") == "planet" else pb.AGENT_TYPE_SERVICE,
+            last_seen=ts,
+            current_task=a.get("current_task", "") or "",
+            capabilities=caps,
         )
 
+    @staticmethod
+    def _new_summary(agent_id: str) -> pb.AgentSummary:
+        return pb.AgentSummary(name=agent_id, display_name=agent_id,
+                               status=pb.AGENT_STATUS_IDLE,
+                               agent_type=pb.AGENT_TYPE_PLANET)
+
+    # ── Incremental events ───────────────────────────────────────────────────
+
+    def on_connect(self, agent_id: str):
+        self._local_online.add(agent_id)
+        summary = self._agents.get(agent_id)
+        if summary is None:
+            summary = self._agents[agent_id] = self._new_summary(agent_id)
+        elif summary.status in (pb.AGENT_STATUS_OFFLINE, pb.AGENT_STATUS_UNSPECIFIED):
+            summary.status = pb.AGENT_STATUS_IDLE
+        summary.last_seen.GetCurrentTime()
+        self._dirty = True
+
+    def on_disconnect(self, agent_id: str):
+        self._local_online.discard(agent_id)
+        summary = self._agents.get(agent_id)
+        if summary is not None:
+            summary.status = pb.AGENT_STATUS_OFFLINE
+            summary.current_task = ""
+            self._dirty = True
+
+    def on_register(self, name: str, display_name: str,
+                    agent_type: int, capabilities: list):
+        summary = self._agents.get(name)
+        if summary is None:
+            summary = self._agents[name] = self._new_summary(name)
+        summary.display_name = display_name or name
+        summary.agent_type = agent_type or pb.AGENT_TYPE_PLANET
+        del summary.capabilities[:]
+        summary.capabilities.extend(capabilities)
+        if summary.status in (pb.AGENT_STATUS_OFFLINE, pb.AGENT_STATUS_UNSPECIFIED):
+            summary.status = pb.AGENT_STATUS_IDLE
+        summary.last_seen.GetCurrentTime()
+        self._dirty = True
+
+    def on_heartbeat(self, agent_id: str, current_task: str = None,
+                     status: int = None):
+        summary = self._agents.get(agent_id)
+        if summary is None:
+            self.on_connect(agent_id)
+            summary = self._agents[agent_id]
+        summary.current_task = current_task or ""
+        summary.last_seen.GetCurrentTime()
+        if status and status != summary.status:
+            summary.status = status
+            self._dirty = True
+        else:
+            self._detail_dirty = True
+
 
-# ═════════════════════════════════════════════════════════════════════════════
 # ═════════════════════════════════════════════════════════════════════════════
 # REDIS BRIDGE — Subscribe to Redis Streams with Consumer Groups
 # ═════════════════════════════════════════════════════════════════════════════
 
+# Per command_id: 0 = claimed by us, 1 = already delivered, 2 = another
+# consumer holds the lease
+_CLAIM_COMMANDS_LUA = """
+local out = {}
+for i = 4, #ARGV do
+  local id = ARGV[i]
+  local key = ARGV[3] .. id
+  if redis.call('ZSCORE', KEYS[1], id) then
+    out[#out + 1] = 1
+  elseif redis.call('SET', key, ARGV[1], 'NX', 'PX', ARGV[2]) then
+    out[#out + 1] = 0
+  elseif redis.call('GET', key) == ARGV[1] then
+    redis.call('PEXPIRE', key, ARGV[2])
+    out[#out + 1] = 0
+  else
+    out[#out + 1] = 2
+  end
+end
+return out
+"""
+
+# Extend the leases we still own while their batch is being dispatched
+_RENEW_CLAIMS_LUA = """
+local renewed = 0
+for i = 4, #ARGV do
+  local key = ARGV[3] .. ARGV[i]
+  if redis.call('GET', key) == ARGV[1] then
+    redis.call('PEXPIRE', key, ARGV[2])
+    renewed = renewed + 1
+  end
+end
+return renewed
+"""
+
+# Record delivered command_ids (only while we still hold the lease — a
+# consumer that lost it must not double-record), release every claim we
+# hold, cap the delivered set
+_COMMIT_COMMANDS_LUA = """
+local n = tonumber(ARGV[5])
+local committed = 0
+for i = 6, #ARGV do
+  local id = ARGV[i]
+  local key = ARGV[2] .. id
+  local owner = redis.call('GET', key)
+  if i < 6 + n and (owner == ARGV[1] or not owner)
+     and not redis.call('ZSCORE', KEYS[1], id) then
+    redis.call('ZADD', KEYS[1], ARGV[3], id)
+    committed = committed + 1
+  end
+  if owner == ARGV[1] then redis.call('DEL', key) end
+end
+redis.call('ZREMRANGEBYRANK', KEYS[1], 0, -tonumber(ARGV[4]) - 1)
+return committed
+"""
+
+
 class RedisBridge:
     """
     Production-grade Redis Streams consumer with Consumer Groups.
@@ -660,27 +1698,65 @@ class RedisBridge:
     
     Features:
       ✅ Consumer Groups - only one consumer processes each message
-      ✅ ACK mechanism - ensures delivery semantics
-      ✅ Dead Letter Queue - moves failed messages after 3 retries
-      ✅ Stream trimming - prevents memory overflow
-      ✅ Backward compatible - also subscribes to legacy Pub/Sub channels
+      ✅ Exactly-once per command_id - lease claim before dispatch (renewed
+         while the batch runs; lease owner = unique per-process consumer
+         name), delivered mark + XACK in one MULTI; duplicates are ACKed
+         without dispatch
+      ✅ Batched reads - up to STREAM_BATCH_SIZE entries per XREADGROUP,
+         one pipelined XACK per batch
+      ✅ Concurrent dispatch - different targets in parallel, per-target order kept
+      ✅ Pending recovery - XAUTOCLAIM picks up entries left by crashed pods;
+         retry counts are the PEL delivery counters, so they survive restarts
+      ✅ Dead Letter Queue - moves messages after STREAM_MAX_RETRIES deliveries
+      ✅ Stream trimming - MAXLEN ~ on every XADD
+      ✅ Backward compatible - legacy Pub/Sub listener (LEGACY_PUBSUB)
     """
 
     def __init__(self, redis_client: aioredis.Redis,
-                 servicer: NexusPulseServicer):
+                 servicer: NexusPulseServicer,
+                 registry: Optional[AgentAffinityRegistry] = None,
+                 batch_size: int = STREAM_BATCH_SIZE,
+                 concurrency: int = STREAM_CONCURRENCY):
         self.redis = redis_client
         self.servicer = servicer
+        self.registry = registry
         self._running = False
         
         # Stream configuration
         self.stream_name = "nexus:commands:stream"
         self.group_name = "orchestrator_group"
-        self.consumer_name = f"orch_pod_{os.getpid()}"
+        # Consumer name doubles as the claim-lease owner in the Lua scripts,
+        # so it must be unique per process: every replica runs as PID 1
+        self.consumer_name = f"orch_{socket.gethostname()}_{os.getpid()}_{uuid.uuid4().hex[:8]}"
         self.dlq_stream = "nexus:commands:dlq"
+        self.batch_size = batch_size
+        self._dispatch_slots = asyncio.Semaphore(max(1, concurrency))
         
-        # Retry tracking
-        self.retry_counts = {}  # msg_id -> count
-        self.max_retries = 3
+        # Retry tracking lives in Redis (XPENDING delivery count)
+        self.max_retries = STREAM_MAX_RETRIES
+        self.claim_idle_ms = STREAM_CLAIM_IDLE_MS
+
+        # De-duplication by command_id (see COMMAND_DEDUP_KEY)
+        self.dedup_key = COMMAND_DEDUP_KEY
+        self.claim_prefix = COMMAND_CLAIM_PREFIX
+        self.claim_lease_ms = COMMAND_CLAIM_LEASE_MS
+        # command_ids this process is dispatching right now. The stream loop
+        # and the reclaim loop share one lease identity, and the claim script
+        # re-grants a lease to its owner — without this they could both
+        # dispatch a retried command at once
+        self._inflight: Set[str] = set()
+
+        self.stats = {
+            "read": 0,           # entries delivered by XREADGROUP
+            "acked": 0,
+            "failed": 0,         # left pending for XAUTOCLAIM
+            "reclaimed": 0,      # entries taken over via XAUTOCLAIM
+            "dead_lettered": 0,
+            "batches": 0,
+            "duplicates": 0,     # command_id already delivered — ACKed, not dispatched
+            "deferred": 0,       # another consumer holds the claim — left pending
+            "lease_lost": 0,     # dispatched, but the claim expired before commit
+        }
 
     async def start(self):
         self._running = True
@@ -699,22 +1775,55 @@ class RedisBridge:
                 log_redis.info(f"Consumer group '{self.group_name}' already exists")
             else:
                 raise
-        
-        # Start stream consumer
+
+        # Advertise which wire versions this consumer can decode
+        await self._advertise_wire_version()
+
+        # Start stream consumer + pending-entry recovery
         asyncio.create_task(self._stream_consumer_loop())
+        asyncio.create_task(self._reclaim_loop())
+        asyncio.create_task(self._advertise_loop())
         
         # Start legacy Pub/Sub listener (backward compatibility)
-        asyncio.create_task(self._legacy_pubsub_loop())
+        if LEGACY_PUBSUB != "off":
+            asyncio.create_task(self._legacy_pubsub_loop())
+
+        # Receive directives forwarded by workers that don't hold the agent
+        if self.registry:
+            asyncio.create_task(self._forward_listener_loop())
         
         log_redis.info(
             f"Redis Streams bridge started — "
             f"Stream: {self.stream_name} | "
             f"Group: {self.group_name} | "
-            f"Consumer: {self.consumer_name}"
+            f"Consumer: {self.consumer_name} | "
+            f"Batch: {self.batch_size} | "
+            f"Legacy Pub/Sub: {LEGACY_PUBSUB}"
         )
 
     async def stop(self):
         self._running = False
+        try:
+            await self.redis.delete(COMMAND_WIRE_VERSION_PREFIX + self.consumer_name)
+        except Exception:
+            pass
+
+    async def _advertise_wire_version(self):
+        await self.redis.set(COMMAND_WIRE_VERSION_PREFIX + self.consumer_name,
+                             COMMAND_WIRE_VERSION, ex=COMMAND_WIRE_ADVERT_TTL)
+
+    async def _advertise_loop(self):
+        """Refresh the wire-version advert well inside its TTL; a dead pod's expires."""
+        while self._running:
+            await asyncio.sleep(COMMAND_WIRE_ADVERT_TTL / 3)
+            if not self._running:
+                break
+            try:
+                await self._advertise_wire_version()
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                log_redis.warning(f"Wire version advert refresh failed: {e}")
 
     async def _stream_consumer_loop(self):
         """Consume messages from Redis Streams with XREADGROUP."""
@@ -727,20 +1836,15 @@ class RedisBridge:
                     self.group_name,
                     self.consumer_name,
                     {self.stream_name: '>'},  # '>' means new undelivered messages
-                    count=10,  # Process up to 10 messages per batch
+                    count=self.batch_size,
                     block=2000  # 2-second block timeout
                 )
                 
                 retry_delay = 1  # Reset on success
                 
-                # Process messages
                 for stream, msgs in messages:
-                    for msg_id, data in msgs:
-                        await self._process_stream_message(msg_id, data)
-                
-                # Periodic stream trimming to prevent memory overflow
-                if random.random() < 0.1:  # 10% chance each loop
-                    await self._trim_stream()
+                    self.stats["read"] += len(msgs)
+                    await self._process_batch(msgs)
                     
             except asyncio.CancelledError:
                 break
@@ -749,112 +1853,375 @@ class RedisBridge:
                 await asyncio.sleep(retry_delay)
                 retry_delay = min(retry_delay * 2, 30)
 
-    async def _process_stream_message(self, msg_id, data: dict):
-        """Process a single stream message."""
+    async def _process_batch(self, msgs: list, dead_letter: list = (),
+                             extra_acks: list = ()):
+        """
+        Dispatch one batch and settle it with a single MULTI round-trip.
+
+        Commands are claimed by command_id first: already-delivered ones are
+        ACKed without dispatch, ones leased by another consumer are left
+        pending. Entries for the same target run in stream order; different
+        targets run concurrently. Failed entries are not ACKed — they stay
+        in the PEL and come back through XAUTOCLAIM.
+        """
+        entries = [(msg_id, data, self._decode_fields(data)) for msg_id, data in msgs]
+        command_ids = {}
+        for msg_id, _, fields in entries:
+            if fields.get("type") == "command_issued" and fields.get("command_id"):
+                command_ids[msg_id] = fields["command_id"]
+        busy = {cid for cid in command_ids.values() if cid in self._inflight}
+        claims = await self._claim_commands(
+            [cid for cid in dict.fromkeys(command_ids.values()) if cid not in busy])
+        claims.update(dict.fromkeys(busy, 2))
+
+        acks = list(extra_acks)
+        by_target = defaultdict(list)
+        dispatching = set()
+        for msg_id, data, fields in entries:
+            cid = command_ids.get(msg_id)
+            if cid is not None:
+                state = claims.get(cid)
+                if state == 1 or cid in dispatching:
+                    self.stats["duplicates"] += 1
+                    acks.append(msg_id)
+                    continue
+                if state == 2:
+                    self.stats["deferred"] += 1
+                    continue
+                dispatching.add(cid)
+            by_target[fields.get("target", "")].append((msg_id, data, fields))
+
+        self._inflight |= dispatching
+        renewer = (asyncio.create_task(self._renew_claims(list(dispatching)))
+                   if dispatching else None)
         try:
-            # Decode byte strings
-            decoded_data = {}
-            for k, v in data.items():
-                key = k.decode() if isinstance(k, bytes) else k
-                value = v.decode() if isinstance(v, bytes) else v
-                decoded_data[key] = value
+            await self._settle_batch(by_target, command_ids, dispatching, acks, dead_letter)
+        finally:
+            if renewer:
+                renewer.cancel()
+            self._inflight -= dispatching
+
+    async def _renew_claims(self, command_ids: list):
+        """Keep a slow batch's leases alive (every third of the lease) until it commits."""
+        while True:
+            await asyncio.sleep(self.claim_lease_ms / 3000)
+            try:
+                await self.redis.eval(
+                    _RENEW_CLAIMS_LUA, 0,
+                    self.consumer_name, self.claim_lease_ms, self.claim_prefix, *command_ids,
+                )
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                log_redis.warning(f"Claim renewal failed: {e}")
+
+    async def _settle_batch(self, by_target: dict, command_ids: dict, dispatching: set,
+                            acks: list, dead_letter: list):
+        """Dispatch the claimed entries, then commit + XACK in one MULTI."""
+        results = await asyncio.gather(
+            *(self._dispatch_ordered(group) for group in by_target.values())
+        )
+        delivered = []
+        for acked in results:
+            acks.extend(acked)
+            delivered.extend(command_ids[m] for m in acked if m in command_ids)
+        self.stats["failed"] += sum(map(len, by_target.values())) - sum(map(len, results))
+        delivered_set = set(delivered)
+        released = [cid for cid in dispatching if cid not in delivered_set]
+
+        if not acks and not dead_letter and not dispatching:
+            return
+        pipe = self.redis.pipeline(transaction=True)
+        if dispatching:
+            self._queue_commit(pipe, delivered, released)
+        for msg_id, data in dead_letter:
+            pipe.xadd(self.dlq_stream, data, maxlen=STREAM_MAXLEN, approximate=True)
+            acks.append(msg_id)
+        if acks:
+            pipe.xack(self.stream_name, self.group_name, *acks)
+        results = await pipe.execute()
+        if dispatching:
+            self.stats["lease_lost"] += len(delivered) - results[0]
+
+        self.stats["acked"] += len(acks)
+        self.stats["dead_lettered"] += len(dead_letter)
+        self.stats["batches"] += 1
+
+    async def _claim_commands(self, command_ids: list) -> dict:
+        """Lease command_ids for dispatch: {id: 0 claimed | 1 delivered | 2 busy}."""
+        if not command_ids:
+            return {}
+        states = await self.redis.eval(
+            _CLAIM_COMMANDS_LUA, 1, self.dedup_key,
+            self.consumer_name, self.claim_lease_ms, self.claim_prefix, *command_ids,
+        )
+        return dict(zip(command_ids, (int(s) for s in states)))
+
+    def _queue_commit(self, pipe, delivered: list, released: list):
+        """Add the delivered-mark / claim-release script to a MULTI pipeline."""
+        pipe.eval(
+            _COMMIT_COMMANDS_LUA, 1, self.dedup_key,
+            self.consumer_name, self.claim_prefix, time.time(), COMMAND_DEDUP_MAX,
+            len(delivered), *delivered, *released,
+        )
+
+    async def _dispatch_ordered(self, msgs: list) -> list:
+        """Process one target's entries in order; returns the IDs to ACK."""
+        acked = []
+        async with self._dispatch_slots:
+            for msg_id, data, fields in msgs:
+                if await self._process_stream_message(msg_id, data, fields):
+                    acked.append(msg_id)
+        return acked
+
+    @staticmethod
+    def _decode_fields(data: dict) -> dict:
+        """Text-decode stream fields; a v2 "cmd" payload stays raw bytes."""
+        decoded = {}
+        for k, v in data.items():
+            key = k.decode() if isinstance(k, bytes) else k
+            if isinstance(v, bytes) and key != "cmd":
+                v = v.decode()
+            decoded[key] = v
+        return decoded
+
+    async def _process_stream_message(self, msg_id, data: dict,
+                                      decoded_data: Optional[dict] = None) -> bool:
+        """Process a single stream message. Returns True when it can be ACKed."""
+        try:
+            if decoded_data is None:
+                decoded_data = self._decode_fields(data)
             
-            # Parse JSON payload
             message_type = decoded_data.get("type", "")
             target = decoded_data.get("target", "")
+
+            version = int(decoded_data.get("v", "1"))
+            if version > COMMAND_WIRE_VERSION:
+                # Leave it pending — a newer consumer can XAUTOCLAIM it
+                log_redis.warning(
+                    f"Message {msg_id} uses wire v{version} "
+                    f"(max supported v{COMMAND_WIRE_VERSION}), not ACKing"
+                )
+                return False
             
             if message_type == "command_issued" and target:
                 # Check if agent is connected via gRPC
                 if target in self.servicer.connected_agents:
-                    # Parse command details
-                    command_id = decoded_data.get("command_id", "")
-                    command_type = decoded_data.get("command_type", "")
-                    priority = int(decoded_data.get("priority", "5"))
-                    
-                    # Create gRPC directive
-                    directive = pb.OrchestratorDirective(
-                        directive_id=str(uuid.uuid4()),
-                        directive_type=pb.DIRECTIVE_TYPE_EXECUTE_TASK,
-                        timestamp=self.servicer._now_ts(),
-                        command=pb.TaskCommand(
-                            command_id=command_id,
-                            command_type=command_type,
-                            origin="cortex_redis_streams",
-                            priority=priority,
-                        ),
-                        routing=pb.RoutingInfo(target_agent=target),
-                        message=f"Task from Redis Streams: {command_type}",
-                    )
-                    
                     # Route to agent
-                    await self.servicer.connected_agents[target].directive_queue.put(directive)
+                    await self._deliver_local(target, decoded_data)
                     log_redis.info(
-                        f"✅ Redis Streams → gRPC: {command_id} → {target} "
+                        f"✅ Redis Streams → gRPC: {decoded_data.get('command_id', '')} → {target} "
                         f"(msg_id: {msg_id.decode() if isinstance(msg_id, bytes) else msg_id})"
                     )
-                    
-                    # ACK message - successfully processed
-                    await self.redis.xack(self.stream_name, self.group_name, msg_id)
-                    
-                    # Clear retry count
-                    if msg_id in self.retry_counts:
-                        del self.retry_counts[msg_id]
+                elif await self._forward_to_owner(target, decoded_data):
+                    # Another worker holds the agent's stream — it delivers
+                    pass
                 else:
                     # Agent not connected via gRPC - will be handled by REST fallback
                     log_redis.debug(f"Agent {target} not connected via gRPC, skipping")
-                    await self.redis.xack(self.stream_name, self.group_name, msg_id)
             else:
                 # Unknown message type or missing target - ACK to avoid reprocessing
                 log_redis.debug(f"Unknown message type: {message_type}, ACKing")
-                await self.redis.xack(self.stream_name, self.group_name, msg_id)
+            return True
                 
         except Exception as e:
             log_redis.error(f"Failed to process message {msg_id}: {e}")
-            
-            # Track retry count
-            if msg_id not in self.retry_counts:
-                self.retry_counts[msg_id] = 0
-            self.retry_counts[msg_id] += 1
-            
-            # Move to DLQ after max retries
-            if self.retry_counts[msg_id] >= self.max_retries:
-                log_redis.warning(
-                    f"⚠️  Message {msg_id} failed {self.max_retries} times, "
-                    f"moving to DLQ: {self.dlq_stream}"
-                )
-                try:
-                    # Copy to DLQ
-                    await self.redis.xadd(self.dlq_stream, data)
-                    # ACK original message
-                    await self.redis.xack(self.stream_name, self.group_name, msg_id)
-                    # Clear retry count
-                    del self.retry_counts[msg_id]
-                except Exception as dlq_error:
-                    log_redis.error(f"Failed to move message to DLQ: {dlq_error}")
-
-    async def _trim_stream(self):
-        """Trim stream to prevent unbounded growth."""
-        try:
-            # Keep last 10,000 messages (approximate)
-            await self.redis.xtrim(
-                self.stream_name, 
-                maxlen=10000, 
-                approximate=True
+            return False
+
+    # ── Pending-entry recovery ───────────────────────────────────────────────
+
+    async def _reclaim_loop(self):
+        """Periodically take over entries stuck in the PEL."""
+        while self._running:
+            await asyncio.sleep(STREAM_CLAIM_INTERVAL)
+            try:
+                reclaimed = await self.reclaim_pending()
+                if reclaimed:
+                    log_redis.info(f"♻️  Reclaimed {reclaimed} pending stream entries")
+                await self.prune_consumers()
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                log_redis.error(f"Pending recovery error: {e}")
+
+    async def reclaim_pending(self) -> int:
+        """
+        XAUTOCLAIM idle entries (any consumer, including dead pods) and
+        retry them. Entries past max_retries deliveries go to the DLQ.
+        """
+        start_id, total = "0-0", 0
+        while True:
+            result = await self.redis.xautoclaim(
+                self.stream_name, self.group_name, self.consumer_name,
+                min_idle_time=self.claim_idle_ms, start_id=start_id,
+                count=self.batch_size,
             )
-            log_redis.debug(f"Stream trimmed: {self.stream_name}")
-        except Exception as e:
-            log_redis.warning(f"Failed to trim stream: {e}")
+            start_id, claimed = result[0], result[1]
+
+            # Entries trimmed away while pending come back without fields
+            gone = [msg_id for msg_id, data in claimed if not data]
+            live = [(msg_id, data) for msg_id, data in claimed if data]
+            if live or gone:
+                deliveries = await self._delivery_counts([m for m, _ in live])
+                retry, dead = [], []
+                for msg_id, data in live:
+                    if deliveries.get(msg_id, 0) > self.max_retries:
+                        log_redis.warning(
+                            f"⚠️  Message {msg_id} delivered {deliveries[msg_id]} times, "
+                            f"moving to DLQ: {self.dlq_stream}"
+                        )
+                        dead.append((msg_id, data))
+                    else:
+                        retry.append((msg_id, data))
+                self.stats["reclaimed"] += len(claimed)
+                total += len(claimed)
+                await self._process_batch(retry, dead_letter=dead, extra_acks=gone)
+
+            if start_id in ("0-0", b"0-0"):
+                return total
+
+    async def prune_consumers(self) -> int:
+        """Delete group consumers left behind by dead processes (nothing pending)."""
+        pruned = 0
+        for c in await self.redis.xinfo_consumers(self.stream_name, self.group_name):
+            name = c["name"].decode() if isinstance(c["name"], bytes) else c["name"]
+            if (name != self.consumer_name and c["pending"] == 0
+                    and c["idle"] > STREAM_CONSUMER_PRUNE_MS):
+                await self.redis.xgroup_delconsumer(self.stream_name, self.group_name, name)
+                pruned += 1
+        return pruned
+
+    async def _delivery_counts(self, msg_ids: list) -> dict:
+        """PEL delivery counters for the given IDs, one pipelined round-trip."""
+        if not msg_ids:
+            return {}
+        pipe = self.redis.pipeline(transaction=False)
+        for msg_id in msg_ids:
+            pipe.xpending_range(self.stream_name, self.group_name,
+                                min=msg_id, max=msg_id, count=1)
+        counts = {}
+        for msg_id, rows in zip(msg_ids, await pipe.execute()):
+            if rows:
+                counts[msg_id] = rows[0]["times_delivered"]
+        return counts
+
+    def _build_task_directive(self, target: str,
+                              fields: dict) -> pb.OrchestratorDirective:
+        """Build an EXECUTE_TASK directive from decoded stream fields."""
+        directive = pb.OrchestratorDirective(
+            directive_id=str(uuid.uuid4()),
+            directive_type=pb.DIRECTIVE_TYPE_EXECUTE_TASK,
+            timestamp=self.servicer._now_ts(),
+            routing=pb.RoutingInfo(target_agent=target),
+        )
+        raw = fields.get("cmd")
+        if raw is not None:
+            # Wire v2 — producer already serialized the TaskCommand
+            directive.command.MergeFromString(raw)
+        else:
+            directive.command.command_id = fields.get("command_id", "")
+            directive.command.command_type = fields.get("command_type", "")
+            directive.command.priority = int(fields.get("priority", "5"))
+            directive.command.origin = fields.get("origin", "")
+        if not directive.command.origin:
+            directive.command.origin = "cortex_redis_streams"
+        directive.message = f"Task from Redis Streams: {directive.command.command_type}"
+        return directive
+
+    async def _deliver_local(self, target: str, fields: dict):
+        directive = self._build_task_directive(target, fields)
+        await self.servicer.connected_agents[target].directive_queue.put(directive)
+
+    async def _forward_to_owner(self, target: str, fields: dict) -> bool:
+        """Forward to the worker holding target's stream, if it is another one."""
+        if not self.registry:
+            return False
+        owner = await self.registry.owner_of(target)
+        if not owner or owner == self.registry.worker_id:
+            return False
+        if isinstance(fields.get("cmd"), bytes):
+            # Forward channel carries JSON — wrap the v2 payload
+            fields = dict(fields)
+            fields["cmd_b64"] = base64.b64encode(fields.pop("cmd")).decode()
+        if await self.registry.forward(owner, fields):
+            log_redis.info(
+                f"↪ Forwarded {fields.get('command_id', '')} → {target} "
+                f"(worker {owner})"
+            )
+            return True
+        # Nobody listening on that worker's channel — the entry is stale
+        log_redis.warning(f"Stale affinity for {target} → {owner}, evicting")
+        await self.registry.release(target, owner)
+        return False
+
+    async def _forward_listener_loop(self):
+        """Deliver directives that other workers forwarded to this one."""
+        retry_delay = 1
+        while self._running:
+            try:
+                pubsub = self.redis.pubsub()
+                await pubsub.subscribe(self.registry.forward_channel)
+                retry_delay = 1
+
+                async for msg in pubsub.listen():
+                    if not self._running:
+                        break
+                    if msg["type"] != "message":
+                        continue
+                    try:
+                        fields = json.loads(msg["data"])
+                    except (json.JSONDecodeError, TypeError):
+                        continue
+                    if "cmd_b64" in fields:
+                        fields["cmd"] = base64.b64decode(fields.pop("cmd_b64"))
+
+                    target = fields.get("target", "")
+                    if target in self.servicer.connected_agents:
+                        await self._deliver_local(target, fields)
+                        log_redis.info(
+                            f"✅ Forwarded → gRPC: {fields.get('command_id', '')} → {target}"
+                        )
+                    else:
+                        # Agent left between the owner lookup and delivery
+                        log_redis.warning(
+                            f"Forwarded command for {target} arrived after disconnect"
+                        )
+
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                log_redis.error(f"Forward listener error: {e}, retrying in {retry_delay}s")
+                await asyncio.sleep(retry_delay)
+                retry_delay = min(retry_delay * 2, 30)
+
+    async def _process_pubsub_command(self, data: dict):
+        """Deliver a Pub/Sub command_issued unless the stream already did."""
+        cid = data.get("command_id")
+        if data.get("type") != "command_issued" or not data.get("target") or not cid:
+            return
+        if (await self._claim_commands([cid])).get(cid) != 0:
+            self.stats["duplicates"] += 1
+            return
+        fields = {k: str(v) for k, v in data.items() if v is not None}
+        ok = await self._process_stream_message("pubsub", None, fields)
+        pipe = self.redis.pipeline(transaction=True)
+        self._queue_commit(pipe, [cid] if ok else [], [] if ok else [cid])
+        await pipe.execute()
 
     async def _legacy_pubsub_loop(self):
         """
         Legacy Pub/Sub listener for backward compatibility.
-        Runs in parallel with Streams consumer.
+        Runs in parallel with Streams consumer. With LEGACY_PUBSUB=commands
+        it also delivers nexus:commands, sharing the stream's claim/dedup.
         """
+        channels = ["nexus:events", "nexus:agents"]
+        if LEGACY_PUBSUB == "commands":
+            channels.append("nexus:commands")
         retry_delay = 1
         while self._running:
             try:
                 pubsub = self.redis.pubsub()
-                await pubsub.subscribe("nexus:events", "nexus:agents")
+                await pubsub.subscribe(*channels)
                 retry_delay = 1
 
                 async for msg in pubsub.listen():
@@ -872,8 +2239,9 @@ class RedisBridge:
                     except (json.JSONDecodeError, TypeError):
                         continue
 
-                    # Only handle non-command channels (commands now via Streams)
-                    if channel == "nexus:events":
+                    if channel == "nexus:commands":
+                        await self._process_pubsub_command(data)
+                    elif channel == "nexus:events":
                         log_redis.debug(f"Event: {data}")
                     elif channel == "nexus:agents":
                         log_redis.debug(f"Agent event: {data}")
@@ -896,12 +2264,25 @@ class StalenessReaper:
     Background task that monitors connected agents for pulse staleness.
     If an agent hasn't sent a pulse within STALENESS_THRESHOLD_SEC,
     marks it offline via Cortex — filling the production gap.
+
+    Deadlines live in the servicer's StalenessWheel, so each tick only
+    visits agents that actually expired. Reap latency (time between an
+    agent's deadline and its removal) is tracked in `stats` and reported
+    in GetSystemStatus (SystemSnapshot.reaper).
     """
 
     def __init__(self, servicer: NexusPulseServicer, cortex: CortexBridge):
         self.servicer = servicer
         self.cortex = cortex
+        self.wheel = servicer.staleness_wheel
         self._running = False
+        self._latencies = deque(maxlen=1024)
+        self.stats = {
+            "ticks": 0,
+            "reaped": 0,
+            "last_tick_ms": 0.0,
+            "reap_latency_ms_max": 0.0,
+        }
 
     async def start(self):
         self._running = True
@@ -911,49 +2292,90 @@ class StalenessReaper:
     async def stop(self):
         self._running = False
 
+    def reap_latency_ms(self, pct: float) -> float:
+        """Percentile of recent deadline→removal delays, in milliseconds."""
+        if not self._latencies:
+            return 0.0
+        ordered = sorted(self._latencies)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+    def snapshot_stats(self) -> pb.ReaperStats:
+        return pb.ReaperStats(
+            ticks=self.stats["ticks"],
+            reaped=self.stats["reaped"],
+            reap_latency_p50_ms=self.reap_latency_ms(50),
+            reap_latency_p99_ms=self.reap_latency_ms(99),
+            reap_latency_max_ms=self.stats["reap_latency_ms_max"],
+            last_tick_ms=self.stats["last_tick_ms"],
+        )
+
     async def _reap_loop(self):
         while self._running:
             await asyncio.sleep(STALENESS_CHECK_INTERVAL)
-            stale_agents = []
-
-            for agent_id, conn in list(self.servicer.connected_agents.items()):
-                if conn.idle_seconds > STALENESS_THRESHOLD_SEC:
-                    stale_agents.append(agent_id)
+            await self.reap()
+
+    async def reap(self) -> list:
+        """One reaper tick; returns the agent IDs marked offline."""
+        t0 = time.monotonic()
+        stale_agents = [
+            conn for conn in self.wheel.expire(t0)
+            if self.servicer.connected_agents.get(conn.agent_id) is conn
+        ]
+        self.stats["ticks"] += 1
+
+        for conn in stale_agents:
+            agent_id = conn.agent_id
+            latency_ms = (time.monotonic() - conn.deadline) * 1000
+            self._latencies.append(latency_ms)
+            self.stats["reaped"] += 1
+            self.stats["reap_latency_ms_max"] = max(
+                self.stats["reap_latency_ms_max"], latency_ms
+            )
+            log.warning(
+                f"⚠️ Agent {agent_id} stale "
+                f"({conn.idle_seconds:.0f}s silent, reaped {latency_ms:.0f}ms "
+                f"after deadline) — marking offline"
+            )
+            # Remove from connected pool
+            if self.servicer.connected_agents.get(agent_id) is conn:
+                del self.servicer.connected_agents[agent_id]
+                self.servicer.snapshot_cache.on_disconnect(agent_id)
+                if self.servicer.registry:
+                    await self.servicer.registry.release(agent_id)
+            await self.cortex.post_event(
+                agent_name=agent_id,
+                event_type="alert",
+                severity="high",
+                title=f"Agent {agent_id} marked offline (no pulse for {STALENESS_THRESHOLD_SEC}s)",
+            )
 
-            for agent_id in stale_agents:
-                log.warning(
-                    f"⚠️ Agent {agent_id} stale "
-                    f"({self.servicer.connected_agents[agent_id].idle_seconds:.0f}s silent) "
-                    f"— marking offline"
-                )
-                await self.cortex.post_event(
-                    agent_name=agent_id,
-                    event_type="alert",
-                    severity="high",
-                    title=f"Agent {agent_id} marked offline (no pulse for {STALENESS_THRESHOLD_SEC}s)",
-                )
-                # Remove from connected pool
-                if agent_id in self.servicer.connected_agents:
-                    del self.servicer.connected_agents[agent_id]
+        self.stats["last_tick_ms"] = (time.monotonic() - t0) * 1000
+        return [conn.agent_id for conn in stale_agents]
 
 
 # ═════════════════════════════════════════════════════════════════════════════
 # SERVER BOOTSTRAP
 # ═════════════════════════════════════════════════════════════════════════════
 
-async def serve():
+async def serve(worker_index: int = 0):
     """Initialize and run the Meta-Orchestrator gRPC server."""
 
     # ── Banner ───────────────────────────────────────────────────────────
     log.info("═" * 70)
     log.info("  NEXUS PRIME — Meta-Orchestrator v1.0.0")
     log.info("  Protocol: gRPC (HTTP/2) | Port: %d", GRPC_PORT)
+    log.info("  Worker: %d/%d (pid %d)", worker_index + 1,
+             max(ORCHESTRATOR_WORKERS, 1), os.getpid())
     log.info("  Cortex Bridge: %s", CORTEX_URL)
     log.info("  Redis Bridge: %s", REDIS_URL)
+    log.info("  Heartbeat flush: %.1fs", HEARTBEAT_FLUSH_INTERVAL_SEC)
     log.info("═" * 70)
 
     # ── Initialize clients ───────────────────────────────────────────────
-    cortex = CortexBridge(CORTEX_URL)
+    cortex = CortexBridge(
+        CORTEX_URL,
+        spill_path=os.path.join(CORTEX_SPILL_DIR, f"cortex_writes_w{worker_index}.jsonl"),
+    )
     await cortex.start()
 
     # Check Cortex health
@@ -972,7 +2394,8 @@ async def serve():
         log.warning(f"⚠️ Redis not reachable: {e} — will retry")
 
     # ── Create servicer ──────────────────────────────────────────────────
-    servicer = NexusPulseServicer(cortex, redis_client)
+    registry = AgentAffinityRegistry(redis_client)
+    servicer = NexusPulseServicer(cortex, redis_client, registry)
 
     # ── Create gRPC server ───────────────────────────────────────────────
     server = grpc.aio.server(
@@ -985,6 +2408,7 @@ async def serve():
             ("grpc.http2.max_pings_without_data", 0),
             ("grpc.http2.min_time_between_pings_ms", 10000),
             ("grpc.http2.min_ping_interval_without_data_ms", 5000),
+            ("grpc.so_reuseport", 1),                               # share port across workers
         ],
     )
 
@@ -1019,10 +2443,14 @@ async def serve():
     log.info(f"🚀 Meta-Orchestrator listening on {listen_addr}")
 
     # ── Start background services ────────────────────────────────────────
-    redis_bridge = RedisBridge(redis_client, servicer)
+    # Stream consumer gets a binary-safe client: wire v2 entries carry raw
+    # protobuf bytes that must not be UTF-8 decoded
+    stream_client = aioredis.from_url(REDIS_URL)
+    redis_bridge = RedisBridge(stream_client, servicer, registry)
     await redis_bridge.start()
 
     reaper = StalenessReaper(servicer, cortex)
+    servicer.reaper = reaper
     await reaper.start()
 
     # ── Register self in Cortex ──────────────────────────────────────────
@@ -1055,6 +2483,7 @@ async def serve():
     await server.stop(grace=5)
     await cortex.stop()
     await redis_client.aclose()
+    await stream_client.aclose()
     log.info("Meta-Orchestrator stopped. Farewell.")
 
 
@@ -1062,7 +2491,7 @@ async def serve():
 # ENTRYPOINT
 # ═════════════════════════════════════════════════════════════════════════════
 
-if __name__ == "__main__":
+def _install_uvloop():
     try:
         import uvloop
         uvloop.install()
@@ -1070,4 +2499,41 @@ if __name__ == "__main__":
     except ImportError:
         log.info("uvloop not available — using default asyncio loop")
 
-    asyncio.run(serve())
+
+def _run_worker(worker_index: int):
+    """Process entrypoint for one orchestrator worker."""
+    _install_uvloop()
+    asyncio.run(serve(worker_index))
+
+
+def main():
+    if ORCHESTRATOR_WORKERS <= 1:
+        _install_uvloop()
+        asyncio.run(serve())
+        return
+
+    # Spawn (not fork): gRPC core must not be inherited across fork()
+    ctx = multiprocessing.get_context("spawn")
+    workers = [
+        ctx.Process(target=_run_worker, args=(i,), name=f"orchestrator-worker-{i}")
+        for i in range(ORCHESTRATOR_WORKERS)
+    ]
+    for w in workers:
+        w.start()
+    log.info(f"Started {len(workers)} orchestrator workers on port {GRPC_PORT} (SO_REUSEPORT)")
+
+    def _forward_signal(signum, frame):
+        for w in workers:
+            if w.is_alive():
+                os.kill(w.pid, signum)
+
+    signal.signal(signal.SIGTERM, _forward_signal)
+    signal.signal(signal.SIGINT, _forward_signal)
+
+    for w in workers:
+        w.join()
+    log.info("All orchestrator workers stopped.")
+
+
+if __name__ == "__main__":
+    main()
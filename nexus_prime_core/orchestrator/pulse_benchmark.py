@@ -0,0 +1,366 @@
+"""
+═══════════════════════════════════════════════════════════════════════════════
+NEXUS PRIME CORE — In-Process Pulse Servicer Benchmark Harness
+═══════════════════════════════════════════════════════════════════════════════
+Runs NexusPulseServicer + RedisBridge in this process against a stubbed
+Cortex (httpx MockTransport, optional latency) and fakeredis, then drives it
+with N simulated agents shaped like agent_client_v2.NexusAgentClient:
+
+  • REGISTRATION pulse first, then HEARTBEATs at --rate Hz (real AgentMetrics)
+  • EXECUTE_TASK directives answered with TASK_RESULT pulses after
+    --task-ms, failing with probability --failure-ratio
+  • Commands injected into nexus:commands:stream at --command-rate per second
+
+Agents live in --client-procs separate processes so CPU/RSS figures belong to
+the orchestrator side (plus the fakeredis server thread) only.
+
+Reports p50/p99 pulse→ACK latency, pulses/s, directives/s, server CPU and RSS
+as JSON (with the git revision) so results can be diffed across commits.
+
+Usage:
+    python pulse_benchmark.py --agents 500 --rate 2 --duration 20 \\
+        --command-rate 200 --output /tmp/pulse_bench.json
+═══════════════════════════════════════════════════════════════════════════════
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import multiprocessing
+import os
+import random
+import resource
+import subprocess
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+import grpc
+import httpx
+import redis.asyncio as aioredis
+from fakeredis import TcpFakeServer
+from google.protobuf import struct_pb2
+
+import nexus_pulse_pb2 as pb
+import nexus_pulse_pb2_grpc as pb_grpc
+import orchestrator_server as orch
+
+
+# ═════════════════════════════════════════════════════════════════════════════
+# SIMULATED AGENTS — run inside client processes
+# ═════════════════════════════════════════════════════════════════════════════
+
+async def _agent(host: str, agent_id: str, args, stats: dict, latencies: list):
+    """One agent_client_v2-style agent on its own channel."""
+    outbox: asyncio.Queue = asyncio.Queue()
+    sent_at = {}
+    seq = 0
+    started = time.monotonic()
+    deadline = started + args.duration
+    interval = 1.0 / args.rate
+
+    def _heartbeat() -> pb.AgentPulse:
+        return pb.AgentPulse(
+            agent_id=agent_id,
+            pulse_type=pb.PULSE_TYPE_HEARTBEAT,
+            state=pb.AgentState(
+                status=pb.AGENT_STATUS_IDLE,
+                metrics=pb.AgentMetrics(
+                    cpu_usage_percent=random.uniform(5, 60),
+                    memory_usage_percent=random.uniform(20, 70),
+                    uptime_seconds=time.monotonic() - started,
+                ),
+            ),
+        )
+
+    async def _pulses():
+        nonlocal seq
+        seq += 1
+        sent_at[str(seq)] = time.perf_counter()
+        yield pb.AgentPulse(
+            agent_id=agent_id,
+            pulse_type=pb.PULSE_TYPE_REGISTRATION,
+            capabilities=["bench"],
+            agent_type=pb.AGENT_TYPE_SERVICE,
+            display_name=agent_id,
+            sequence_number=seq,
+        )
+        stats["sent"] += 1
+        # Spread heartbeat phases so agents don't beat in lockstep
+        await asyncio.sleep(random.uniform(0, interval))
+        while time.monotonic() < deadline:
+            try:
+                pulse = await asyncio.wait_for(outbox.get(), timeout=interval)
+            except asyncio.TimeoutError:
+                pulse = _heartbeat()
+            seq += 1
+            pulse.sequence_number = seq
+            pulse.timestamp.FromNanoseconds(time.time_ns())
+            if pulse.pulse_type == pb.PULSE_TYPE_HEARTBEAT:
+                sent_at[str(seq)] = time.perf_counter()
+            stats["sent"] += 1
+            yield pulse
+
+    async def _finish_task(cmd: pb.TaskCommand):
+        await asyncio.sleep(args.task_ms / 1000)
+        failed = random.random() < args.failure_ratio
+        output = struct_pb2.Struct()
+        output.update({"status": "failed" if failed else "success"})
+        await outbox.put(pb.AgentPulse(
+            agent_id=agent_id,
+            pulse_type=pb.PULSE_TYPE_TASK_RESULT,
+            result=pb.TaskResult(
+                command_id=cmd.command_id,
+                status=pb.TASK_STATUS_FAILED if failed else pb.TASK_STATUS_SUCCESS,
+                output=output,
+                error_message="simulated failure" if failed else "",
+                execution_time_ms=args.task_ms,
+                executing_agent=agent_id,
+            ),
+        ))
+        stats["results"] += 1
+
+    channel = grpc.aio.insecure_channel(host)
+    stub = pb_grpc.NexusPulseServiceStub(channel)
+    try:
+        async for directive in stub.Pulse(_pulses()):
+            dt = directive.directive_type
+            if dt == pb.DIRECTIVE_TYPE_ACK:
+                stats["acks"] += 1
+                t0 = sent_at.pop(directive.ack_for_pulse_id, None)
+                if t0 is not None:
+                    latencies.append((time.perf_counter() - t0) * 1000)
+            elif dt == pb.DIRECTIVE_TYPE_EXECUTE_TASK:
+                stats["tasks"] += 1
+                asyncio.create_task(_finish_task(directive.command))
+    except grpc.aio.AioRpcError:
+        stats["errors"] += 1
+    finally:
+        await channel.close()
+
+
+async def _client_main(host: str, agent_ids: list, args) -> dict:
+    stats = {"sent": 0, "acks": 0, "tasks": 0, "results": 0, "errors": 0}
+    latencies: list = []
+    tasks = []
+    for i, agent_id in enumerate(agent_ids):
+        tasks.append(asyncio.create_task(_agent(host, agent_id, args, stats, latencies)))
+        if i % 50 == 49:
+            await asyncio.sleep(0.01)
+    await asyncio.gather(*tasks, return_exceptions=True)
+    stats["latencies"] = latencies
+    return stats
+
+
+def _client_proc(host, agent_ids, args, out_queue):
+    out_queue.put(asyncio.run(_client_main(host, agent_ids, args)))
+
+
+# ═════════════════════════════════════════════════════════════════════════════
+# IN-PROCESS ORCHESTRATOR
+# ═════════════════════════════════════════════════════════════════════════════
+
+def _stub_cortex_transport(latency_ms: float, counters: dict) -> httpx.MockTransport:
+    """Answers every Cortex endpoint the bridge uses, after latency_ms."""
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        counters[request.url.path] = counters.get(request.url.path, 0) + 1
+        if latency_ms:
+            await asyncio.sleep(latency_ms / 1000)
+        path = request.url.path
+        if path == "/dashboard":
+            return httpx.Response(200, json={"agents": [], "stats": {}})
+        if path == "/command":
+            return httpx.Response(200, json={"command_id": f"stub-{time.time_ns()}"})
+        return httpx.Response(200, json={"status": "ok"})
+
+    return httpx.MockTransport(handler)
+
+
+def _rss_mb() -> float:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except (OSError, ValueError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _cpu_seconds() -> float:
+    ru = resource.getrusage(resource.RUSAGE_SELF)
+    return ru.ru_utime + ru.ru_stime
+
+
+async def _inject_commands(redis, stream: str, agent_ids: list, rate: float,
+                           duration: float) -> int:
+    """XADD EXECUTE_TASK commands for random agents at `rate` per second."""
+    if rate <= 0:
+        return 0
+    issued, t0 = 0, time.monotonic()
+    while time.monotonic() - t0 < duration:
+        due = int((time.monotonic() - t0) * rate) - issued
+        for _ in range(due):
+            await redis.xadd(stream, {
+                "type": "command_issued",
+                "target": random.choice(agent_ids),
+                "command_id": f"bench-{issued}",
+                "command_type": "bench_task",
+                "priority": "5",
+            }, maxlen=orch.STREAM_MAXLEN, approximate=True)
+            issued += 1
+        await asyncio.sleep(0.01)
+    return issued
+
+
+async def run_benchmark(args) -> dict:
+    for name in ("nexus", "grpc"):
+        logging.getLogger(name).setLevel(logging.WARNING)
+
+    # Orchestrator wired exactly as serve() does, minus the network deps
+    counters: dict = {}
+    cortex = orch.CortexBridge("http://cortex.stub", heartbeat_flush_interval=args.flush_interval)
+    await cortex.start()
+    await cortex._client.aclose()
+    cortex._client = httpx.AsyncClient(
+        base_url="http://cortex.stub",
+        transport=_stub_cortex_transport(args.cortex_latency_ms, counters),
+    )
+
+    # fakeredis behind a real socket: in-process FakeRedis would block the
+    # event loop on XREADGROUP BLOCK
+    fake_redis = TcpFakeServer(("127.0.0.1", 0))
+    threading.Thread(target=fake_redis.serve_forever, daemon=True).start()
+    redis_url = "redis://%s:%d/0" % fake_redis.server_address
+    redis_text = aioredis.from_url(redis_url, decode_responses=True)
+    redis_bin = aioredis.from_url(redis_url)
+    servicer = orch.NexusPulseServicer(cortex, redis_text)
+    bridge = orch.RedisBridge(redis_bin, servicer)
+    await bridge.start()
+
+    server = grpc.aio.server(options=[
+        ("grpc.max_concurrent_streams", 10000),
+        ("grpc.keepalive_time_ms", 30000),
+    ])
+    pb_grpc.add_NexusPulseServiceServicer_to_server(servicer, server)
+    port = server.add_insecure_port(f"127.0.0.1:{args.port}")
+    await server.start()
+    host = f"127.0.0.1:{port}"
+
+    agent_ids = [f"BENCH-{i:05d}" for i in range(args.agents)]
+    shards = [agent_ids[i::args.client_procs] for i in range(args.client_procs)]
+    ctx = multiprocessing.get_context("spawn")
+    out_queue = ctx.Queue()
+    procs = [ctx.Process(target=_client_proc, args=(host, shard, args, out_queue))
+             for shard in shards if shard]
+
+    rss_before = _rss_mb()
+    cpu0, wall0 = _cpu_seconds(), time.monotonic()
+    for p in procs:
+        p.start()
+
+    # Let streams come up, then inject commands for the rest of the run
+    await asyncio.sleep(min(2.0, args.duration / 4))
+    issued = await _inject_commands(redis_bin, bridge.stream_name, agent_ids,
+                                    args.command_rate, args.duration - min(2.0, args.duration / 4))
+    rss_peak_streams = _rss_mb()
+
+    loop = asyncio.get_running_loop()
+    partials = [await loop.run_in_executor(None, out_queue.get) for _ in procs]
+    for p in procs:
+        await loop.run_in_executor(None, p.join)
+    cpu_s, wall_s = _cpu_seconds() - cpu0, time.monotonic() - wall0
+
+    # Background Redis loops notice the shutdown as connection errors
+    logging.getLogger("nexus").setLevel(logging.CRITICAL)
+    await bridge.stop()
+    await server.stop(grace=1)
+    await cortex.stop()
+    await redis_text.aclose()
+    await redis_bin.aclose()
+    fake_redis.shutdown()
+
+    latencies = sorted(l for part in partials for l in part["latencies"])
+    total = {k: sum(p[k] for p in partials) for k in ("sent", "acks", "tasks", "results", "errors")}
+
+    def pct(p: float) -> float:
+        if not latencies:
+            return 0.0
+        return round(latencies[min(len(latencies) - 1, int(len(latencies) * p / 100))], 3)
+
+    return {
+        "agents": args.agents,
+        "pulses_sent": total["sent"],
+        "pulses_per_sec": round(total["sent"] / args.duration, 1),
+        "acks_received": total["acks"],
+        "ack_latency_p50_ms": pct(50),
+        "ack_latency_p99_ms": pct(99),
+        "commands_issued": issued,
+        "directives_delivered": total["tasks"],
+        "directives_per_sec": round(total["tasks"] / args.duration, 1),
+        "task_results_sent": total["results"],
+        "stream_errors": total["errors"],
+        "server_cpu_percent": round(100 * cpu_s / wall_s, 1) if wall_s else 0.0,
+        "server_rss_mb": round(rss_peak_streams, 1),
+        "server_rss_growth_mb": round(rss_peak_streams - rss_before, 1),
+        "cortex_requests": counters,
+        "heartbeat_stats": cortex.heartbeat_stats,
+        "stream_stats": bridge.stats,
+    }
+
+
+def _git_revision() -> str:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=os.path.dirname(os.path.abspath(__file__)), stderr=subprocess.DEVNULL,
+        ).decode().strip()
+    except Exception:
+        return "unknown"
+
+
+# ═════════════════════════════════════════════════════════════════════════════
+# MAIN
+# ═════════════════════════════════════════════════════════════════════════════
+
+def main():
+    parser = argparse.ArgumentParser(description="In-process Pulse servicer benchmark")
+    parser.add_argument("--agents", type=int, default=200)
+    parser.add_argument("--rate", type=float, default=2.0, help="heartbeats/s per agent")
+    parser.add_argument("--duration", type=float, default=15.0, help="seconds")
+    parser.add_argument("--command-rate", type=float, default=50.0,
+                        help="commands/s injected into the Redis stream")
+    parser.add_argument("--task-ms", type=int, default=50, help="simulated task duration")
+    parser.add_argument("--failure-ratio", type=float, default=0.1)
+    parser.add_argument("--cortex-latency-ms", type=float, default=5.0)
+    parser.add_argument("--flush-interval", type=float,
+                        default=orch.HEARTBEAT_FLUSH_INTERVAL_SEC)
+    parser.add_argument("--client-procs", type=int,
+                        default=max(1, (os.cpu_count() or 2) // 2))
+    parser.add_argument("--port", type=int, default=0, help="0 = pick a free port")
+    parser.add_argument("--output", default="/tmp/nexus_pulse_benchmark.json")
+    args = parser.parse_args()
+
+    print("═" * 70)
+    print("  NEXUS PRIME — In-Process Pulse Servicer Benchmark")
+    print(f"  Agents: {args.agents} @ {args.rate} Hz | Commands: {args.command_rate}/s "
+          f"| Duration: {args.duration}s | Cortex latency: {args.cortex_latency_ms}ms")
+    print("═" * 70)
+
+    results = asyncio.run(run_benchmark(args))
+    print(f"  pulses/s={results['pulses_per_sec']}  "
+          f"ack p50={results['ack_latency_p50_ms']}ms p99={results['ack_latency_p99_ms']}ms")
+    print(f"  directives/s={results['directives_per_sec']} "
+          f"({results['directives_delivered']}/{results['commands_issued']} delivered)")
+    print(f"  server CPU={results['server_cpu_percent']}%  RSS={results['server_rss_mb']}MB "
+          f"(+{results['server_rss_growth_mb']}MB)  stream errors={results['stream_errors']}")
+
+    with open(args.output, "w") as f:
+        json.dump({"revision": _git_revision(), "config": vars(args),
+                   "results": results}, f, indent=2)
+    print(f"\n  📄 JSON report saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+"""
+═══════════════════════════════════════════════════════════════════════════════
+NEXUS PRIME CORE — Redis Streams Command Consumer Benchmark
+═══════════════════════════════════════════════════════════════════════════════
+Measures how many nexus:commands:stream entries per second RedisBridge
+drains into gRPC directive queues.
+
+Scenarios:
+  • legacy      — XREADGROUP count=10, sequential dispatch, one XACK per entry
+  • batch=<N>   — XREADGROUP count=N, one command_id claim per batch,
+                  concurrent per-target dispatch, one MULTI (delivered
+                  mark + XACK) per batch
+
+Each scenario gets a fresh stream/group, pre-filled with --messages entries
+(XADD MAXLEN ~ in pipelines) spread over --agents connected agents.
+
+Usage:
+    REDIS_URL=redis://localhost:6379/0 python stream_benchmark.py \\
+        --messages 50000 --agents 200 --batches 10,100,500
+═══════════════════════════════════════════════════════════════════════════════
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+import redis.asyncio as aioredis
+
+import orchestrator_server as orch
+
+logging.getLogger("nexus").setLevel(logging.WARNING)
+
+
+class _BenchServicer:
+    """Just enough of NexusPulseServicer for RedisBridge to deliver into."""
+
+    def __init__(self, agent_ids: list):
+        self.registry = None
+        self.connected_agents = {}
+        for agent_id in agent_ids:
+            conn = orch.ConnectedAgent(agent_id)
+            # Unbounded enough that overflow policy never kicks in
+            conn.directive_queue = orch.DirectiveQueue(agent_id, maxsize=10**7)
+            self.connected_agents[agent_id] = conn
+
+    _now_ts = staticmethod(orch.NexusPulseServicer._now_ts)
+
+    def delivered(self) -> int:
+        return sum(a.directive_queue.qsize() for a in self.connected_agents.values())
+
+
+async def _fill_stream(redis, stream: str, messages: int, agent_ids: list):
+    pipe = redis.pipeline(transaction=False)
+    for i in range(messages):
+        pipe.xadd(stream, {
+            "type": "command_issued",
+            "target": agent_ids[i % len(agent_ids)],
+            "command_id": f"{stream}:{i}",
+            "command_type": "bench_task",
+            "priority": "5",
+        }, maxlen=max(messages, orch.STREAM_MAXLEN), approximate=True)
+        if len(pipe) >= 1000:
+            await pipe.execute()
+    await pipe.execute()
+
+
+async def _drain_legacy(bridge: orch.RedisBridge, messages: int):
+    """The pre-batching consumer: 10 per read, sequential, one XACK each."""
+    done = 0
+    while done < messages:
+        resp = await bridge.redis.xreadgroup(
+            bridge.group_name, bridge.consumer_name,
+            {bridge.stream_name: ">"}, count=10, block=1000,
+        )
+        if not resp:
+            break
+        for _, msgs in resp:
+            for msg_id, data in msgs:
+                if await bridge._process_stream_message(msg_id, data):
+                    await bridge.redis.xack(bridge.stream_name, bridge.group_name, msg_id)
+                done += 1
+
+
+async def _drain_batched(bridge: orch.RedisBridge, messages: int):
+    while bridge.stats["read"] < messages:
+        resp = await bridge.redis.xreadgroup(
+            bridge.group_name, bridge.consumer_name,
+            {bridge.stream_name: ">"}, count=bridge.batch_size, block=1000,
+        )
+        if not resp:
+            break
+        for _, msgs in resp:
+            bridge.stats["read"] += len(msgs)
+            await bridge._process_batch(msgs)
+
+
+async def run_scenario(redis, name: str, batch_size: int, args) -> dict:
+    agent_ids = [f"BENCH-{i:04d}" for i in range(args.agents)]
+    servicer = _BenchServicer(agent_ids)
+    bridge = orch.RedisBridge(redis, servicer, batch_size=batch_size,
+                              concurrency=args.concurrency)
+    bridge.stream_name = f"nexus:bench:stream:{name}"
+    bridge.group_name = "bench_group"
+    bridge.dedup_key = f"nexus:bench:delivered:{name}"
+
+    await redis.delete(bridge.stream_name, bridge.dedup_key)
+    await _fill_stream(redis, bridge.stream_name, args.messages, agent_ids)
+    await redis.xgroup_create(bridge.stream_name, bridge.group_name, id="0")
+
+    t0 = time.perf_counter()
+    if name == "legacy":
+        await _drain_legacy(bridge, args.messages)
+    else:
+        await _drain_batched(bridge, args.messages)
+    elapsed = time.perf_counter() - t0
+
+    pending = (await redis.xpending(bridge.stream_name, bridge.group_name))["pending"]
+    await redis.delete(bridge.stream_name, bridge.dedup_key)
+    return {
+        "scenario": name,
+        "batch_size": batch_size,
+        "messages": args.messages,
+        "delivered": servicer.delivered(),
+        "pending_after": pending,
+        "elapsed_s": round(elapsed, 3),
+        "msgs_per_sec": round(args.messages / elapsed, 1) if elapsed else 0.0,
+    }
+
+
+async def main_async(args) -> list:
+    redis = aioredis.from_url(args.redis_url, decode_responses=True)
+    results = []
+    try:
+        scenarios = [("legacy", 10)] + [
+            (f"batch={b}", b) for b in (int(x) for x in args.batches.split(",") if x)
+        ]
+        for name, batch_size in scenarios:
+            r = await run_scenario(redis, name, batch_size, args)
+            results.append(r)
+            print(f"  {r['scenario']:<12} {r['msgs_per_sec']:>10} msg/s  "
+                  f"delivered={r['delivered']:<7} pending={r['pending_after']}")
+    finally:
+        await redis.aclose()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Redis Streams consumer throughput")
+    parser.add_argument("--redis-url", default=os.getenv("REDIS_URL", "redis://localhost:6379/0"))
+    parser.add_argument("--messages", type=int, default=20000)
+    parser.add_argument("--agents", type=int, default=100)
+    parser.add_argument("--batches", default="10,100,500")
+    parser.add_argument("--concurrency", type=int, default=orch.STREAM_CONCURRENCY)
+    parser.add_argument("--output", default="/tmp/nexus_stream_benchmark.json")
+    args = parser.parse_args()
+
+    print("═" * 70)
+    print("  NEXUS PRIME — Redis Streams Consumer Benchmark")
+    print(f"  Messages: {args.messages} | Agents: {args.agents} "
+          f"| Concurrency: {args.concurrency}")
+    print("═" * 70)
+
+    results = asyncio.run(main_async(args))
+
+    base = results[0]["msgs_per_sec"] if results else 0
+    if base:
+        for r in results:
+            r["speedup_vs_legacy"] = round(r["msgs_per_sec"] / base, 2)
+        print("\n  Speedup: " + ", ".join(
+            f"{r['scenario']}={r['speedup_vs_legacy']}x" for r in results))
+
+    with open(args.output, "w") as f:
+        json.dump({"config": vars(args), "results": results}, f, indent=2)
+    print(f"\n  📄 JSON report saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
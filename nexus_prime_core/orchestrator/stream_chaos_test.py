@@ -0,0 +1,379 @@
+"""
+═══════════════════════════════════════════════════════════════════════════════
+NEXUS PRIME CORE — Command Stream Chaos Test (no loss, no duplicates)
+═══════════════════════════════════════════════════════════════════════════════
+Runs --consumers RedisBridge consumer processes on a scratch command stream
+while the parent:
+  1. XADDs --commands command_issued entries, re-XADDing --dup-rate of them
+     later under the same command_id (a producer retry after a timeout)
+  2. SIGKILLs a random consumer every --kill-every seconds — mid-batch, with
+     entries read, claimed and partly dispatched — and starts a replacement
+     under a new consumer name
+  3. Waits for the survivors to XAUTOCLAIM what the dead ones left behind
+
+The originals are XADDed through Cortex's own enqueue_commands over a Redis
+client that refuses (or loses the reply to) --xadd-fail-rate of pipelines.
+Batches refused on both attempts go to Cortex's command outbox (kept in
+memory here instead of nexus_core.command_outbox) and must reach the stream
+through command_outbox_relay: the producer side of "no loss".
+
+Every consumer records each directive it actually dispatches — at the
+directive-queue put, before any commit — as "command_id|consumer". The test
+passes when every command_id was dispatched, no command_id was dispatched
+twice by consumers that survived (their commits are what exactly-once
+promises), and nothing is left pending. Repeat dispatches where an earlier
+one came from a consumer killed before it could commit are the crash window
+every at-least-once transport has; they are counted and reported.
+
+Usage:
+    REDIS_URL=redis://localhost:6379/0 python stream_chaos_test.py \\
+        --commands 5000 --consumers 4 --kill-every 0.5
+    python stream_chaos_test.py --fake      (in-process fakeredis server)
+═══════════════════════════════════════════════════════════════════════════════
+"""
+
+import argparse
+import asyncio
+import importlib.util
+import json
+import logging
+import multiprocessing
+import os
+import random
+import signal
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+import redis.asyncio as aioredis
+
+import orchestrator_server as orch
+
+
+# ═════════════════════════════════════════════════════════════════════════════
+# CONSUMER — runs inside each consumer process
+# ═════════════════════════════════════════════════════════════════════════════
+
+class _SlowQueue(orch.DirectiveQueue):
+    """
+    Directive queue with a little dispatch latency, so kills land mid-batch.
+    Every put is recorded in Redis: this is the real dispatch point.
+    """
+
+    def __init__(self, agent_id: str, redis, deliveries_key: str, consumer: str, **kwargs):
+        super().__init__(agent_id, **kwargs)
+        self.redis = redis
+        self.deliveries_key = deliveries_key
+        self.consumer = consumer
+
+    async def put(self, directive):
+        await asyncio.sleep(random.uniform(0, 0.002))
+        await super().put(directive)
+        await self.redis.rpush(self.deliveries_key,
+                               f"{directive.command.command_id}|{self.consumer}")
+
+
+class _ChaosServicer:
+    def __init__(self, agent_ids: list, redis, deliveries_key: str, consumer: str):
+        self.registry = None
+        self.connected_agents = {}
+        for agent_id in agent_ids:
+            conn = orch.ConnectedAgent(agent_id)
+            conn.directive_queue = _SlowQueue(agent_id, redis, deliveries_key, consumer,
+                                              maxsize=10**7)
+            self.connected_agents[agent_id] = conn
+
+    _now_ts = staticmethod(orch.NexusPulseServicer._now_ts)
+
+
+def _bridge(redis, names: dict, consumer: str, agent_ids: list, args) -> orch.RedisBridge:
+    servicer = _ChaosServicer(agent_ids, redis, names["deliveries"], consumer)
+    bridge = orch.RedisBridge(redis, servicer, batch_size=args.batch_size)
+    bridge.stream_name = names["stream"]
+    bridge.group_name = names["group"]
+    bridge.dlq_stream = names["dlq"]
+    bridge.dedup_key = names["delivered"]
+    bridge.claim_prefix = names["claim"]
+    bridge.consumer_name = consumer
+    bridge.claim_idle_ms = args.claim_idle_ms
+    bridge.claim_lease_ms = args.claim_idle_ms
+    bridge.max_retries = 10**6        # a killed delivery is not a poison message
+    return bridge
+
+
+async def _consume(redis_url: str, names: dict, consumer: str, agent_ids: list, args):
+    orch.STREAM_CLAIM_INTERVAL = args.claim_idle_ms / 2000
+    redis = aioredis.from_url(redis_url)
+    bridge = _bridge(redis, names, consumer, agent_ids, args)
+    bridge._running = True
+    await asyncio.gather(bridge._stream_consumer_loop(), bridge._reclaim_loop())
+
+
+def _consumer_proc(redis_url, names, consumer, agent_ids, args):
+    logging.getLogger("nexus").setLevel(logging.CRITICAL)
+    asyncio.run(_consume(redis_url, names, consumer, agent_ids, args))
+
+
+# ═════════════════════════════════════════════════════════════════════════════
+# PRODUCER + CHAOS
+# ═════════════════════════════════════════════════════════════════════════════
+
+async def _produce(redis, cortex, names: dict, agent_ids: list, args) -> list:
+    ids = [f"chaos-{uuid.uuid4()}" for _ in range(args.commands)]
+    fields = {cid: cortex.command_stream_fields(cid, "chaos_task", "chaos", 5,
+                                                random.choice(agent_ids), 1)
+              for cid in ids}
+    cortex.command_outbox.fields.update(fields)
+    # Originals: Cortex's enqueue path over the flaky client, 10 per call
+    for start in range(0, len(ids), 10):
+        await cortex.enqueue_commands([fields[cid] for cid in ids[start:start + 10]])
+        if start % 100 == 90:
+            await asyncio.sleep(args.produce_interval)
+    # Retries land after their originals, straight onto the stream
+    retries = random.sample(ids, int(len(ids) * args.dup_rate))
+    for start in range(0, len(retries), 100):
+        pipe = redis.pipeline(transaction=False)
+        for cid in retries[start:start + 100]:
+            pipe.xadd(names["stream"], fields[cid])
+        await pipe.execute()
+    return ids
+
+
+class _FlakyPipeline:
+    def __init__(self, pipe, rate: float):
+        self._pipe, self.rate = pipe, rate
+
+    def __getattr__(self, name):
+        return getattr(self._pipe, name)
+
+    async def execute(self):
+        roll = random.random()
+        if roll < self.rate / 2:
+            raise ConnectionError("chaos: pipeline refused")
+        result = await self._pipe.execute()
+        if roll < self.rate:
+            raise ConnectionError("chaos: reply lost")   # landed anyway
+        return result
+
+
+class _FlakyRedis:
+    """Redis client whose pipelines fail at `rate`, half of them after executing"""
+
+    def __init__(self, redis, rate: float):
+        self._redis, self.rate = redis, rate
+
+    def __getattr__(self, name):
+        return getattr(self._redis, name)
+
+    def pipeline(self, **kwargs):
+        return _FlakyPipeline(self._redis.pipeline(**kwargs), self.rate)
+
+
+def _load_cortex(redis, names: dict, args):
+    """nexus_cortex/main.py wired to the scratch stream and an in-memory outbox"""
+    path = os.path.join(os.path.dirname(__file__), "..", "..", "nexus_cortex", "main.py")
+    spec = importlib.util.spec_from_file_location("nexus_cortex_main", path)
+    cortex = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(cortex)
+
+    class MemoryOutbox(cortex.CommandOutbox):
+        def __init__(self):
+            super().__init__()
+            self.fields: dict = {}               # command_id → stream fields (all)
+            self.rows: dict = {}                 # deferred ones
+
+        async def add(self, command_ids):
+            for cid in command_ids:
+                self.rows.setdefault(cid, self.fields[cid])
+            self.counters["deferred"] += len(command_ids)
+
+        async def due(self, limit):
+            return [{"id": cid, "command_type": f["command_type"], "origin": f["origin"],
+                     "priority": int(f["priority"]), "target_agent": f["target"],
+                     "status": "queued"} for cid, f in list(self.rows.items())[:limit]]
+
+        async def done(self, command_ids):
+            for cid in command_ids:
+                self.rows.pop(cid, None)
+            self.counters["relayed"] += len(command_ids)
+
+        async def failed(self, command_ids):
+            self.counters["relay_errors"] += 1
+
+    cortex.redis_pool = _FlakyRedis(redis, args.xadd_fail_rate)
+    cortex.COMMAND_STREAM = names["stream"]
+    cortex.COMMAND_WIRE_FORMAT = "json"
+    cortex.COMMAND_OUTBOX_RETRY_SEC = 0.2
+    cortex.command_outbox = MemoryOutbox()
+    return cortex
+
+
+def _spawn(ctx, redis_url, names, slot, generation, agent_ids, args):
+    consumer = f"chaos_{slot}_g{generation}"
+    p = ctx.Process(target=_consumer_proc,
+                    args=(redis_url, names, consumer, agent_ids, args), daemon=True)
+    p.start()
+    return p, consumer
+
+
+async def run(redis_url: str, args) -> dict:
+    token = uuid.uuid4().hex[:8]
+    names = {
+        "stream": f"nexus:chaos:{token}:stream",
+        "group": "chaos_group",
+        "dlq": f"nexus:chaos:{token}:dlq",
+        "delivered": f"nexus:chaos:{token}:delivered",
+        "claim": f"nexus:chaos:{token}:claim:",
+        "deliveries": f"nexus:chaos:{token}:deliveries",
+    }
+    agent_ids = [f"CHAOS-{i:03d}" for i in range(args.agents)]
+    redis = aioredis.from_url(redis_url, decode_responses=True)
+    await redis.xgroup_create(names["stream"], names["group"], id="0", mkstream=True)
+
+    ctx = multiprocessing.get_context("spawn")
+    procs, consumers = {}, {}
+    for slot in range(args.consumers):
+        procs[slot], consumers[slot] = _spawn(ctx, redis_url, names, slot, 0, agent_ids, args)
+    generation, kills = 0, 0
+    killed = set()
+    stop_chaos = asyncio.Event()
+
+    async def chaos():
+        nonlocal generation, kills
+        while not stop_chaos.is_set():
+            await asyncio.sleep(args.kill_every)
+            if stop_chaos.is_set():
+                break
+            slot = random.choice(list(procs))
+            os.kill(procs[slot].pid, signal.SIGKILL)
+            procs[slot].join()
+            killed.add(consumers[slot])
+            kills += 1
+            generation += 1
+            procs[slot], consumers[slot] = _spawn(ctx, redis_url, names, slot, generation,
+                                                  agent_ids, args)
+
+    cortex = _load_cortex(redis, names, args)
+    relay_task = asyncio.create_task(cortex.command_outbox_relay())
+    outbox = cortex.command_outbox
+
+    t0 = time.monotonic()
+    chaos_task = asyncio.create_task(chaos())
+    try:
+        ids = await _produce(redis, cortex, names, agent_ids, args)
+        # Keep killing for a while after the last XADD, then let things settle
+        await asyncio.sleep(args.chaos_tail)
+        stop_chaos.set()
+        await chaos_task
+
+        expected = set(ids)
+        deadline = time.monotonic() + args.settle_timeout
+        while time.monotonic() < deadline:
+            delivered = await redis.lrange(names["deliveries"], 0, -1)
+            pending = (await redis.xpending(names["stream"], names["group"]))["pending"]
+            if expected <= {d.split("|")[0] for d in delivered} and pending == 0 \
+                    and not outbox.rows:
+                break
+            await asyncio.sleep(0.5)
+        elapsed = time.monotonic() - t0
+    finally:
+        stop_chaos.set()
+        relay_task.cancel()
+        for p in procs.values():
+            p.kill()
+            p.join()
+
+    deliveries = [d.split("|") for d in await redis.lrange(names["deliveries"], 0, -1)]
+    pending = (await redis.xpending(names["stream"], names["group"]))["pending"]
+    counts = Counter(cid for cid, _ in deliveries)
+    survivor_counts = Counter(cid for cid, consumer in deliveries if consumer not in killed)
+    lost = expected - set(counts)
+    duplicated = {cid: n for cid, n in survivor_counts.items() if n > 1}
+    crash_redelivered = {cid for cid, n in counts.items() if n > 1} - set(duplicated)
+    unexpected = set(counts) - expected
+
+    await redis.delete(names["stream"], names["dlq"], names["delivered"], names["deliveries"])
+    await redis.aclose()
+    return {
+        "commands": len(ids),
+        "retried_xadds": int(len(ids) * args.dup_rate),
+        "outbox_deferred": outbox.counters["deferred"],
+        "outbox_relayed": outbox.counters["relayed"],
+        "outbox_left": len(outbox.rows),
+        "consumers": args.consumers,
+        "kills": kills,
+        "dispatched": len(deliveries),
+        "lost": len(lost),
+        "duplicated": len(duplicated),
+        "crash_redelivered": len(crash_redelivered),
+        "duplicated_sample": {cid: [c for d, c in deliveries if d == cid]
+                              for cid in list(duplicated)[:5]},
+        "unexpected": len(unexpected),
+        "pending_after": pending,
+        "elapsed_s": round(elapsed, 1),
+        "passed": (not lost and not duplicated and not unexpected and pending == 0
+                   and not outbox.rows),
+    }
+
+
+# ═════════════════════════════════════════════════════════════════════════════
+# MAIN
+# ═════════════════════════════════════════════════════════════════════════════
+
+def main():
+    parser = argparse.ArgumentParser(description="Command stream delivery under consumer kills")
+    parser.add_argument("--redis-url", default=os.getenv("REDIS_URL", "redis://localhost:6379/0"))
+    parser.add_argument("--fake", action="store_true",
+                        help="run against an in-process fakeredis TCP server")
+    parser.add_argument("--commands", type=int, default=3000)
+    parser.add_argument("--dup-rate", type=float, default=0.1,
+                        help="fraction of commands XADDed a second time")
+    parser.add_argument("--xadd-fail-rate", type=float, default=0.3,
+                        help="fraction of producer XADD pipelines that fail")
+    parser.add_argument("--agents", type=int, default=20)
+    parser.add_argument("--consumers", type=int, default=3)
+    parser.add_argument("--batch-size", type=int, default=50)
+    parser.add_argument("--kill-every", type=float, default=0.7, help="seconds between kills")
+    parser.add_argument("--produce-interval", type=float, default=0.05,
+                        help="pause between 100-entry XADD pipelines")
+    parser.add_argument("--claim-idle-ms", type=int, default=1000)
+    parser.add_argument("--chaos-tail", type=float, default=2.0)
+    parser.add_argument("--settle-timeout", type=float, default=60.0)
+    parser.add_argument("--output", default="/tmp/nexus_stream_chaos_test.json")
+    args = parser.parse_args()
+
+    redis_url = args.redis_url
+    if args.fake:
+        from fakeredis import TcpFakeServer
+        server = TcpFakeServer(("127.0.0.1", 0), server_type="redis")
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        redis_url = "redis://%s:%d/0" % server.server_address
+
+    print("═" * 70)
+    print("  NEXUS PRIME — Command Stream Chaos Test")
+    print(f"  Commands: {args.commands} (+{args.dup_rate:.0%} retried) | "
+          f"Consumers: {args.consumers} | Kill every {args.kill_every}s | "
+          f"XADD fail rate {args.xadd_fail_rate:.0%}")
+    print("═" * 70)
+
+    r = asyncio.run(run(redis_url, args))
+    print(f"  outbox: deferred={r['outbox_deferred']}  relayed={r['outbox_relayed']}  "
+          f"left={r['outbox_left']}")
+    print(f"  kills={r['kills']}  dispatched={r['dispatched']}  lost={r['lost']}  "
+          f"duplicated={r['duplicated']}  crash_redelivered={r['crash_redelivered']}  "
+          f"pending={r['pending_after']}  "
+          f"({r['elapsed_s']}s)")
+    print(f"\n  {'✅ PASS — no loss, no duplicates' if r['passed'] else '❌ FAIL'}")
+
+    with open(args.output, "w") as f:
+        json.dump({"config": vars(args), "result": r}, f, indent=2)
+    print(f"\n  📄 JSON report saved to {args.output}")
+    sys.exit(0 if r["passed"] else 1)
+
+
+if __name__ == "__main__":
+    main()
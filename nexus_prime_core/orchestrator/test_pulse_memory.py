@@ -0,0 +1,136 @@
+"""
+═══════════════════════════════════════════════════════════════════════════════
+NEXUS PRIME CORE — Pulse Path Memory Regression Test
+═══════════════════════════════════════════════════════════════════════════════
+tracemalloc budgets for the per-agent / per-heartbeat hot path:
+  1. Bytes held per connected agent (ConnectedAgent + DirectiveQueue + wheel)
+  2. Transient bytes allocated while handling one heartbeat pulse
+  3. Bytes retained after a steady stream of heartbeats (no per-beat leak)
+
+Runs in-process — no server, Redis or Cortex needed.
+
+Usage:
+    python -m pytest test_pulse_memory.py -q      (or: python test_pulse_memory.py)
+═══════════════════════════════════════════════════════════════════════════════
+"""
+
+import asyncio
+import gc
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+import nexus_pulse_pb2 as pb
+import orchestrator_server as orch
+
+
+# Budgets (bytes). Measured on CPython 3.11: ~1.2 KB/agent, ~1.4 KB peak per
+# heartbeat (the uuid4/Event-based path was ~2.1 KB and ~2.2 KB)
+BYTES_PER_AGENT_BUDGET = 1600
+HEARTBEAT_PEAK_BUDGET = 1800
+RETAINED_PER_HEARTBEAT_BUDGET = 8
+
+AGENTS = 2000
+HEARTBEATS = 20000
+
+
+def _servicer() -> orch.NexusPulseServicer:
+    # Large flush interval: heartbeats stay in the coalescing buffer
+    cortex = orch.CortexBridge("http://127.0.0.1:9", heartbeat_flush_interval=3600)
+    return orch.NexusPulseServicer(cortex, redis_client=None)
+
+
+def _heartbeat(agent_id: str, seq: int) -> pb.AgentPulse:
+    return pb.AgentPulse(
+        agent_id=agent_id,
+        pulse_type=pb.PULSE_TYPE_HEARTBEAT,
+        sequence_number=seq,
+        state=pb.AgentState(
+            status=pb.AGENT_STATUS_IDLE,
+            current_task="patrol",
+            metrics=pb.AgentMetrics(cpu_usage_percent=12.5, memory_usage_percent=40.0),
+        ),
+    )
+
+
+def _drain(conn: orch.ConnectedAgent):
+    conn.directive_queue._items.clear()
+
+
+def test_bytes_per_connected_agent():
+    async def run():
+        servicer = _servicer()
+        gc.collect()
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        agents = [orch.ConnectedAgent(f"MEM-{i:05d}", servicer.staleness_wheel)
+                  for i in range(AGENTS)]
+        after = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        per_agent = (after - before) / len(agents)
+        print(f"  bytes/agent: {per_agent:.0f} (budget {BYTES_PER_AGENT_BUDGET})")
+        assert per_agent <= BYTES_PER_AGENT_BUDGET
+
+    asyncio.run(run())
+
+
+def test_heartbeat_allocations():
+    async def run():
+        servicer = _servicer()
+        conns = [orch.ConnectedAgent(f"MEM-{i:03d}", servicer.staleness_wheel)
+                 for i in range(100)]
+        pulses = [_heartbeat(c.agent_id, 1) for c in conns]
+
+        # Warm up: every agent has a buffered heartbeat and snapshot entry
+        for conn, pulse in zip(conns, pulses):
+            await servicer._process_pulse(conn.agent_id, pulse, conn)
+            _drain(conn)
+
+        gc.collect()
+        tracemalloc.start()
+
+        # Transient footprint of a single heartbeat
+        base = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        await servicer._process_pulse(conns[0].agent_id, pulses[0], conns[0])
+        peak = tracemalloc.get_traced_memory()[1] - base
+        _drain(conns[0])
+
+        # Steady state: nothing should accumulate per beat
+        gc.collect()
+        before = tracemalloc.get_traced_memory()[0]
+        for i in range(HEARTBEATS):
+            conn = conns[i % len(conns)]
+            await servicer._process_pulse(conn.agent_id, pulses[i % len(pulses)], conn)
+            _drain(conn)
+        gc.collect()
+        retained = (tracemalloc.get_traced_memory()[0] - before) / HEARTBEATS
+        tracemalloc.stop()
+
+        print(f"  heartbeat peak: {peak} B (budget {HEARTBEAT_PEAK_BUDGET}), "
+              f"retained/beat: {retained:.2f} B (budget {RETAINED_PER_HEARTBEAT_BUDGET})")
+        assert peak <= HEARTBEAT_PEAK_BUDGET
+        assert retained <= RETAINED_PER_HEARTBEAT_BUDGET
+
+    asyncio.run(run())
+
+
+def test_ack_ids_are_unique_and_cheap():
+    servicer = _servicer()
+    ids = {servicer._make_ack_directive("1", "ok").directive_id for _ in range(1000)}
+    assert len(ids) == 1000
+    ack = servicer._make_ack_directive("7", "Heartbeat #7 received", "corr-1")
+    assert ack.directive_type == pb.DIRECTIVE_TYPE_ACK
+    assert ack.ack_for_pulse_id == "7" and ack.correlation_id == "corr-1"
+    assert ack.timestamp.seconds > 0
+    # Template must not pick up per-ACK fields
+    assert not orch.NexusPulseServicer._ACK_TEMPLATE.ack_for_pulse_id
+
+
+if __name__ == "__main__":
+    for test in (test_bytes_per_connected_agent, test_heartbeat_allocations,
+                 test_ack_ids_are_unique_and_cheap):
+        test()
+        print(f"  ✅ {test.__name__}")
@@ -0,0 +1,96 @@
+"""
+═══════════════════════════════════════════════════════════════════════════════
+NEXUS PRIME CORE — Staleness Wheel / Reaper Test
+═══════════════════════════════════════════════════════════════════════════════
+  1. StalenessWheel.expire returns exactly the agents whose pulse deadline
+     has passed — after touch() moved them, after cancel(), across a long
+     gap between ticks, and when scheduled with a deadline already past
+  2. StalenessReaper.reap removes expired agents, posts the offline alert,
+     skips connections already replaced, and reports reap latency in
+     snapshot_stats() (SystemSnapshot.reaper)
+
+Runs in-process — no server, Redis or Cortex needed.
+
+Usage:
+    python -m pytest test_staleness_reaper.py -q
+═══════════════════════════════════════════════════════════════════════════════
+"""
+
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+import orchestrator_server as orch
+
+
+class _Cortex:
+    def __init__(self):
+        self.events = []
+
+    async def post_event(self, **kwargs):
+        self.events.append(kwargs)
+
+
+def _agent(wheel: orch.StalenessWheel, agent_id: str, last_pulse_at: float) -> orch.ConnectedAgent:
+    conn = orch.ConnectedAgent(agent_id)
+    conn.wheel = wheel
+    conn.last_pulse_at = last_pulse_at
+    wheel.schedule(conn)
+    return conn
+
+
+def test_wheel_expires_only_past_deadlines():
+    wheel = orch.StalenessWheel(threshold=10.0, resolution=1.0)
+    wheel._cursor = 0
+    early = _agent(wheel, "early", 100.0)      # deadline 110
+    late = _agent(wheel, "late", 105.0)        # deadline 115
+    moved = _agent(wheel, "moved", 100.0)
+    gone = _agent(wheel, "gone", 100.0)
+    assert len(wheel) == 4
+
+    moved.last_pulse_at = 108.0                # pulsed again: deadline 118
+    wheel.schedule(moved)
+    wheel.cancel(gone)                         # disconnected cleanly
+    assert len(wheel) == 3 and gone.wheel_slot is None
+
+    assert wheel.expire(109.0) == []           # nothing due yet
+    assert wheel.expire(112.5) == [early]
+    assert early.wheel_slot is None
+    assert wheel.expire(112.9) == []           # popped slots don't fire twice
+
+    # Long gap: walks occupied slots instead of every slot in between
+    assert set(wheel.expire(10_000.0)) == {late, moved}
+    assert len(wheel) == 0
+
+
+def test_reap_marks_stale_agents_offline():
+    cortex = _Cortex()
+    servicer = orch.NexusPulseServicer(
+        orch.CortexBridge("http://127.0.0.1:9", heartbeat_flush_interval=3600),
+        redis_client=None)
+    wheel = servicer.staleness_wheel
+    reaper = orch.StalenessReaper(servicer, cortex)
+    threshold = wheel.threshold
+
+    now = orch.time.monotonic()
+    stale = _agent(wheel, "STALE-1", now - threshold - 5)
+    fresh = _agent(wheel, "FRESH-1", now)
+    replaced = _agent(wheel, "REPLACED-1", now - threshold - 5)
+    servicer.connected_agents.update({"STALE-1": stale, "FRESH-1": fresh})
+    # REPLACED-1 reconnected: the expired entry is an old connection
+    servicer.connected_agents["REPLACED-1"] = orch.ConnectedAgent("REPLACED-1")
+
+    assert asyncio.run(reaper.reap()) == ["STALE-1"]
+    assert "STALE-1" not in servicer.connected_agents
+    assert {"FRESH-1", "REPLACED-1"} <= set(servicer.connected_agents)
+    assert [e["agent_name"] for e in cortex.events] == ["STALE-1"]
+
+    stats = reaper.snapshot_stats()
+    assert stats.ticks == 1 and stats.reaped == 1
+    # Deadline passed ~5s (+ wheel resolution) before the tick
+    assert 4000 < stats.reap_latency_p50_ms == stats.reap_latency_p99_ms
+    assert stats.reap_latency_max_ms == stats.reap_latency_p99_ms
+    assert asyncio.run(reaper.reap()) == []
+    assert reaper.snapshot_stats().ticks == 2
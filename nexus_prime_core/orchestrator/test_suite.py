@@ -139,6 +139,10 @@ async def test_get_system_status():
         report("Has timestamp", snapshot.timestamp.seconds > 0)
         report("Contains agent summaries", len(snapshot.agents) >= 0,
                f"{len(snapshot.agents)} agents listed")
+        report("Directive queue stats well-formed",
+               all(0 <= q.depth <= q.capacity for q in snapshot.directive_queues),
+               f"{len(snapshot.directive_queues)} queues, deepest: "
+               f"{snapshot.directive_queues[0].depth if snapshot.directive_queues else 0}")
 
         # Check META-ORCHESTRATOR is registered
         agent_names = [a.name for a in snapshot.agents]
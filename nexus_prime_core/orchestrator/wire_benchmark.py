@@ -0,0 +1,149 @@
+"""
+═══════════════════════════════════════════════════════════════════════════════
+NEXUS PRIME CORE — Command Stream Wire Format Microbenchmark
+═══════════════════════════════════════════════════════════════════════════════
+Per-message encode/decode cost of the two nexus:commands:stream formats:
+
+  • v1 (json)     — Cortex json.dumps; orchestrator decodes every field and
+                    rebuilds a TaskCommand field by field
+  • v2 (protobuf) — Cortex writes serialized TaskCommand bytes; orchestrator
+                    merges them straight into the directive
+
+Also checks that Cortex's hand-rolled TaskCommand encoder is byte-identical
+to the generated message class.
+
+Usage:
+    python wire_benchmark.py --iterations 200000
+═══════════════════════════════════════════════════════════════════════════════
+"""
+
+import argparse
+import importlib.util
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+import nexus_pulse_pb2 as pb
+import orchestrator_server as orch
+from stream_benchmark import _BenchServicer
+
+CORTEX_MAIN = os.path.join(os.path.dirname(__file__), "..", "..", "nexus_cortex", "main.py")
+
+SAMPLE = {
+    "command_id": "6f1c2b8e-3d4a-4f5b-9c7d-2e1f0a9b8c7d",
+    "command_type": "scan_market",
+    "origin": "dashboard",
+    "priority": 5,
+    "target": "AS-SULTAN",
+}
+
+
+def _load_cortex_encoder():
+    try:
+        spec = importlib.util.spec_from_file_location("cortex_main", CORTEX_MAIN)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        return module.encode_task_command
+    except Exception as e:
+        print(f"  ⚠️  Cortex encoder unavailable ({e}); using generated class")
+        return None
+
+
+def _per_msg_us(fn, iterations: int) -> float:
+    t0 = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - t0) / iterations * 1e6
+
+
+def run(iterations: int) -> dict:
+    bridge = orch.RedisBridge(None, _BenchServicer([SAMPLE["target"]]))
+    encoder = _load_cortex_encoder()
+
+    def pb_encode():
+        return pb.TaskCommand(
+            command_id=SAMPLE["command_id"], command_type=SAMPLE["command_type"],
+            origin=SAMPLE["origin"], priority=SAMPLE["priority"],
+        ).SerializeToString()
+
+    parity = None
+    if encoder:
+        cases = [SAMPLE, {**SAMPLE, "priority": 0, "origin": ""},
+                 {**SAMPLE, "priority": -1, "command_type": "تقرير"}]
+        parity = all(
+            encoder(c["command_id"], c["command_type"], c["origin"], c["priority"]) ==
+            pb.TaskCommand(command_id=c["command_id"], command_type=c["command_type"],
+                           origin=c["origin"], priority=c["priority"]).SerializeToString()
+            for c in cases
+        )
+
+    # v1 — what arrives on the stream is the flat field map, as bytes
+    v1_payload = {"type": "command_issued", **SAMPLE}
+    v1_fields = {k.encode(): str(v).encode() for k, v in v1_payload.items()}
+
+    def v1_encode():
+        return json.dumps(v1_payload)
+
+    def v1_decode():
+        fields = bridge._decode_fields(v1_fields)
+        return bridge._build_task_directive(fields["target"], fields)
+
+    # v2 — serialized TaskCommand in "cmd"
+    encode_v2 = (lambda: encoder(SAMPLE["command_id"], SAMPLE["command_type"],
+                                 SAMPLE["origin"], SAMPLE["priority"])) if encoder else pb_encode
+    v2_fields = {b"v": b"2", b"type": b"command_issued",
+                 b"target": SAMPLE["target"].encode(),
+                 b"command_id": SAMPLE["command_id"].encode(), b"cmd": pb_encode()}
+
+    def v2_decode():
+        fields = bridge._decode_fields(v2_fields)
+        return bridge._build_task_directive(fields["target"], fields)
+
+    c1, c2 = v1_decode().command, v2_decode().command
+    assert (c1.command_id, c1.command_type, c1.priority) == \
+           (c2.command_id, c2.command_type, c2.priority), "v1/v2 directives differ"
+
+    return {
+        "iterations": iterations,
+        "encoder_parity": parity,
+        "v1_json": {
+            "encode_us": round(_per_msg_us(v1_encode, iterations), 3),
+            "decode_us": round(_per_msg_us(v1_decode, iterations), 3),
+            "bytes": len(v1_encode()),
+        },
+        "v2_protobuf": {
+            "encode_us": round(_per_msg_us(encode_v2, iterations), 3),
+            "decode_us": round(_per_msg_us(v2_decode, iterations), 3),
+            "bytes": len(encode_v2()),
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Command stream wire format cost")
+    parser.add_argument("--iterations", type=int, default=100000)
+    parser.add_argument("--output", default="/tmp/nexus_wire_benchmark.json")
+    args = parser.parse_args()
+
+    print("═" * 70)
+    print("  NEXUS PRIME — Command Stream Wire Format Microbenchmark")
+    print("═" * 70)
+
+    r = run(args.iterations)
+    for name in ("v1_json", "v2_protobuf"):
+        m = r[name]
+        print(f"  {name:<12} encode={m['encode_us']:>7}µs  "
+              f"decode={m['decode_us']:>7}µs  payload={m['bytes']}B")
+    if r["encoder_parity"] is not None:
+        print(f"  Cortex encoder parity: {'✅' if r['encoder_parity'] else '❌'}")
+
+    with open(args.output, "w") as f:
+        json.dump(r, f, indent=2)
+    print(f"\n  📄 JSON report saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -78,6 +78,6 @@ echo -e "${GREEN}═════════════════════
 echo ""
 echo "Next steps:"
 echo "  1. Run test suite: cd nexus_prime_core/orchestrator && python test_suite.py"
-echo "  2. Test Redis Streams: redis-cli XADD nexus:commands:stream '*' type command_issued target TEST-AGENT command_id test-123 command_type test_mission priority 5"
+echo "  2. Test Redis Streams: redis-cli XADD nexus:commands:stream MAXLEN '~' 10000 '*' type command_issued target TEST-AGENT command_id test-123 command_type test_mission priority 5"
 echo "  3. Monitor logs: docker compose logs -f ${ORCHESTRATOR_SERVICE}"
 echo ""
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+═══════════════════════════════════════════════════════════════════════════════
+NEXUS CORTEX — Command Submission Benchmark (per-command vs batch)
+═══════════════════════════════════════════════════════════════════════════════
+Submits --commands commands to a running Cortex and reports commands/second:
+
+  • single      — POST /command once per command, --concurrency in flight
+                  (routing + INSERT + event INSERT + PUBLISH per command)
+  • batch=<N>   — POST /commands/batch with N commands per request
+                  (routing once, COPY in one transaction, one Redis pipeline)
+
+Commands are untargeted "bench_*" types so routing is exercised; they land
+in nexus_core.commands like any other command (origin="benchmark").
+
+Usage:
+    CORTEX_URL=http://localhost:8090 python scripts/cortex_batch_benchmark.py \\
+        --commands 5000 --batches 50,200,1000 --concurrency 16
+═══════════════════════════════════════════════════════════════════════════════
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import time
+
+import httpx
+
+
+def _command(i: int) -> dict:
+    return {
+        "command_type": f"bench_{i % 8}",
+        "origin": "benchmark",
+        "payload": {"seq": i},
+        "priority": 5,
+    }
+
+
+async def run_single(client: httpx.AsyncClient, total: int, concurrency: int) -> dict:
+    sem = asyncio.Semaphore(concurrency)
+    errors = 0
+
+    async def one(i: int):
+        nonlocal errors
+        async with sem:
+            r = await client.post("/command", json=_command(i))
+            if r.status_code != 200:
+                errors += 1
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(total)))
+    elapsed = time.perf_counter() - t0
+    return {"scenario": "single", "requests": total, "errors": errors, "elapsed_s": elapsed}
+
+
+async def run_batch(client: httpx.AsyncClient, total: int, batch_size: int,
+                    concurrency: int) -> dict:
+    sem = asyncio.Semaphore(concurrency)
+    errors = 0
+    ids = 0
+
+    async def one(start: int):
+        nonlocal errors, ids
+        async with sem:
+            batch = [_command(i) for i in range(start, min(start + batch_size, total))]
+            r = await client.post("/commands/batch", json={"commands": batch})
+            if r.status_code != 200:
+                errors += 1
+            else:
+                ids += len(r.json()["commands"])
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(one(s) for s in range(0, total, batch_size)))
+    elapsed = time.perf_counter() - t0
+    return {"scenario": f"batch={batch_size}", "requests": -(-total // batch_size),
+            "errors": errors, "command_ids": ids, "elapsed_s": elapsed}
+
+
+async def main_async(args) -> list:
+    results = []
+    limits = httpx.Limits(max_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=args.cortex_url, timeout=60, limits=limits) as client:
+        r = await client.get("/health")
+        r.raise_for_status()
+
+        scenarios = [("single", None)] + [
+            ("batch", int(b)) for b in args.batches.split(",") if b
+        ]
+        for kind, size in scenarios:
+            if kind == "single":
+                res = await run_single(client, args.commands, args.concurrency)
+            else:
+                res = await run_batch(client, args.commands, size, args.concurrency)
+            res["commands"] = args.commands
+            res["cmds_per_sec"] = round(args.commands / res["elapsed_s"], 1)
+            res["elapsed_s"] = round(res["elapsed_s"], 3)
+            results.append(res)
+            print(f"  {res['scenario']:<12} {res['cmds_per_sec']:>10} cmd/s  "
+                  f"requests={res['requests']:<6} errors={res['errors']}")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cortex per-command vs batch submission")
+    parser.add_argument("--cortex-url", default=os.getenv("CORTEX_URL", "http://localhost:8090"))
+    parser.add_argument("--commands", type=int, default=2000)
+    parser.add_argument("--batches", default="50,200,1000")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--output", default="/tmp/nexus_cortex_batch_benchmark.json")
+    args = parser.parse_args()
+
+    print("═" * 70)
+    print("  NEXUS CORTEX — Command Submission Benchmark")
+    print(f"  Commands: {args.commands} | Concurrency: {args.concurrency} "
+          f"| Cortex: {args.cortex_url}")
+    print("═" * 70)
+
+    results = asyncio.run(main_async(args))
+
+    base = results[0]["cmds_per_sec"] if results else 0
+    if base:
+        for r in results:
+            r["speedup_vs_single"] = round(r["cmds_per_sec"] / base, 2)
+        print("\n  Speedup: " + ", ".join(
+            f"{r['scenario']}={r['speedup_vs_single']}x" for r in results))
+
+    with open(args.output, "w") as f:
+        json.dump({"config": vars(args), "results": results}, f, indent=2)
+    print(f"\n  📄 JSON report saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,23 @@
+#!/bin/bash
+# Apply Cortex (nexus_core) migrations to nexus_db, in filename order
+# Run: ./scripts/db/apply_cortex_migrations.sh  (from anywhere)
+
+set -e
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+PROJECT_ROOT="$(cd "$SCRIPT_DIR/../.." && pwd)"
+MIGRATIONS_DIR="${PROJECT_ROOT}/scripts/db/cortex_migrations"
+CONTAINER="${NEXUS_DB_CONTAINER:-nexus_db}"
+
+if ! docker ps --format '{{.Names}}' | grep -q "^${CONTAINER}$"; then
+  echo "ERROR: Container $CONTAINER is not running. Start it first:"
+  echo "  cd $PROJECT_ROOT && docker compose up -d nexus_db"
+  exit 1
+fi
+
+echo "Applying Cortex migrations to $CONTAINER..."
+echo "(Re-run safe: every statement is IF NOT EXISTS)"
+for MIGRATION in "$MIGRATIONS_DIR"/*.sql; do
+  echo "  → $(basename "$MIGRATION")"
+  docker exec -i "$CONTAINER" psql -U postgres -d "${POSTGRES_DB:-nexus_db}" -v ON_ERROR_STOP=1 < "$MIGRATION"
+done
+echo "Done."
@@ -0,0 +1,26 @@
+-- ══════════════════════════════════════════════════════════════════════
+-- Cortex migration 001 — keyset pagination indexes
+-- Schema: nexus_core
+-- Purpose: /commands and /events page and stream in
+--          ORDER BY created_at DESC, id DESC with optional equality filters
+--          (status / target_agent, agent_name / severity). Each listing is
+--          an index range scan from the cursor instead of a sort.
+-- CONCURRENTLY: safe on a live database; must run outside a transaction.
+-- ══════════════════════════════════════════════════════════════════════
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_commands_keyset
+    ON nexus_core.commands (created_at DESC, id DESC);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_commands_status_keyset
+    ON nexus_core.commands (status, created_at DESC, id DESC);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_commands_target_keyset
+    ON nexus_core.commands (target_agent, created_at DESC, id DESC);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_events_keyset
+    ON nexus_core.events (created_at DESC, id DESC);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_events_agent_keyset
+    ON nexus_core.events (agent_name, created_at DESC, id DESC);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_events_severity_keyset
+    ON nexus_core.events (severity, created_at DESC, id DESC);
+
+ANALYZE nexus_core.commands;
+ANALYZE nexus_core.events;
@@ -0,0 +1,242 @@
+-- ══════════════════════════════════════════════════════════════════════
+-- Cortex migration 002 — daily range partitions for events / changes_log
+-- Schema: nexus_core
+-- Purpose: time-window queries (list_events, /memory/timeline, dashboard
+--          "last hour") touch only the partitions they need, and retention
+--          is DROP of a whole day instead of DELETE + vacuum.
+--
+-- Conversion is in place and does not copy rows: the existing table is
+-- renamed to <table>_legacy and ATTACHed as one partition covering
+-- everything before tomorrow; new days get <table>_pYYYYMMDD partitions.
+-- The legacy partition is dropped by retention once its newest day ages
+-- out. Maintenance runs from Cortex (partition_maintainer) every hour:
+--     SELECT nexus_core.maintain_partitions(30, 90, 7);
+--
+-- Locking: ATTACH reuses a partition index matching each parent index, and
+-- builds any that is missing under ACCESS EXCLUSIVE. The old primary key
+-- is on (id) alone, so the (id, created_at) key and the new BRIN / changes_log
+-- indexes are first built CONCURRENTLY on the live table (psql \gexec, before
+-- BEGIN); inside the transaction the key index is promoted to a constraint
+-- so ATTACH adopts it. What still reads the old table under the lock: the
+-- NULL created_at backfill / SET NOT NULL check and validation of the
+-- re-declared commands FK — scans, not index builds.
+-- Re-run safe; run with psql (apply_cortex_migrations.sh).
+-- ══════════════════════════════════════════════════════════════════════
+
+-- ── Online index builds (outside any transaction) ─────────────────────
+-- Only for tables that exist and are not partitioned yet
+SELECT format('CREATE %s INDEX CONCURRENTLY IF NOT EXISTS %I ON nexus_core.%I %s',
+              kind, name, tbl, def)
+FROM (VALUES
+  ('events',      'events_id_created_at_key',       'UNIQUE', '(id, created_at)'),
+  ('events',      'brin_events_created',            '',       'USING brin (created_at) WITH (pages_per_range = 32)'),
+  ('changes_log', 'changes_log_id_created_at_key',  'UNIQUE', '(id, created_at)'),
+  ('changes_log', 'idx_changes_log_component_time', '',       '(component, created_at DESC)'),
+  ('changes_log', 'brin_changes_log_created',       '',       'USING brin (created_at) WITH (pages_per_range = 32)')
+) AS v(tbl, name, kind, def)
+WHERE to_regclass('nexus_core.' || tbl) IS NOT NULL
+  AND NOT EXISTS (SELECT 1 FROM pg_partitioned_table p
+                  WHERE p.partrelid = to_regclass('nexus_core.' || tbl))
+\gexec
+
+BEGIN;
+
+-- Upper bound of a range partition (NULL for the DEFAULT partition)
+CREATE OR REPLACE FUNCTION nexus_core.partition_upper_bound(part REGCLASS)
+RETURNS TIMESTAMPTZ LANGUAGE sql STABLE AS $$
+  SELECT (regexp_match(pg_get_expr(c.relpartbound, c.oid), 'TO \(''([^'']+)''\)'))[1]::timestamptz
+  FROM pg_class c WHERE c.oid = part
+$$;
+
+-- Create <parent>_pYYYYMMDD for today .. today + days_ahead (skips days
+-- already covered, e.g. by the legacy partition)
+CREATE OR REPLACE FUNCTION nexus_core.ensure_daily_partitions(parent TEXT, days_ahead INT DEFAULT 7)
+RETURNS INT LANGUAGE plpgsql AS $$
+DECLARE
+  day DATE;
+  child TEXT;
+  created INT := 0;
+BEGIN
+  FOR day IN SELECT generate_series(current_date, current_date + days_ahead, INTERVAL '1 day')::date LOOP
+    child := parent || '_p' || to_char(day, 'YYYYMMDD');
+    CONTINUE WHEN to_regclass(child) IS NOT NULL;
+    BEGIN
+      EXECUTE format('CREATE TABLE %s PARTITION OF %s FOR VALUES FROM (%L) TO (%L)',
+                     child, parent, day::timestamptz, (day + 1)::timestamptz);
+      created := created + 1;
+    EXCEPTION
+      WHEN invalid_object_definition THEN NULL;   -- overlaps an existing partition
+      WHEN check_violation THEN                    -- rows for that day sit in DEFAULT
+        RAISE NOTICE '% has rows for %, partition not created', parent || '_default', day;
+    END;
+  END LOOP;
+  RETURN created;
+END $$;
+
+-- Drop partitions whose whole range is older than retain_days
+CREATE OR REPLACE FUNCTION nexus_core.drop_expired_partitions(parent TEXT, retain_days INT)
+RETURNS INT LANGUAGE plpgsql AS $$
+DECLARE
+  part REGCLASS;
+  dropped INT := 0;
+BEGIN
+  FOR part IN
+    SELECT i.inhrelid::regclass FROM pg_inherits i WHERE i.inhparent = parent::regclass
+  LOOP
+    IF nexus_core.partition_upper_bound(part) <= date_trunc('day', now()) - make_interval(days => retain_days) THEN
+      EXECUTE format('DROP TABLE %s', part);
+      dropped := dropped + 1;
+    END IF;
+  END LOOP;
+  RETURN dropped;
+END $$;
+
+-- One maintenance pass; only one caller at a time does the work
+CREATE OR REPLACE FUNCTION nexus_core.maintain_partitions(
+  events_retain_days INT DEFAULT 30,
+  changes_retain_days INT DEFAULT 90,
+  days_ahead INT DEFAULT 7)
+RETURNS JSONB LANGUAGE plpgsql AS $$
+DECLARE
+  result JSONB := '{}';
+BEGIN
+  IF NOT pg_try_advisory_xact_lock(hashtext('nexus_core.maintain_partitions')) THEN
+    RETURN jsonb_build_object('skipped', 'locked');
+  END IF;
+  IF EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass('nexus_core.events')) THEN
+    result := result || jsonb_build_object(
+      'events_created', nexus_core.ensure_daily_partitions('nexus_core.events', days_ahead),
+      'events_dropped', nexus_core.drop_expired_partitions('nexus_core.events', events_retain_days));
+  END IF;
+  IF EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass('nexus_core.changes_log')) THEN
+    result := result || jsonb_build_object(
+      'changes_log_created', nexus_core.ensure_daily_partitions('nexus_core.changes_log', days_ahead),
+      'changes_log_dropped', nexus_core.drop_expired_partitions('nexus_core.changes_log', changes_retain_days));
+  END IF;
+  RETURN result;
+END $$;
+
+-- Convert nexus_core.<tbl> (id, ..., created_at) into a daily-partitioned table
+CREATE OR REPLACE FUNCTION nexus_core.convert_to_daily_partitions(tbl TEXT)
+RETURNS TEXT LANGUAGE plpgsql AS $$
+DECLARE
+  legacy TEXT := tbl || '_legacy';
+  cutoff TIMESTAMPTZ := date_trunc('day', now()) + INTERVAL '1 day';
+  seq TEXT;
+  key_idx TEXT := left(tbl || '_id_created_at_key', 55) || '_legacy';
+  idx RECORD;
+  fk RECORD;
+BEGIN
+  IF to_regclass('nexus_core.' || tbl) IS NULL THEN
+    RETURN tbl || ': missing, skipped';
+  END IF;
+  IF EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = ('nexus_core.' || tbl)::regclass) THEN
+    RETURN tbl || ': already partitioned';
+  END IF;
+
+  EXECUTE format('LOCK TABLE nexus_core.%I IN ACCESS EXCLUSIVE MODE', tbl);
+  EXECUTE format('ALTER TABLE nexus_core.%I RENAME TO %I', tbl, legacy);
+
+  -- Free index names for the parent; matching ones get attached back below
+  FOR idx IN
+    SELECT i.relname FROM pg_index x JOIN pg_class i ON i.oid = x.indexrelid
+    WHERE x.indrelid = ('nexus_core.' || legacy)::regclass
+  LOOP
+    EXECUTE format('ALTER INDEX nexus_core.%I RENAME TO %I', idx.relname, left(idx.relname, 55) || '_legacy');
+  END LOOP;
+  -- Outbound FKs are re-declared on the parent
+  FOR fk IN
+    SELECT conname FROM pg_constraint
+    WHERE conrelid = ('nexus_core.' || legacy)::regclass AND contype = 'f'
+  LOOP
+    EXECUTE format('ALTER TABLE nexus_core.%I DROP CONSTRAINT %I', legacy, fk.conname);
+  END LOOP;
+
+  -- The partition key must be NOT NULL
+  EXECUTE format('UPDATE nexus_core.%I SET created_at = now() WHERE created_at IS NULL', legacy);
+  EXECUTE format('ALTER TABLE nexus_core.%I ALTER COLUMN created_at SET NOT NULL', legacy);
+
+  -- ATTACH only adopts an index for the parent's primary key if it backs a
+  -- constraint: promote the (id, created_at) index built CONCURRENTLY above
+  -- (metadata only). Without it ATTACH builds one under the lock.
+  IF EXISTS (SELECT 1 FROM pg_index x
+             WHERE x.indexrelid = to_regclass('nexus_core.' || key_idx) AND x.indisvalid) THEN
+    EXECUTE format('ALTER TABLE nexus_core.%I ADD CONSTRAINT %I UNIQUE USING INDEX %I',
+                   legacy, legacy || '_id_created_at_key', key_idx);
+  END IF;
+
+  EXECUTE format('CREATE TABLE nexus_core.%I (LIKE nexus_core.%I INCLUDING DEFAULTS INCLUDING CONSTRAINTS '
+                 'INCLUDING STORAGE INCLUDING COMMENTS) PARTITION BY RANGE (created_at)', tbl, legacy);
+  EXECUTE format('ALTER TABLE nexus_core.%I ADD PRIMARY KEY (id, created_at)', tbl);
+
+  -- The id sequence must outlive the legacy partition
+  seq := pg_get_serial_sequence('nexus_core.' || legacy, 'id');
+  IF seq IS NOT NULL THEN
+    EXECUTE format('ALTER SEQUENCE %s OWNED BY nexus_core.%I.id', seq, tbl);
+  END IF;
+
+  -- CHECK first so ATTACH skips its validation scan
+  EXECUTE format('ALTER TABLE nexus_core.%I ADD CONSTRAINT %I CHECK (created_at < %L)',
+                 legacy, legacy || '_bound', cutoff);
+  EXECUTE format('ALTER TABLE nexus_core.%I ATTACH PARTITION nexus_core.%I FOR VALUES FROM (MINVALUE) TO (%L)',
+                 tbl, legacy, cutoff);
+  EXECUTE format('ALTER TABLE nexus_core.%I DROP CONSTRAINT %I', legacy, legacy || '_bound');
+  EXECUTE format('CREATE TABLE nexus_core.%I PARTITION OF nexus_core.%I DEFAULT', tbl || '_default', tbl);
+  RETURN tbl || ': partitioned';
+END $$;
+
+-- ── events ────────────────────────────────────────────────────────────
+SELECT nexus_core.convert_to_daily_partitions('events');
+
+DO $$ BEGIN
+  IF NOT EXISTS (SELECT 1 FROM pg_constraint
+                 WHERE conrelid = 'nexus_core.events'::regclass AND contype = 'f') THEN
+    ALTER TABLE nexus_core.events ADD CONSTRAINT events_command_id_fkey
+      FOREIGN KEY (command_id) REFERENCES nexus_core.commands(id) ON DELETE SET NULL;
+  END IF;
+END $$;
+
+CREATE INDEX IF NOT EXISTS idx_events_agent ON nexus_core.events (agent_name);
+CREATE INDEX IF NOT EXISTS idx_events_type ON nexus_core.events (event_type);
+CREATE INDEX IF NOT EXISTS idx_events_keyset ON nexus_core.events (created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_events_agent_keyset ON nexus_core.events (agent_name, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_events_severity_keyset ON nexus_core.events (severity, created_at DESC, id DESC);
+-- Rows arrive in time order: a BRIN summary per 32 pages answers
+-- created_at windows at a fraction of a btree's size
+CREATE INDEX IF NOT EXISTS brin_events_created ON nexus_core.events USING brin (created_at)
+  WITH (pages_per_range = 32);
+
+SELECT nexus_core.ensure_daily_partitions('nexus_core.events', 7);
+
+-- Views keep pointing at the table they were created on — rebind
+CREATE OR REPLACE VIEW nexus_core.cortex_dashboard AS
+SELECT
+  a.name,
+  a.display_name,
+  a.agent_type,
+  a.status,
+  a.last_seen,
+  s.current_task,
+  s.metrics,
+  (SELECT COUNT(*) FROM nexus_core.commands c WHERE c.target_agent = a.name AND c.status IN ('queued','running')) AS pending_commands,
+  (SELECT COUNT(*) FROM nexus_core.events e WHERE e.agent_name = a.name AND e.created_at > now() - INTERVAL '1 hour') AS events_last_hour
+FROM nexus_core.agents a
+LEFT JOIN nexus_core.agent_state s ON s.agent_name = a.name
+ORDER BY a.agent_type, a.name;
+
+-- ── changes_log (memory_keeper) ───────────────────────────────────────
+SELECT nexus_core.convert_to_daily_partitions('changes_log');
+
+DO $$ BEGIN
+  IF to_regclass('nexus_core.changes_log') IS NOT NULL THEN
+    CREATE INDEX IF NOT EXISTS idx_changes_log_component_time
+      ON nexus_core.changes_log (component, created_at DESC);
+    CREATE INDEX IF NOT EXISTS brin_changes_log_created
+      ON nexus_core.changes_log USING brin (created_at) WITH (pages_per_range = 32);
+    PERFORM nexus_core.ensure_daily_partitions('nexus_core.changes_log', 7);
+  END IF;
+END $$;
+
+COMMIT;
+
+ANALYZE nexus_core.events;
@@ -0,0 +1,16 @@
+-- ══════════════════════════════════════════════════════════════════════
+-- Cortex migration 003 — command stream outbox
+-- Schema: nexus_core
+-- Purpose: a command is committed as 'queued' before it is XADDed to
+--          nexus:commands:stream. If Redis refuses the XADD, Cortex records
+--          the command here and command_outbox_relay re-XADDs it until the
+--          stream takes it, so the committed command is not lost.
+--          Orchestrators dedupe on command_id, so re-sending is safe.
+-- Re-run safe.
+-- ══════════════════════════════════════════════════════════════════════
+
+CREATE TABLE IF NOT EXISTS nexus_core.command_outbox (
+  command_id  UUID PRIMARY KEY REFERENCES nexus_core.commands(id) ON DELETE CASCADE,
+  failed_at   TIMESTAMPTZ NOT NULL DEFAULT now(),
+  attempts    INTEGER NOT NULL DEFAULT 0
+);
@@ -164,7 +164,7 @@ echo "     kubectl logs -n ${NAMESPACE} -l app=nexus-orchestrator -f"
 echo ""
 echo "  3. Test Redis Streams:"
 echo "     kubectl exec -it -n ${NAMESPACE} <redis-pod> -- redis-cli"
-echo "     XADD nexus:commands:stream '*' type command_issued target TEST command_id test-1 command_type test priority 5"
+echo "     XADD nexus:commands:stream MAXLEN '~' 10000 '*' type command_issued target TEST command_id test-1 command_type test priority 5"
 echo ""
 echo "  4. Test autoscaling:"
 echo "     kubectl run -it --rm load-generator --image=busybox --restart=Never -- /bin/sh"